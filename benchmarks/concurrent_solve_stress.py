@@ -0,0 +1,171 @@
+"""
+Concurrent solve stress test for 'search' module, using 'maze.py' as
+workload.
+
+Loads each generated maze once (see maze_generator.py), and solves it from
+many threads at once, with random algorithms and options, all runs sharing
+the same Maze instance. Every run result (see SearchResult) is checked
+against a serial run of the same algorithm: solution path and cost,
+counters, explored nodes and, for runs recording a MemorySink, the whole
+algorithm log (that snapshots the frontier of its own run at every step).
+
+Threads are switched very often (see sys.setswitchinterval()), so runs
+interleave inside their search loops. The exit status is 0 if every run
+matches.
+
+Usage:
+    python3 concurrent_solve_stress.py [--threads 8] [--runs 400] [--size 41]
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+    maze.py
+
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../maze')))
+
+from search import MemorySink, SearchResult  # pylint: disable=C0413
+from maze import Maze   # pylint: disable=C0413
+from maze_generator import generate_maze, write_maze  # pylint: disable=C0413
+
+# Task name -> (algorithm, solve() options)
+TASKS = {
+    'BFS': ('BFS', {}),
+    'DFS': ('DFS', {}),
+    'UCS': ('UCS', {}),
+    'ASTAR': ('ASTAR', {}),
+    'JPS': ('JPS', {}),
+    'BEAM': ('BEAM', {'beam_width': 8}),
+    'ALL_GOALS': ('BFS', {'all_goals': True}),
+    'KEEP_TREE': ('UCS', {'keep_tree': True}),
+    'REDUCED': ('ASTAR', {'reduced': True}),
+}
+
+
+def signature(result: SearchResult) -> Tuple:
+    """Comparable summary of a run result.
+
+    Args:
+        result (SearchResult): Result of the run.
+
+    Returns:
+        tuple: Solved flag, solution states and cost, counters, explored
+        states, goals found, tree size and algorithm log.
+    """
+    return (result.solved,
+            None if result.solution is None else [node.state for node in result.solution],
+            None if result.solution is None else result.solution.cost(),
+            result.stats.expanded, result.stats.generated, result.stats.duplicates,
+            sorted(node.state for node in result.explored_nodes),
+            sorted(result.solutions), result.optimal,
+            None if result.search_tree is None else len(result.search_tree),
+            None if result.algorithm_log is None
+            else [log_step(record) for record in result.algorithm_log.get_log()])
+
+
+def log_step(record: dict) -> Tuple:
+    """Comparable summary of an algorithm log step (see MemorySink).
+
+    Args:
+        record (dict): Step record.
+
+    Returns:
+        tuple: Frontier and explored states, extracted state and expanded
+        states.
+    """
+    return ([node.state for node in record['frontier']],
+            [node.state for node in record['explored']],
+            record['extracted'].state,
+            [node.state for node in record.get('expanded', [])])
+
+
+def solve_task(maze: Maze, task: str, logged: bool) -> SearchResult:
+    """Solves 'maze' with a task of TASKS.
+
+    Args:
+        maze (Maze): Shared maze.
+        task (str): Task name.
+        logged (bool): If True, steps are recorded in a MemorySink.
+
+    Returns:
+        SearchResult: Result of the run.
+    """
+    algorithm, options = TASKS[task]
+    return maze.solve(algorithm, observers=[MemorySink()] if logged else [], **options)
+
+
+def stress(mazes: Dict[str, Maze], threads: int, runs: int, seed: int) -> List[str]:
+    """Runs random tasks concurrently and checks them against serial runs.
+
+    Args:
+        mazes (dict): Mazes by name.
+        threads (int): Number of threads.
+        runs (int): Number of concurrent runs.
+        seed (int): Random generator seed.
+
+    Returns:
+        list: Mismatch messages (empty if every run matches).
+    """
+    expected = {(name, task, logged): signature(solve_task(maze, task, logged))
+                for name, maze in mazes.items() for task in TASKS for logged in (False, True)}
+    rnd = random.Random(seed)
+    jobs = [(rnd.choice(sorted(mazes)), rnd.choice(sorted(TASKS)), rnd.random() < 0.3)
+            for _ in range(runs)]
+
+    def run(job: Tuple[str, str, bool]) -> Tuple[Tuple[str, str, bool], SearchResult]:
+        return job, solve_task(mazes[job[0]], job[1], job[2])
+
+    failures = []
+    results = []
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for job, result in executor.map(run, jobs):
+            results.append(result)
+            if signature(result) != expected[job]:
+                failures.append(f"{job}: result differs from serial run")
+    for name, maze in mazes.items():
+        if not any(maze.last_result is result for result in results) \
+                and any(job[0] == name for job in jobs):
+            failures.append(f"{name}: last_result is not a run result")
+    return failures
+
+
+def main() -> None:
+    """Parses command line arguments and runs the stress test."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--runs', type=int, default=400)
+    parser.add_argument('--size', type=int, default=41,
+                        help="maze rows and columns (default: 41)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mazes = {}
+        for family in ('perfect', 'obstacles', 'rooms'):
+            filename = os.path.join(tmp_dir, f"{family}.txt")
+            write_maze(generate_maze(family, args.size, args.size, args.seed), filename)
+            mazes[family] = Maze(filename)
+
+    sys.setswitchinterval(1e-6)
+    start = time.perf_counter()
+    failures = stress(mazes, args.threads, args.runs, args.seed)
+    elapsed = time.perf_counter() - start
+    for failure in failures:
+        print(f"FAILED: {failure}", file=sys.stderr)
+    print(f"{args.runs} concurrent runs on {len(mazes)} shared mazes, {args.threads} threads: "
+          f"{len(failures)} failures ({elapsed:.1f} s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Adjacency array graph benchmark for 'search' module, using 'maze.py' as
+workload.
+
+Generates a seeded maze (see maze_generator.py), and solves it with
+MazeNode nodes (generic search) and as a GraphProblem (Maze.to_graph(),
+searched on vertex numbers and arrays). Reports solve time, expanded nodes
+and speedup for each algorithm, and the time taken to build the graph
+once. Solution lengths (BFS, DFS) or costs (UCS, ASTAR) are checked to be
+the same.
+
+Usage:
+    python3 graph_benchmark.py [--family obstacles] [--size 401]
+                               [--algorithms BFS UCS ASTAR]
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+    maze.py
+
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../maze')))
+
+from maze import Maze   # pylint: disable=C0413
+from maze_generator import FAMILIES, generate_maze, write_maze  # pylint: disable=C0413
+
+
+def main() -> None:
+    """Parses command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('--family', choices=list(FAMILIES), default='obstacles')
+    parser.add_argument('--size', type=int, default=401,
+                        help="maze rows and columns (default: 401)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--algorithms', nargs='+', default=['BFS', 'DFS', 'UCS', 'ASTAR'],
+                        choices=['BFS', 'DFS', 'UCS', 'ASTAR'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, f"{args.family}_{args.size}.txt")
+        write_maze(generate_maze(args.family, args.size, args.size, args.seed), filename)
+        maze = Maze(filename)
+    start = time.perf_counter()
+    graph = maze.to_graph()
+    print(f"{args.family} {maze.height}x{maze.width}: {len(graph.targets)} edges, "
+          f"graph built in {time.perf_counter() - start:.3f} s")
+
+    print(f"{'algorithm':<10}{'node s':>9}{'graph s':>9}{'expanded':>10}{'vertices':>10}"
+          f"{'speedup':>9}  result")
+    for algorithm in args.algorithms:
+        start = time.perf_counter()
+        solved = maze.solve(algorithm, observers=[])
+        node_time = time.perf_counter() - start
+        expanded = maze.stats.expanded
+        path = [node.state for node in maze.solution] if solved else None
+        path_cost = maze._path_cost  # pylint: disable=W0212
+        result = None if not solved \
+            else len(path) if algorithm in ('BFS', 'DFS') else path_cost(path)
+
+        start = time.perf_counter()
+        solved = graph.solve(algorithm)
+        graph_time = time.perf_counter() - start
+        graph_result = None if not solved \
+            else len(graph.solution) if algorithm in ('BFS', 'DFS') else graph.solution.cost()
+        check = result if graph_result == result else f"DIFFERENT: {result} {graph_result}"
+        print(f"{algorithm:<10}{node_time:>9.3f}{graph_time:>9.3f}{expanded:>10}"
+              f"{graph.stats.expanded:>10}{node_time / graph_time:>9.2f}  {check}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Landmark (ALT) heuristic benchmark for 'maze.py' (see Maze.use_landmarks()).
+
+Generates seeded mazes of several families (see maze_generator.py), and
+answers random path queries (random open start and goal cells, see
+Maze.with_endpoints()) with A*, first with Manhattan distance heuristics,
+then with landmark lower bounds. Reports landmark preprocessing and
+loading times, distances file size, mean expanded nodes and solve time per
+query, and the reduction in expansions. Solution costs are checked to be
+the same.
+
+Usage:
+    python3 landmark_benchmark.py [--families perfect obstacles] [--size 201]
+                                  [--landmarks 8] [--queries 50]
+
+Landmarks pay off most in mazes whose walls make Manhattan distance a poor
+estimate (perfect and spiral mazes); in open mazes both are close.
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+    maze.py
+
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../maze')))
+
+from maze import Maze   # pylint: disable=C0413
+from maze_generator import FAMILIES, generate_maze, write_maze  # pylint: disable=C0413
+
+
+def main() -> None:
+    """Parses command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('--families', nargs='+', choices=list(FAMILIES),
+                        default=['perfect', 'spiral', 'obstacles', 'rooms', 'weighted'])
+    parser.add_argument('--size', type=int, default=201,
+                        help="maze rows and columns (default: 201)")
+    parser.add_argument('--landmarks', type=int, default=8,
+                        help="number of landmarks (default: 8)")
+    parser.add_argument('--queries', type=int, default=50,
+                        help="random path queries per maze (default: 50)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'family':<11}{'build s':>9}{'load s':>8}{'file KB':>9}{'expanded':>10}"
+          f"{'ALT':>9}{'ratio':>7}{'solve ms':>10}{'ALT ms':>9}  costs")
+    for family in args.families:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, f"{family}_{args.size}.txt")
+            write_maze(generate_maze(family, args.size, args.size, args.seed), filename)
+            maze = Maze(filename)
+            landmarks = maze.use_landmarks(args.landmarks)
+            build_time = landmarks.build_time
+            file_size = os.path.getsize(f"{filename}.landmarks")
+            loaded = maze.use_landmarks(args.landmarks)
+            load_time = loaded.build_time
+
+        rnd = random.Random(args.seed)
+        cells = [(row, col) for row in range(maze.height) for col in range(maze.width)
+                 if not maze.walls[row][col]]
+        totals = {'plain': [0, 0.0], 'alt': [0, 0.0]}
+        different = 0
+        for _ in range(args.queries):
+            start, goal = rnd.sample(cells, 2)
+            costs = {}
+            for name in totals:
+                query = maze.with_endpoints(start, [goal])
+                if name == 'plain':
+                    query.landmarks = None
+                started = time.perf_counter()
+                result = query.solve('ASTAR', observers=[])
+                totals[name][1] += time.perf_counter() - started
+                totals[name][0] += result.stats.expanded
+                costs[name] = result.solution.cost() if result.solved else None
+            different += costs['plain'] != costs['alt']
+        plain, alt = totals['plain'], totals['alt']
+        print(f"{family:<11}{build_time:>9.3f}{load_time:>8.3f}{file_size / 1024:>9.0f}"
+              f"{plain[0] / args.queries:>10.0f}{alt[0] / args.queries:>9.0f}"
+              f"{alt[0] / plain[0] if plain[0] else 0.0:>7.3f}"
+              f"{plain[1] * 1000 / args.queries:>10.2f}{alt[1] * 1000 / args.queries:>9.2f}"
+              f"  {'same' if not different else f'DIFFERENT in {different} queries'}")
+
+
+if __name__ == '__main__':
+    main()
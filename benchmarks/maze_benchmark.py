@@ -0,0 +1,244 @@
+"""
+Benchmark suite for 'search' module, using 'maze.py' as workload.
+
+Generates seeded maze layouts (see maze_generator.py) for every topology
+family and size, and for each one measures:
+
+    - Maze load time (layout file parsing)
+    - solve() time, for every algorithm ('JPS' is skipped on weighted
+      mazes, as it requires uniform move costs)
+    - expansions (explored nodes) per second
+    - child nodes built, out of generated ones (with '--observers none',
+      duplicate states are discarded before their node is built, see
+      Node.successors())
+    - peak memory allocated during solve() (tracemalloc, separate run)
+
+Results are emitted as JSON lines (one record per family, size and
+algorithm), so runs on different commits can be compared with --compare.
+
+Usage:
+    python3 maze_benchmark.py [--max-cells N] [--output results.jsonl]
+    python3 maze_benchmark.py --compare old.jsonl new.jsonl
+
+Sizes run from 10^2 cells up to --max-cells (10^7 at most). Defaults keep
+the whole suite within a couple of minutes. Large sizes need
+'--observers none', as the default MemorySink copies explored nodes at
+every step.
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+    maze.py
+
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../maze')))
+
+from search import CounterSink, MemorySink  # pylint: disable=C0413
+from maze import Maze   # pylint: disable=C0413
+from maze_generator import FAMILIES, generate_maze, write_maze  # pylint: disable=C0413
+
+ALGORITHMS = ['BFS', 'DFS', 'UCS', 'JPS']
+OBSERVERS = {
+    'memory': lambda: [MemorySink()],
+    'counters': lambda: [CounterSink()],
+    'none': list,
+}
+SIZES = [10 ** exponent for exponent in range(2, 8)]
+
+
+def maze_dimensions(cells: int) -> Tuple[int, int]:
+    """Rows and columns of a square maze with about 'cells' cells.
+
+    Args:
+        cells (int): Number of cells wanted.
+
+    Returns:
+        tuple: (rows, cols).
+    """
+    side = max(5, round(cells ** 0.5))
+    return side, side
+
+
+def git_commit() -> Optional[str]:
+    """Returns current git commit hash, or None if not available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure_solve(maze: Maze, algorithm: str, repeat: int,
+                  memory: bool, observers: str = 'memory') -> Dict[str, object]:
+    """Solves 'maze' and measures time, expansions and peak memory.
+
+    Args:
+        maze (Maze): Loaded maze.
+        algorithm (str): Algorithm name passed to Maze.solve().
+        repeat (int): Number of timed solves (best time is reported).
+        memory (bool): If True, an extra solve is traced with tracemalloc
+            (see SearchStats).
+        observers (str): Observers attached to solve() (see OBSERVERS).
+
+    Returns:
+        dict: Measurements.
+    """
+    solve_time = float('inf')
+    for _ in range(repeat):
+        observer_list = OBSERVERS[observers]()
+        start = time.perf_counter()
+        solved = maze.solve(algorithm, observers=observer_list).solved
+        solve_time = min(solve_time, time.perf_counter() - start)
+
+    expansions = maze.stats.expanded
+    path_cost = maze._path_cost  # pylint: disable=W0212
+    result = {
+        'solved': solved,
+        'solution_length': len(maze.solution) if solved else None,
+        'solution_cost': path_cost(node.state for node in maze.solution) if solved else None,
+        'expansions': expansions,
+        'generated': maze.stats.generated,
+        'duplicates': maze.stats.duplicates,
+        'nodes_built': maze.stats.nodes_built,
+        'peak_frontier': maze.stats.peak_frontier,
+        'solve_s': solve_time,
+        'expansions_per_s': expansions / solve_time if solve_time > 0 else None,
+        'peak_memory_bytes': None,
+    }
+
+    if memory:
+        maze.solve(algorithm, trace_memory=True, observers=OBSERVERS[observers]())
+        result['peak_memory_bytes'] = maze.stats.peak_memory
+    return result
+
+
+def run_suite(families: List[str], sizes: List[int], algorithms: List[str],
+              seed: int, repeat: int, memory: bool,
+              observers: str = 'memory') -> Iterator[Dict[str, object]]:
+    """Runs benchmarks, yielding one record per family, size and algorithm.
+
+    Args:
+        families (list): Maze families to generate.
+        sizes (list): Approximate number of cells of each maze.
+        algorithms (list): Algorithms to solve each maze with.
+        seed (int): Maze generator seed.
+        repeat (int): Timed solves per algorithm.
+        memory (bool): Measure peak memory.
+        observers (str): Observers attached to solve() (see OBSERVERS).
+
+    Yields:
+        dict: Benchmark record.
+    """
+    common = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': seed,
+        'observers': observers,
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for family in families:
+            for cells in sizes:
+                rows, cols = maze_dimensions(cells)
+                lines = generate_maze(family, rows, cols, seed)
+                filename = os.path.join(tmp_dir, f"{family}_{cells}.txt")
+                write_maze(lines, filename)
+
+                start = time.perf_counter()
+                maze = Maze(filename)
+                load_time = time.perf_counter() - start
+
+                for algorithm in algorithms:
+                    if algorithm == 'JPS' and maze.weighted:
+                        continue
+                    record = dict(common, family=family, algorithm=algorithm,
+                                  cells=maze.height * maze.width,
+                                  rows=maze.height, cols=maze.width,
+                                  load_s=load_time)
+                    record.update(measure_solve(maze, algorithm, repeat, memory, observers))
+                    yield record
+
+
+def compare(old_filename: str, new_filename: str) -> None:
+    """Prints solve time and memory ratios (new / old) of two result files.
+
+    Args:
+        old_filename (str): JSON lines results of reference run.
+        new_filename (str): JSON lines results of run to compare.
+    """
+    def load(filename: str) -> Dict[tuple, dict]:
+        with open(filename, encoding="utf-8") as file:
+            records = [json.loads(line) for line in file if line.strip()]
+        return {(rec['family'], rec['cells'], rec['algorithm']): rec for rec in records}
+
+    old, new = load(old_filename), load(new_filename)
+    print(f"{'family':<11}{'cells':>10} {'algorithm':<10}"
+          f"{'old solve s':>13}{'new solve s':>13}{'ratio':>8}{'mem ratio':>11}")
+    for key in sorted(old.keys() & new.keys()):
+        old_rec, new_rec = old[key], new[key]
+        ratio = new_rec['solve_s'] / old_rec['solve_s'] if old_rec['solve_s'] else float('nan')
+        if old_rec.get('peak_memory_bytes') and new_rec.get('peak_memory_bytes'):
+            mem_ratio = f"{new_rec['peak_memory_bytes'] / old_rec['peak_memory_bytes']:>11.2f}"
+        else:
+            mem_ratio = f"{'-':>11}"
+        print(f"{key[0]:<11}{key[1]:>10} {key[2]:<10}"
+              f"{old_rec['solve_s']:>13.4f}{new_rec['solve_s']:>13.4f}{ratio:>8.2f}{mem_ratio}")
+
+
+def main() -> None:
+    """Parses command line arguments and runs the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('--families', nargs='+', default=list(FAMILIES),
+                        choices=list(FAMILIES))
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS)
+    parser.add_argument('--max-cells', type=float, default=1e4,
+                        help="largest maze size, in cells (default: 1e4, up to 1e7)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="timed solves per algorithm, best is reported")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip tracemalloc peak memory measurement")
+    parser.add_argument('--observers', choices=list(OBSERVERS), default='memory',
+                        help="solve() observers: 'memory' records every step "
+                             "(solve() default), 'none' records nothing")
+    parser.add_argument('--output', help="JSON lines results file (default: stdout)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two results files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    sizes = [cells for cells in SIZES if cells <= args.max_cells]
+    output = open(args.output, 'w', encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in run_suite(args.families, sizes, args.algorithms,
+                                args.seed, args.repeat, not args.no_memory,
+                                args.observers):
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+            print(f"{record['family']:<11}{record['cells']:>10} {record['algorithm']:<5}"
+                  f" solve {record['solve_s']:.4f}s"
+                  f" ({record['expansions']} expansions, {record['nodes_built']} of"
+                  f" {record['generated']} children built)", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
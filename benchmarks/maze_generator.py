@@ -0,0 +1,213 @@
+"""
+Deterministic, seeded maze layouts generator for benchmarks.
+
+Generates maze layouts, in 'maze.py' layout file format, for several
+topology families:
+
+    perfect     Perfect maze (one path between any two cells), carved with
+                an iterative randomized depth-first search.
+    rooms       Grid of open rooms connected by one door per shared wall.
+    obstacles   Open area with randomly placed wall cells.
+    spiral      Single long corridor spiraling from the border to the center.
+    unsolvable  Perfect maze whose goal cell is walled in.
+    weighted    Open area with random walls, mud and water patches (terrain
+                cells with higher move costs, see maze.py TERRAIN_COSTS).
+
+Same family, size and seed always generate the same layout.
+
+Usage:
+    python3 maze_generator.py <family> <rows> <cols> [seed] > layout.txt
+
+Dependencies:
+    Python 3.6 or higher
+
+"""
+import sys
+import random
+from typing import Callable, Dict, List
+
+WALL = '█'
+PATH = ' '
+START = 'A'
+GOAL = 'B'
+MUD = ':'
+WATER = '~'
+
+
+def generate_maze(family: str, rows: int, cols: int, seed: int = 0) -> List[str]:
+    """Generates a maze layout.
+
+    Layouts are always surrounded by walls, and have at least 5 rows and 5
+    columns (perfect based families round dimensions up to odd values).
+
+    Args:
+        family (str): Topology family (see FAMILIES).
+        rows (int): Number of rows in layout.
+        cols (int): Number of columns in layout.
+        seed (int, optional): Random generator seed. Defaults to 0.
+
+    Returns:
+        list: Layout lines (str), without line endings.
+
+    Raises:
+        ValueError: If family is unknown.
+
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown maze family: {family}")
+    rnd = random.Random(f"{family}-{rows}-{cols}-{seed}")
+    grid = FAMILIES[family](max(rows, 5), max(cols, 5), rnd)
+    return [''.join(row) for row in grid]
+
+
+def write_maze(lines: List[str], filename: str) -> None:
+    """Writes maze layout lines to a utf-8 text file.
+
+    Args:
+        lines (list): Layout lines, as returned by generate_maze().
+        filename (str): Layout file path.
+
+    """
+    with open(filename, 'w', encoding="utf-8") as file:
+        file.writelines(line + "\n" for line in lines)
+
+
+def _walled_grid(rows: int, cols: int, fill: str) -> List[List[str]]:
+    """Grid filled with 'fill' character, surrounded by walls."""
+    grid = [[fill] * cols for _ in range(rows)]
+    for row in (grid[0], grid[-1]):
+        row[:] = [WALL] * cols
+    for row in grid:
+        row[0] = row[-1] = WALL
+    return grid
+
+
+def _perfect(rows: int, cols: int, rnd: random.Random) -> List[List[str]]:
+    """Perfect maze from top left to bottom right corner."""
+    rows, cols = rows | 1, cols | 1
+    grid = [[WALL] * cols for _ in range(rows)]
+    grid[1][1] = PATH
+    stack = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        neighbors = [(row + dr, col + dc, dr, dc)
+                     for dr, dc in ((-2, 0), (0, 2), (2, 0), (0, -2))
+                     if 0 < row + dr < rows - 1 and 0 < col + dc < cols - 1
+                     and grid[row + dr][col + dc] == WALL]
+        if not neighbors:
+            stack.pop()
+            continue
+        new_row, new_col, dr, dc = rnd.choice(neighbors)
+        grid[row + dr // 2][col + dc // 2] = PATH
+        grid[new_row][new_col] = PATH
+        stack.append((new_row, new_col))
+    grid[1][1] = START
+    grid[rows - 2][cols - 2] = GOAL
+    return grid
+
+
+def _rooms(rows: int, cols: int, rnd: random.Random) -> List[List[str]]:
+    """Open rooms, about 8x8 cells each, connected by doors."""
+    grid = _walled_grid(rows, cols, PATH)
+    room = 9
+    wall_rows = list(range(room, rows - 2, room))
+    wall_cols = list(range(room, cols - 2, room))
+    for row in wall_rows:
+        grid[row][1:-1] = [WALL] * (cols - 2)
+    for col in wall_cols:
+        for row in range(1, rows - 1):
+            grid[row][col] = WALL
+
+    row_limits = [0] + wall_rows + [rows - 1]
+    col_limits = [0] + wall_cols + [cols - 1]
+    for top, bottom in zip(row_limits, row_limits[1:]):
+        for left, right in zip(col_limits, col_limits[1:]):
+            if bottom != rows - 1:
+                grid[bottom][rnd.randint(left + 1, right - 1)] = PATH
+            if right != cols - 1:
+                grid[rnd.randint(top + 1, bottom - 1)][right] = PATH
+    grid[1][1] = START
+    grid[rows - 2][cols - 2] = GOAL
+    return grid
+
+
+def _obstacles(rows: int, cols: int, rnd: random.Random) -> List[List[str]]:
+    """Open area with 25% of random wall cells."""
+    grid = _walled_grid(rows, cols, PATH)
+    for row in range(1, rows - 1):
+        for col in range(1, cols - 1):
+            if rnd.random() < 0.25:
+                grid[row][col] = WALL
+    grid[1][1] = START
+    grid[rows - 2][cols - 2] = GOAL
+    return grid
+
+
+def _spiral(rows: int, cols: int, rnd: random.Random) -> List[List[str]]: # pylint: disable=W0613
+    """Corridor spiraling clockwise from top left corner to the center."""
+    grid = [[WALL] * cols for _ in range(rows)]
+    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    row, col, heading = 1, 1, 0
+    grid[row][col] = START
+
+    def can_move(dr: int, dc: int) -> bool:
+        ahead_row, ahead_col = row + 2 * dr, col + 2 * dc
+        return 0 < ahead_row < rows - 1 and 0 < ahead_col < cols - 1 \
+            and grid[ahead_row][ahead_col] == WALL
+
+    while True:
+        if not can_move(*directions[heading]):
+            heading = (heading + 1) % 4
+            if not can_move(*directions[heading]):
+                break
+        row += directions[heading][0]
+        col += directions[heading][1]
+        grid[row][col] = PATH
+    grid[row][col] = GOAL
+    return grid
+
+
+def _unsolvable(rows: int, cols: int, rnd: random.Random) -> List[List[str]]:
+    """Perfect maze with goal cell surrounded by walls."""
+    grid = _perfect(rows, cols, rnd)
+    row, col = len(grid) - 2, len(grid[0]) - 2
+    grid[row - 1][col] = grid[row][col - 1] = WALL
+    return grid
+
+
+def _weighted(rows: int, cols: int, rnd: random.Random) -> List[List[str]]:
+    """Open area with 10% of random wall cells and mud and water patches."""
+    grid = _walled_grid(rows, cols, PATH)
+    for _ in range(max(1, rows * cols // 40)):
+        terrain = rnd.choice((MUD, WATER))
+        height, width = rnd.randint(1, 6), rnd.randint(1, 6)
+        top, left = rnd.randint(1, rows - 2), rnd.randint(1, cols - 2)
+        for row in range(top, min(top + height, rows - 1)):
+            grid[row][left:min(left + width, cols - 1)] = \
+                [terrain] * (min(left + width, cols - 1) - left)
+    for row in range(1, rows - 1):
+        for col in range(1, cols - 1):
+            if rnd.random() < 0.1:
+                grid[row][col] = WALL
+    grid[1][1] = START
+    grid[rows - 2][cols - 2] = GOAL
+    return grid
+
+
+FAMILIES: Dict[str, Callable[[int, int, random.Random], List[List[str]]]] = {
+    'perfect': _perfect,
+    'rooms': _rooms,
+    'obstacles': _obstacles,
+    'spiral': _spiral,
+    'unsolvable': _unsolvable,
+    'weighted': _weighted,
+}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (4, 5):
+        sys.exit("Usage: python maze_generator.py <family> <rows> <cols> [seed]\n"
+                 f"Families: {', '.join(FAMILIES)}")
+    for layout_line in generate_maze(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]),
+                                     int(sys.argv[4]) if len(sys.argv) == 5 else 0):
+        print(layout_line)
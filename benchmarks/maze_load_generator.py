@@ -0,0 +1,292 @@
+"""
+Load generator for the maze path query server (maze_server.py).
+
+Sends random path queries (random open start and goal cells of the given
+maze files) to a running server from several concurrent client threads,
+and reports client side latency percentiles and throughput, together with
+the server /metrics. A fraction of the queries repeats earlier ones, to
+exercise the server result cache.
+
+With --self-test, everything runs on localhost in this process: seeded
+mazes are generated (see maze_generator.py), a server is started on a free
+port, and a load run checks that every answer is a valid path, as short
+as a local BFS solve (except DFS answers, which need not be shortest),
+that repeated queries are cached, that invalid queries are rejected and
+that server metrics count every request. The exit status is 0 if every
+check passes.
+
+Usage:
+    python3 maze_load_generator.py --url http://127.0.0.1:8000 <maze files>
+                                   [--requests 1000] [--concurrency 8]
+    python3 maze_load_generator.py --self-test
+
+Dependencies:
+    Python 3.7 or higher
+    search module
+    maze.py, maze_server.py
+
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../maze')))
+
+from maze import Maze   # pylint: disable=C0413
+from maze_server import MazeServer, load_mazes  # pylint: disable=C0413
+from maze_generator import generate_maze, write_maze  # pylint: disable=C0413
+
+
+def request(url: str, query: Optional[dict] = None) -> Tuple[int, dict]:
+    """Sends a request to the server.
+
+    Args:
+        url (str): Endpoint URL.
+        query (dict, optional): JSON body, sent with POST. Defaults to None
+            (GET request).
+
+    Returns:
+        tuple: (HTTP status, decoded JSON answer).
+    """
+    data = None if query is None else json.dumps(query).encode('utf-8')
+    req = urllib.request.Request(url, data=data,
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def open_cells(maze: Maze) -> List[Tuple[int, int]]:
+    """Open (not wall) cells of a maze.
+
+    Args:
+        maze (Maze): Loaded maze.
+
+    Returns:
+        list: (row, column) positions.
+    """
+    return [(row, col) for row in range(maze.height) for col in range(maze.width)
+            if not maze.walls[row][col]]
+
+
+def make_queries(mazes: Dict[str, Maze], count: int, repeat_ratio: float,
+                 algorithms: List[str], seed: int) -> List[dict]:
+    """Random path queries.
+
+    Args:
+        mazes (dict): Mazes by server name.
+        count (int): Number of queries.
+        repeat_ratio (float): Fraction of queries repeating an earlier one.
+        algorithms (list): Algorithms to pick from.
+        seed (int): Random generator seed.
+
+    Returns:
+        list: Queries (see maze_server.py /solve).
+    """
+    rnd = random.Random(seed)
+    cells = {name: open_cells(maze) for name, maze in mazes.items()}
+    queries = []
+    for _ in range(count):
+        if queries and rnd.random() < repeat_ratio:
+            queries.append(rnd.choice(queries))
+            continue
+        name = rnd.choice(sorted(mazes))
+        start, goal = rnd.sample(cells[name], 2)
+        queries.append({'maze': name, 'algorithm': rnd.choice(algorithms),
+                        'start': start, 'goals': [goal]})
+    return queries
+
+
+def run_load(base_url: str, queries: List[dict],
+             concurrency: int) -> Tuple[List[Tuple[dict, int, dict]], Dict[str, object]]:
+    """Sends queries from 'concurrency' client threads.
+
+    Args:
+        base_url (str): Server URL.
+        queries (list): Queries to send.
+        concurrency (int): Number of client threads.
+
+    Returns:
+        tuple: (query, status, answer) of every query, and client side
+        metrics (latency percentiles in milliseconds, throughput).
+    """
+    latencies = []
+    lock = threading.Lock()
+
+    def send(query: dict) -> Tuple[dict, int, dict]:
+        started = time.perf_counter()
+        status, answer = request(base_url + '/solve', query)
+        with lock:
+            latencies.append(time.perf_counter() - started)
+        return query, status, answer
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        answers = list(executor.map(send, queries))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    metrics = {
+        'requests': len(queries),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(queries) / elapsed if elapsed > 0 else None,
+        'latency_ms': {name: latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+                       * 1000 if latencies else None
+                       for name, fraction in (('p50', 0.5), ('p90', 0.9),
+                                              ('p99', 0.99), ('max', 1.0))},
+    }
+    return answers, metrics
+
+
+def check_answers(mazes: Dict[str, Maze], answers: List[Tuple[dict, int, dict]]) -> List[str]:
+    """Checks query answers against local BFS solves.
+
+    Args:
+        mazes (dict): Mazes by server name.
+        answers (list): (query, status, answer) of every query.
+
+    Returns:
+        list: Failed check messages (empty if every answer is right).
+    """
+    failures = []
+    lengths = {}
+    for query, status, answer in answers:
+        if status != 200:
+            failures.append(f"{query}: status {status} {answer}")
+            continue
+        maze = mazes[query['maze']]
+        start, goal = tuple(query['start']), tuple(query['goals'][0])
+        key = (query['maze'], start, goal)
+        if key not in lengths:
+            local = maze.with_endpoints(start, [goal])
+            lengths[key] = len(local.solution) if local.solve('BFS', observers=[]) else None
+        if not answer['solved']:
+            if lengths[key] is not None:
+                failures.append(f"{query}: not solved")
+            continue
+        path = [tuple(position) for position in answer['path']]
+        steps_ok = all(abs(row - prev_row) + abs(col - prev_col) == 1
+                       and not maze.walls[row][col]
+                       for (prev_row, prev_col), (row, col) in zip(path, path[1:]))
+        if path[0] != start or path[-1] != goal or not steps_ok:
+            failures.append(f"{query}: invalid path")
+        elif query['algorithm'] != 'DFS' and not maze.weighted \
+                and answer['length'] != lengths[key]:
+            failures.append(f"{query}: length {answer['length']}, BFS {lengths[key]}")
+    return failures
+
+
+def self_test(requests: int, concurrency: int) -> bool:
+    """Runs the server and a load run on localhost, and checks answers.
+
+    Args:
+        requests (int): Number of load queries.
+        concurrency (int): Number of client threads.
+
+    Returns:
+        bool: True if every check passes.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filenames = []
+        for family, size in (('perfect', 31), ('obstacles', 40), ('rooms', 35)):
+            filename = os.path.join(tmp_dir, f"{family}.txt")
+            write_maze(generate_maze(family, size, size, seed=1), filename)
+            filenames.append(filename)
+        mazes = load_mazes(filenames)
+
+    server = MazeServer(('127.0.0.1', 0), mazes, cache_size=256)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    failures = []
+    client_metrics, server_metrics = None, None
+    try:
+        status, maze_list = request(base_url + '/mazes')
+        if status != 200 or sorted(item['name'] for item in maze_list) != sorted(mazes):
+            failures.append(f"/mazes: status {status} {maze_list}")
+
+        queries = make_queries(mazes, requests, 0.3, ['BFS', 'ASTAR', 'JPS', 'DFS'], seed=1)
+        answers, client_metrics = run_load(base_url, queries, concurrency)
+        failures += check_answers(mazes, answers)
+
+        request(base_url + '/solve', queries[0])
+        status, answer = request(base_url + '/solve', queries[0])
+        if status != 200 or not answer['cached']:
+            failures.append("repeated query was not cached")
+        bad_queries = [{'maze': 'missing'}, {'maze': [1]}, {'maze': {}},
+                       {'maze': 'perfect', 'algorithm': 'XYZ'},
+                       {'maze': 'perfect', 'algorithm': ['BFS']},
+                       {'maze': 'perfect', 'start': [0, 0]},
+                       {'maze': 'perfect', 'start': [1]},
+                       {'maze': 'perfect', 'start': [1, 1, 1]},
+                       {'maze': 'perfect', 'start': [1.5, 1]},
+                       {'maze': 'perfect', 'start': "ab"},
+                       {'maze': 'perfect', 'goals': [[1]]},
+                       {'maze': 'perfect', 'goals': "ab"}]
+        for bad_query in bad_queries:
+            try:
+                status, answer = request(base_url + '/solve', bad_query)
+            except (OSError, ValueError) as error:
+                status, answer = None, {'error': str(error)}
+            if status != 400 or 'error' not in answer:
+                failures.append(f"{bad_query}: status {status}, expected 400")
+
+        status, server_metrics = request(base_url + '/metrics')
+        expected_requests = 1 + len(queries) + 2 + len(bad_queries)
+        if server_metrics['requests'] != expected_requests \
+                or server_metrics['errors'] != len(bad_queries):
+            failures.append(f"/metrics: {server_metrics['requests']} requests, "
+                            f"{server_metrics['errors']} errors, expected "
+                            f"{expected_requests} and {len(bad_queries)}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(json.dumps({'client': client_metrics, 'server': server_metrics}, indent=2))
+    for failure in failures:
+        print(f"FAILED: {failure}", file=sys.stderr)
+    print("Self-test " + ("FAILED" if failures else "passed"), file=sys.stderr)
+    return not failures
+
+
+def main() -> None:
+    """Parses command line arguments and runs the load or the self-test."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('mazes', nargs='*', help="maze layout files loaded by the server")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--repeat-ratio', type=float, default=0.3,
+                        help="fraction of repeated queries (default: 0.3)")
+    parser.add_argument('--algorithms', nargs='+', default=['BFS', 'ASTAR'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--self-test', action='store_true',
+                        help="run server and checks on localhost")
+    args = parser.parse_args()
+
+    if args.self_test:
+        sys.exit(0 if self_test(args.requests, args.concurrency) else 1)
+    if not args.mazes:
+        parser.error("maze files are needed, unless --self-test")
+
+    mazes = load_mazes(args.mazes)
+    queries = make_queries(mazes, args.requests, args.repeat_ratio, args.algorithms, args.seed)
+    answers, client_metrics = run_load(args.url, queries, args.concurrency)
+    client_metrics['errors'] = sum(status != 200 for _, status, _ in answers)
+    _, server_metrics = request(args.url + '/metrics')
+    print(json.dumps({'client': client_metrics, 'server': server_metrics}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
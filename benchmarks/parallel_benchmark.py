@@ -0,0 +1,110 @@
+"""
+Parallel search scaling benchmark for 'search' module, using 'maze.py' as
+workload.
+
+Generates a large seeded maze (see maze_generator.py), solves it serially
+and then with solve(workers=N) for N = 1, 2, 4, ... up to --max-workers,
+and reports solve time, expanded nodes and speedup over the serial search
+for each algorithm. Solution lengths (BFS) or costs (ASTAR) are checked to
+be the same as the serial ones.
+
+Usage:
+    python3 parallel_benchmark.py [--family obstacles] [--size 400]
+                                  [--max-workers 8]
+
+Worker processes exchange children in pickled batches, so parallel search
+only pays off when expanding a node costs more than sending it: with cheap
+maze nodes, speedup stays below the number of cores.
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+    maze.py
+
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../maze')))
+
+from maze import Maze   # pylint: disable=C0413
+from maze_generator import FAMILIES, generate_maze, write_maze  # pylint: disable=C0413
+
+
+def worker_counts(max_workers: int) -> list:
+    """Powers of 2 up to 'max_workers', and 'max_workers' itself.
+
+    Args:
+        max_workers (int): Largest number of workers.
+
+    Returns:
+        list: Numbers of workers to benchmark.
+    """
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    return counts + [max_workers]
+
+
+def solution_result(maze: Maze, algorithm: str, solved: bool) -> object:
+    """Solution length (BFS) or cost (ASTAR) of the last solve() run.
+
+    Args:
+        maze (Maze): Solved maze.
+        algorithm (str): Algorithm of the last run.
+        solved (bool): solve() result.
+
+    Returns:
+        object: Solution length or cost, or None if not solved.
+    """
+    if not solved:
+        return None
+    return len(maze.solution) if algorithm == 'BFS' else maze.solution.cost()
+
+
+def main() -> None:
+    """Parses command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('--family', choices=list(FAMILIES), default='obstacles')
+    parser.add_argument('--size', type=int, default=400,
+                        help="maze rows and columns (default: 400)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--algorithms', nargs='+', default=['BFS', 'ASTAR'],
+                        choices=['BFS', 'ASTAR'])
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help="largest number of worker processes (default: cores)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, f"{args.family}_{args.size}.txt")
+        write_maze(generate_maze(args.family, args.size, args.size, args.seed), filename)
+        maze = Maze(filename)
+
+    print(f"{args.family} {maze.height}x{maze.width}, {os.cpu_count()} cores")
+    print(f"{'algorithm':<10}{'workers':>8}{'solve s':>10}{'expanded':>10}"
+          f"{'speedup':>9}  result")
+    for algorithm in args.algorithms:
+        start = time.perf_counter()
+        solved = maze.solve(algorithm, observers=[])
+        serial_time = time.perf_counter() - start
+        serial_result = solution_result(maze, algorithm, solved)
+        print(f"{algorithm:<10}{'serial':>8}{serial_time:>10.3f}{maze.stats.expanded:>10}"
+              f"{1:>9.2f}  {serial_result}")
+        for workers in worker_counts(args.max_workers):
+            start = time.perf_counter()
+            solved = maze.solve(algorithm, workers=workers)
+            elapsed = time.perf_counter() - start
+            result = solution_result(maze, algorithm, solved)
+            check = 'same' if result == serial_result else f"DIFFERENT: {result}"
+            print(f"{algorithm:<10}{workers:>8}{elapsed:>10.3f}{maze.stats.expanded:>10}"
+                  f"{serial_time / elapsed:>9.2f}  {check}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Maze graph reduction benchmark for 'maze.py' (see Maze.reduce()).
+
+Generates seeded mazes of several families (see maze_generator.py), and
+solves each one on the full grid and on its reduced graph (dead ends
+filled, corridors contracted). Reports the reduction ratio (junctions per
+open cell), expanded nodes, reduction and solve times, and the end to end
+speedup (reduction included). Solution costs are checked to be the same.
+
+Usage:
+    python3 reduction_benchmark.py [--families perfect obstacles] [--size 201]
+                                   [--algorithms UCS ASTAR]
+
+Perfect (corridor) mazes reduce best; mazes with open rooms have few cells
+with exactly two open neighbors, so their reduced graph is hardly smaller.
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+    maze.py
+
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../maze')))
+
+from maze import Maze   # pylint: disable=C0413
+from maze_generator import FAMILIES, generate_maze, write_maze  # pylint: disable=C0413
+
+
+def main() -> None:
+    """Parses command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('--families', nargs='+', choices=list(FAMILIES),
+                        default=['perfect', 'spiral', 'obstacles', 'rooms', 'weighted'])
+    parser.add_argument('--size', type=int, default=201,
+                        help="maze rows and columns (default: 201)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--algorithms', nargs='+', default=['UCS', 'ASTAR'],
+                        choices=['BFS', 'DFS', 'UCS', 'ASTAR'])
+    args = parser.parse_args()
+
+    print(f"{'family':<11}{'algorithm':<10}{'ratio':>7}{'expanded':>10}{'reduced':>9}"
+          f"{'solve s':>9}{'reduce s':>10}{'reduced s':>11}{'speedup':>9}  cost")
+    for family in args.families:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, f"{family}_{args.size}.txt")
+            write_maze(generate_maze(family, args.size, args.size, args.seed), filename)
+            maze = Maze(filename)
+        for algorithm in args.algorithms:
+            start = time.perf_counter()
+            solved = maze.solve(algorithm, observers=[])
+            solve_time = time.perf_counter() - start
+            cost = maze.solution.cost() if solved else None
+            expanded = maze.stats.expanded
+
+            maze.reduction = None   # Reduction time is part of the first reduced solve
+            start = time.perf_counter()
+            reduction = maze.reduce()
+            reduce_time = time.perf_counter() - start
+            solved = maze.solve(algorithm, observers=[], reduced=True)
+            reduced_time = time.perf_counter() - start - reduce_time
+            reduced_cost = maze.solution.cost() if solved else None
+            check = cost if reduced_cost == cost or algorithm in ('BFS', 'DFS') \
+                else f"DIFFERENT: {cost} {reduced_cost}"
+            print(f"{family:<11}{algorithm:<10}{reduction.ratio:>7.3f}{expanded:>10}"
+                  f"{maze.stats.expanded:>9}{solve_time:>9.3f}{reduce_time:>10.3f}"
+                  f"{reduced_time:>11.3f}{solve_time / (reduce_time + reduced_time):>9.2f}"
+                  f"  {check}")
+
+
+if __name__ == '__main__':
+    main()
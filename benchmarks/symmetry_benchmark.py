@@ -0,0 +1,174 @@
+"""
+Symmetry reduction benchmark for 'search' module.
+
+Sample problem is peg solitaire on a square board: a peg jumps over an
+orthogonally adjacent peg into an empty hole, and the jumped peg is
+removed. Goal is a board with a single peg left. The board has the 8
+symmetries of a square (rotations and reflections), so each state has up
+to 7 equivalent states with equivalent successors.
+
+For each board size, the whole reachable state space is explored with BFS
+(solve(complete_tree=True)) with and without Node.canonical_state(), and
+the number of expanded nodes and solve time are reported. The path to the
+last state explored with symmetry reduction is replayed move by move, to
+check it is a sequence of concrete legal jumps.
+
+Usage:
+    python3 symmetry_benchmark.py [--sizes 4 5]
+
+The 5x5 board takes a couple of minutes without symmetry reduction.
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+
+"""
+import os
+import sys
+import time
+import argparse
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../search')))
+
+from search import Node, SearchProblem  # pylint: disable=C0413
+
+
+class PegSolitaire(SearchProblem):
+    """Peg solitaire on a 'size' x 'size' board, starting with a single
+    hole in the center (next to it, for even sizes).
+
+    States are integers, with bit (row * size + column) set if the hole
+    holds a peg.
+
+    Attributes:
+        size (int): Board side.
+        jumps (list): (from, over, to) hole numbers of every possible jump.
+        symmetries (list): Hole number permutations of the 8 board
+            symmetries.
+    """
+
+    def __init__(self, size: int, node_class: type) -> None:
+        """Initializes the board with pegs in every hole but one.
+
+        Args:
+            size (int): Board side.
+            node_class (type): PegNode or SymmetricPegNode.
+        """
+        super().__init__()
+        self.size = size
+        self.jumps = []
+        for row in range(size):
+            for col in range(size):
+                for d_row, d_col in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+                    to_row, to_col = row + 2 * d_row, col + 2 * d_col
+                    if 0 <= to_row < size and 0 <= to_col < size:
+                        self.jumps.append((row * size + col,
+                                           (row + d_row) * size + col + d_col,
+                                           to_row * size + to_col))
+        self.symmetries = [[self._hole(*transform(row, col))
+                            for row in range(size) for col in range(size)]
+                           for transform in self._transforms()]
+        full = (1 << size * size) - 1
+        self.start_node = node_class(state=full ^ (1 << self._hole(size // 2, size // 2)))
+
+    def _hole(self, row: int, col: int) -> int:
+        """Hole number of a board position."""
+        return row * self.size + col
+
+    def _transforms(self) -> list:
+        """The 8 symmetries of the board, as (row, col) -> (row, col) functions."""
+        last = self.size - 1
+        return [
+            lambda r, c: (r, c), lambda r, c: (c, last - r),
+            lambda r, c: (last - r, last - c), lambda r, c: (last - c, r),
+            lambda r, c: (r, last - c), lambda r, c: (last - r, c),
+            lambda r, c: (c, r), lambda r, c: (last - c, last - r),
+        ]
+
+    def goal_test(self, state: int) -> bool:
+        """A single peg left."""
+        return state & (state - 1) == 0
+
+
+class PegNode(Node):
+    """Board state node, without symmetry reduction."""
+
+    def actions(self, search_problem: PegSolitaire) -> List[Tuple[int, int, int]]:
+        """Legal jumps: peg in 'from' and 'over' holes, 'to' hole empty."""
+        state = self.state
+        return [jump for jump in search_problem.jumps
+                if state >> jump[0] & 1 and state >> jump[1] & 1 and not state >> jump[2] & 1]
+
+    def result(self, action: Tuple[int, int, int], search_problem: PegSolitaire) -> 'PegNode':
+        """Board after the jump."""
+        from_hole, over_hole, to_hole = action
+        state = self.state ^ (1 << from_hole) ^ (1 << over_hole) ^ (1 << to_hole)
+        return self.__class__(state=state, parent=self, action=action)
+
+    @classmethod
+    def state_index(cls, state: int, search_problem: PegSolitaire) -> int:
+        """Board bits are already a dense integer."""
+        return state
+
+
+class SymmetricPegNode(PegNode):
+    """Board state node, with symmetry reduction."""
+
+    @classmethod
+    def canonical_state(cls, state: int, search_problem: PegSolitaire) -> int:
+        """Smallest board among the 8 symmetric ones."""
+        holes = [hole for hole in range(search_problem.size ** 2) if state >> hole & 1]
+        return min(sum(1 << symmetry[hole] for hole in holes)
+                   for symmetry in search_problem.symmetries)
+
+
+def replay(problem: PegSolitaire, last_node: PegNode) -> bool:
+    """Checks that the actions of the path to 'last_node' are legal jumps
+    leading to its state.
+
+    Args:
+        problem (PegSolitaire): Solved problem.
+        last_node (PegNode): Last node of the path.
+
+    Returns:
+        bool: True if the path is valid.
+    """
+    path = []
+    node = last_node
+    while node.parent is not None:
+        path.append(node)
+        node = node.parent
+    state = problem.start_node.state
+    for node in reversed(path):
+        from_hole, over_hole, to_hole = node.action
+        if not (state >> from_hole & 1 and state >> over_hole & 1 and not state >> to_hole & 1):
+            return False
+        state ^= (1 << from_hole) | (1 << over_hole) | (1 << to_hole)
+        if state != node.state:
+            return False
+    return True
+
+
+def main() -> None:
+    """Parses command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('--sizes', nargs='+', type=int, default=[4, 5],
+                        help="board sides (default: 4 5)")
+    args = parser.parse_args()
+
+    print(f"{'board':<7}{'symmetry':<10}{'expanded':>10}{'solve s':>10}")
+    for size in args.sizes:
+        for node_class, label in ((PegNode, 'no'), (SymmetricPegNode, 'yes')):
+            problem = PegSolitaire(size, node_class)
+            start = time.perf_counter()
+            problem.solve('BFS', observers=[], complete_tree=True)
+            elapsed = time.perf_counter() - start
+            print(f"{size}x{size:<5}{label:<10}{problem.stats.expanded:>10}{elapsed:>10.3f}")
+        last_node = problem.explored_nodes.nodes[-1]
+        print(f"{size}x{size} path to last explored state ({bin(last_node.state).count('1')}"
+              f" pegs left): {'valid' if replay(problem, last_node) else 'INVALID'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,14 @@ for solving search problems.
 Usage:
     python3 maze.py <maze layout .txt utf-8 file path>
 
+For non-interactive batch use (many files, JSON lines results), see
+maze_cli.py.
+
 Dependencies:
     Python 3.6 or higher
     search module
-    curses library ('pip install windows-curses' for Windows)
+    curses library, for dynamic solutions only ('pip install windows-curses'
+    for Windows)
 
 Author:
     JRM 2024.02
@@ -26,10 +30,22 @@ License:
 """
 import sys
 import os
+import copy
+import json
 import time
-import curses
-from typing import List, Tuple
-from search import Node, SearchProblem # pylint: disable=C0413
+import zlib
+import heapq
+from array import array
+from itertools import chain
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, TextIO, Tuple
+from search import (Node, SearchProblem, SearchObserver, SearchStats,  # pylint: disable=C0413
+                    SearchResult, TraceReader, GraphProblem, search_run)
+
+if TYPE_CHECKING:
+    import curses   # Imported when showing dynamic solutions only, for fast startup
+
+# Default terrain cells: character -> move cost (open path cells cost 1)
+TERRAIN_COSTS = {':': 3, '~': 5}  # mud, water
 
 
 class Maze(SearchProblem):
@@ -38,6 +54,8 @@ class Maze(SearchProblem):
     Subclasses SearchProblem class, to:
         Implement __init__() with attributes that define maze layout
 
+        Override solve() to add maze specific Jump Point Search algorithm
+
         Override show_solution() to print static maze layout with solution
         and dynamic maze path forming
 
@@ -49,8 +67,12 @@ class Maze(SearchProblem):
         start_char (str): Character representing the start point in maze file.
         goal_char (str): Character representing the goal point in maze file.
         path_char (str): Character representing the open path in maze file.
+        terrain (dict): Terrain characters in maze file and their move cost.
         walls (list of list of bool): Boolean grid representing walls (True)
             and open paths (False) in maze.
+        costs (array): Cost of moving into each cell, row by row (index
+            row * width + column); 1 for open path, 0 for walls.
+        weighted (bool): True if some cell costs other than 1.
         height (int): Number of rows in the maze.
         width (int): Number of columns in the maze.
         offset (dict): Directional offsets (horizontal, vertical) for movement.
@@ -58,18 +80,32 @@ class Maze(SearchProblem):
             displayed.
         layout_elements (dict): Styling for maze components during visualization.
         maze_solution_layout (dict): Stores elements for dynamic maze display.
+        reduction (MazeReduction): Reduced graph of the maze (see reduce()),
+            once computed.
+        reduced (bool): True if the current run (see 'current_result')
+            searched the reduced graph.
+        landmarks (MazeLandmarks): Landmark distances improving heuristics
+            (see use_landmarks()), or None for Manhattan distances only.
         start_node (MazeNode): Node object for the maze start position.
-        goal_node (MazeNode): Node object for the maze goal position.
+        goal_node (MazeNode): Node object for the maze goal position (first
+            goal in layout file, if there are several).
+        goal_states (set): Positions of every goal in the maze.
 
     Notes on maze layout definition file:
         Maze layout is defined in an utf-8 encoded text file. Each character in
         file represents a cell in maze grid. Cells can be:
 
             * starting cell (default character is ‘A’)
-            * goal cell (default character is ‘B’)
+            * goal cell (default character is ‘B’), one or more
             * path (default character is ‘ ‘)
+            * terrain, with a move cost other than path's (default characters
+              are ‘:‘ for mud, cost 3, and ‘~‘ for water, cost 5)
             * wall (any other character)
 
+        Moving into a cell costs its terrain cost (start and goal cells cost
+        as open path). Weighted mazes are solved with 'UCS' (Dijkstra's
+        algorithm) for the cheapest path.
+
         Maze layout file content example:
             '███████████'
             '█         █'
@@ -83,7 +119,8 @@ class Maze(SearchProblem):
 
 
     def __init__(self, filename: str, start_char: str = 'A',
-                 goal_char: str = 'B', path_char: str = ' ') -> None:
+                 goal_char: str = 'B', path_char: str = ' ',
+                 terrain: Optional[dict] = None) -> None:
         """Reads maze layout from 'filename' to initialize a maze object.
 
         Args:
@@ -94,6 +131,12 @@ class Maze(SearchProblem):
                 position in the maze. Defaults to 'B'.
             path_char (str, optional): The character representing the path in
                 the maze. Defaults to ' '.
+            terrain (dict, optional): Terrain characters mapped to their move
+                cost (positive integer, up to 65535). Defaults to
+                TERRAIN_COSTS.
+
+        Raises:
+            ValueError: If a terrain cost is not a positive integer.
 
         """
         super().__init__()
@@ -101,6 +144,12 @@ class Maze(SearchProblem):
         self.start_char = start_char
         self.goal_char = goal_char
         self.path_char = path_char
+        self.terrain = dict(TERRAIN_COSTS if terrain is None else terrain)
+        for char, cost in self.terrain.items():
+            if not isinstance(cost, int) or not 0 < cost < 65536:
+                raise ValueError(f"Invalid cost for terrain '{char}': {cost}")
+        self.costs = None
+        self.weighted = False
         self.height = None
         self.width = None
         self.offset = {"up": (-1, 0), "right": (0, 1), "down": (1, 0), "left": (0, -1)}
@@ -117,6 +166,8 @@ class Maze(SearchProblem):
             'start_goal': {'char': '_', 'color': 7, 'wait': 0.1},
         }
         self.maze_solution_layout = None
+        self.reduction = None
+        self.landmarks = None
         self._load_maze_from_file()
 
 
@@ -124,14 +175,15 @@ class Maze(SearchProblem):
         """Loads the maze configuration from a file.
 
         This method reads the maze configuration from a file specified by `self.filename`.
-        It ensures that the file contains exactly one start point and one goal point.
+        It ensures that the file contains exactly one start point and at least
+        one goal point.
         It also initializes the maze's dimensions and wall configuration.
 
         Raises:
             SystemExit: If the file is not found, permission is denied, or an
                 I/O error occurs.
             ValueError: If the maze does not contain exactly one start point or
-                one goal point.
+                at least one goal point.
 
         """
         # Read file and check start and goal points exist
@@ -148,16 +200,20 @@ class Maze(SearchProblem):
         # Ensure start and goal points are present
         if contents.count(self.start_char) != 1:
             raise ValueError("maze must have exactly one start point")
-        if contents.count(self.goal_char) != 1:
-            raise ValueError("maze must have exactly one goal")
+        if contents.count(self.goal_char) < 1:
+            raise ValueError("maze must have at least one goal")
 
         # Define height and width of maze (ignores empty lines)
         contents = [line for line in contents.splitlines() if line.strip()]
         self.height = len(contents)
         self.width = max(len(line) for line in contents)
 
-        # Creates wall values
+        # Creates wall values and cell costs
+        self.goal_node = None
+        self.goal_states = set()
         self.walls = []
+        self.costs = array('H', [1]) * (self.height * self.width)
+        terrain = self.terrain
         for i in range(self.height):
             row = []
             for j in range(self.width):
@@ -166,22 +222,552 @@ class Maze(SearchProblem):
                         self.start_node = MazeNode(state=(i, j))
                         row.append(False)
                     elif contents[i][j] == self.goal_char:
-                        self.goal_node = MazeNode(state=(i, j))
+                        if self.goal_node is None:
+                            self.goal_node = MazeNode(state=(i, j))
+                        self.goal_states.add((i, j))
                         row.append(False)
                     elif contents[i][j] == self.path_char:
                         row.append(False)
+                    elif contents[i][j] in terrain:
+                        self.costs[i * self.width + j] = terrain[contents[i][j]]
+                        row.append(False)
                     else:
+                        self.costs[i * self.width + j] = 0
                         row.append(True)
                 except IndexError:
                     row.append(False)
             self.walls.append(row)
+        self.weighted = any(cost > 1 for cost in self.costs)
+
+
+    def with_endpoints(self, start: Optional[Tuple[int, int]] = None,
+                       goals: Optional[Iterable[Tuple[int, int]]] = None) -> 'Maze':
+        """Returns a maze sharing this maze layout, with other start and goals.
+
+        Parsed layout (walls, costs) is shared, not copied, so queries with
+        different endpoints do not parse the layout file again. The copy has
+        its own search components, so it can be solved independently of
+        this maze, even concurrently.
+
+        Args:
+            start (tuple, optional): Start position (row, column). Defaults
+                to this maze start.
+            goals (Iterable, optional): Goal positions (row, column). Defaults
+                to this maze goals.
+
+        Returns:
+            Maze: The maze with the given endpoints.
+
+        Raises:
+            ValueError: If a position is a wall or out of the maze, or there
+                is no goal.
+
+        """
+        maze = copy.copy(self)
+        maze.last_result = SearchResult()
+        maze.maze_solution_layout = None
+        if start is not None:
+            start = tuple(start)
+            if not self._is_open(*start):
+                raise ValueError(f"Start position is not an open cell: {start}")
+            maze.start_node = MazeNode(state=start)
+        if goals is not None:
+            goal_states = [tuple(goal) for goal in goals]
+            if not goal_states:
+                raise ValueError("maze must have at least one goal")
+            for goal in goal_states:
+                if not self._is_open(*goal):
+                    raise ValueError(f"Goal position is not an open cell: {goal}")
+            maze.goal_node = MazeNode(state=goal_states[0])
+            maze.goal_states = set(goal_states)
+        return maze
+
+
+    @property
+    def reduced(self) -> bool:
+        """True if the current run searched the reduced graph."""
+        return getattr(self.current_result, 'reduced', False)
+
+
+    def reduce(self) -> 'MazeReduction':
+        """Returns the reduced graph of the maze, computing it if needed.
+
+        The reduced graph depends on start and goal positions, and is kept
+        in 'reduction' until they change.
+
+        Returns:
+            MazeReduction: The reduced graph.
+
+        """
+        goals = frozenset(self.goal_states)
+        if self.reduction is None or self.reduction.start != self.start_node.state \
+                or self.reduction.goals != goals:
+            self.reduction = MazeReduction(self, self.start_node.state, goals)
+        return self.reduction
+
+
+    def use_landmarks(self, count: int = 8, save: bool = True) -> 'MazeLandmarks':
+        """Enables landmark (ALT) heuristics for informed search algorithms.
+
+        Landmark distances are loaded from the file saved next to the layout
+        file (<layout>.landmarks), if it was saved for this layout with as
+        many landmarks. Otherwise they are computed (see MazeLandmarks), and
+        saved there if 'save' is True. Mazes returned by with_endpoints()
+        share them, so many queries on the same layout pay their
+        preprocessing once.
+
+        Heuristics are then the largest of Manhattan distance and landmark
+        lower bound, which are both admissible and consistent.
+
+        Args:
+            count (int): Number of landmarks.
+            save (bool): If True, computed distances are saved to file.
 
+        Returns:
+            MazeLandmarks: The landmarks, also kept in 'landmarks'.
+
+        Raises:
+            ValueError: If count is less than 1.
+
+        """
+        filename = f"{self.filename}.landmarks"
+        landmarks = MazeLandmarks.load(filename, self)
+        if landmarks is None or len(landmarks.cells) != count:
+            landmarks = MazeLandmarks.build(self, count)
+            if save:
+                landmarks.save(filename)
+        self.landmarks = landmarks
+        return landmarks
+
+
+    def to_graph(self) -> GraphProblem:
+        """Returns the maze as an explicit graph, in adjacency arrays.
+
+        Vertices are cell numbers (row * width + column, see
+        MazeNode.state_index()), walls included (without edges). Edges lead
+        to open neighbor cells, in MazeNode.actions() order, and cost the
+        move cost of the cell they lead to. Heuristics are estimates of the
+        cost to the nearest goal, as MazeNode.heuristic().
+
+        Returns:
+            GraphProblem: The graph, with maze start and goals.
+
+        """
+        cells = self.height * self.width
+        offsets = array('l', [0]) * (cells + 1)
+        targets = array('l')
+        weights = array('l')
+        for row in range(self.height):
+            for col in range(self.width):
+                if not self.walls[row][col]:
+                    for row_offset, col_offset in self.offset.values():
+                        if self._is_open(row + row_offset, col + col_offset):
+                            target = (row + row_offset) * self.width + col + col_offset
+                            targets.append(target)
+                            weights.append(self.costs[target])
+                offsets[row * self.width + col + 1] = len(targets)
+        heuristics = array('l', (self._heuristic(divmod(cell, self.width))
+                                 for cell in range(cells)))
+        return GraphProblem(offsets, targets, self.start_node.state[0] * self.width
+                            + self.start_node.state[1],
+                            [row * self.width + col for row, col in self.goal_states],
+                            None if not self.weighted else weights, heuristics)
+
+
+    def solve(self, search_algorithm: str = 'BFS', timed: bool = False,
+              trace_memory: bool = False,
+              observers: Optional[List[SearchObserver]] = None,
+              reduced: bool = False, **options) -> SearchResult:
+        """Solves the maze with the given search algorithm.
+
+        Overrides base method to add 'JPS' (Jump Point Search), a maze
+        specific algorithm. Any other algorithm is solved by
+        `SearchProblem.solve()`.
+
+        If the maze has several goals, the nearest one is searched (for BFS,
+        UCS, ASTAR and JPS), or all of them in 'all goals' mode.
+
+        If 'reduced' is True, the search runs on the reduced graph of the
+        maze (see reduce() and MazeReduction): dead ends are skipped, and
+        corridors are crossed in a single action whose cost is the corridor
+        cost. Explored nodes are then junctions only, and the solution is
+        filled back with every cell of the path. As corridors have different
+        costs, shortest paths need 'UCS' or 'ASTAR': 'BFS' finds the path
+        with fewest junctions, which is not provably optimal.
+
+        Args:
+            search_algorithm (str): The search strategy to use: 'BFS', 'DFS',
+                'UCS', 'ASTAR', 'BEAM', 'SMA*', 'ANYTIME', 'EXTERNAL_BFS' or
+                'JPS'.
+            timed (bool): If True, measures wall time of each search phase.
+            trace_memory (bool): If True, measures peak memory of the search.
+            observers (list, optional): Observers notified of search events.
+                Defaults to a new MemorySink, needed to show dynamic solution
+                and to save algorithm steps.
+            reduced (bool): If True, searches the reduced graph. Not
+                supported by 'JPS', 'EXTERNAL_BFS' and parallel search.
+            **options: Other `SearchProblem.solve()` options (e.g. all_goals,
+                keep_tree, beam_width), not supported by 'JPS'.
+
+        Returns:
+            SearchResult: Result of the run, true if a solution is found.
+
+        Raises:
+            ValueError: If search_algorithm is unknown, or is 'JPS' with
+                options or in a weighted maze, or options are not supported
+                with 'reduced'.
+
+        """
+        if reduced:
+            return self._solve_reduced(search_algorithm, timed, trace_memory, observers,
+                                       **options)
+        if search_algorithm == 'JPS':
+            if any(options.values()):
+                raise ValueError(f"JPS does not support options: {', '.join(options)}")
+            if self.weighted:
+                raise ValueError("JPS requires uniform move costs, use 'UCS'")
+            return self._solve_jump_point_search(timed, trace_memory, observers)
+        return super().solve(search_algorithm, timed, trace_memory, observers, **options)
+
+
+    def _solve_reduced(self, search_algorithm: str, timed: bool = False,
+                       trace_memory: bool = False,
+                       observers: Optional[List[SearchObserver]] = None,
+                       **options) -> SearchResult:
+        """Solves the maze searching its reduced graph (see solve()).
+
+        The search runs on a copy of the maze starting from a JunctionNode,
+        so it only moves between junctions, and this maze is not modified.
+        Solutions are then filled back with every cell of their corridors,
+        as MazeNode nodes.
+
+        Args:
+            search_algorithm (str): The search strategy to use.
+            timed (bool): If True, measures wall time of each search phase.
+            trace_memory (bool): If True, measures peak memory of the search.
+            observers (list, optional): Observers notified of search events.
+            **options: Other `SearchProblem.solve()` options.
+
+        Returns:
+            SearchResult: Result of the run, true if a solution is found.
+
+        Raises:
+            ValueError: If search_algorithm or options are not supported on
+                the reduced graph.
+
+        """
+        if search_algorithm in ('JPS', 'EXTERNAL_BFS') or options.get('workers') \
+                or options.get('keep_tree') or options.get('complete_tree'):
+            raise ValueError(f"Reduced graph search does not support '{search_algorithm}', "
+                             "workers, keep_tree and complete_tree")
+        reduction = self.reduce()
+        junctions = copy.copy(self)
+        junctions.reduction = reduction
+        junctions.start_node = JunctionNode(state=self.start_node.state)
+        result = junctions.solve(search_algorithm, timed, trace_memory, observers, **options)
+        result.reduced = True
+        if result.solved:
+            result.solution = self._fill_corridors_path(result.solution, reduction)
+        for goal, goal_solution in result.solutions.items():
+            result.solutions[goal] = self._fill_corridors_path(goal_solution, reduction)
+        if search_algorithm in ('BFS', 'BEAM'):
+            # Fewest junctions, which is not fewest moves
+            result.optimal = False
+        self.last_result = result
+        return result
+
+
+    def _fill_corridors_path(self, junctions_path: Iterable[Node],
+                             reduction: 'MazeReduction') -> Iterable[Node]:
+        """Rebuilds the cell by cell path of a junctions path.
 
-    def show_solution(self, dynamic: bool = False) -> bool:
+        Args:
+            junctions_path (Iterable): Solution path of JunctionNode nodes.
+            reduction (MazeReduction): Reduced graph searched.
+
+        Returns:
+            Iterable: Solution path of MazeNode nodes, one per cell, of the
+            same type as 'junctions_path'.
+
+        """
+        directions = {offset: action for action, offset in self.offset.items()}
+        cell_node = self.start_node
+        for junction in junctions_path:
+            for row, col in reduction.corridor(junction.action):
+                action = directions[(row - cell_node.state[0], col - cell_node.state[1])]
+                path_cost = cell_node.path_cost + self.costs[row * self.width + col]
+                cell_node = MazeNode(state=(row, col), parent=cell_node, action=action)
+                cell_node.path_cost = path_cost
+        solution = type(junctions_path)()
+        solution.build(cell_node)
+        return solution
+
+
+    @search_run
+    def _solve_jump_point_search(self, timed: bool = False,
+                                 trace_memory: bool = False,
+                                 observers: Optional[List[SearchObserver]] = None
+                                 ) -> SearchResult:
+        """Solves the maze using Jump Point Search (JPS).
+
+        Maze cells are 4-connected and every move costs the same, so most
+        shortest paths are symmetric variations of each other. JPS breaks
+        these symmetries: straight runs of open cells are skipped by
+        `_jump()`, and only 'jump points' (cells where the path may need to
+        turn) are pushed into the frontier, ordered by A* priority with
+        Manhattan distance heuristic. The solution found has the same length
+        as the BFS one.
+
+        Explored nodes and observed events concern jump points only (frontier
+        is not logged, as it is a priority queue). The solution
+        is filled back with every cell of the path, so it can be shown as any
+        other algorithm solution.
+
+        Args:
+            timed (bool): If True, measures wall time of each search phase
+                (jumps are accounted as 'expand' phase).
+            trace_memory (bool): If True, measures peak memory of the search.
+            observers (list, optional): Observers notified of search events.
+
+        Returns:
+            SearchResult: Result of the run, true if a solution is found.
+
+        """
+        self._initialize_search_components()
+        self.algorithm = 'JPS'
+        self.stats = SearchStats(timed=timed, trace_memory=trace_memory)
+        notify = self._attach_observers(observers)
+        stats = self.stats
+        stats.start()
+        tick = 0.0
+        solved = False
+
+        start_node = MazeNode(state=self.start_node.state)
+        best_cost = {start_node.state: 0}
+        frontier = [(self._manhattan_distance(start_node.state), 0, 0, start_node)]
+        push_count = 1
+        stats.peak_frontier = 1
+        if notify:
+            notify.on_start(self)
+        try:
+            while frontier:
+                if timed:
+                    tick = time.perf_counter()
+                _, _, cost, extracted_node = heapq.heappop(frontier)
+                if cost > best_cost[extracted_node.state]:
+                    continue    # Stale entry: a cheaper path was pushed later
+                if timed:
+                    tick = stats.lap('frontier', tick)
+                if notify:
+                    notify.on_extract(self, extracted_node)
+                    if timed:
+                        tick = stats.lap('observers', tick)
+
+                is_goal = extracted_node.state in self.goal_states
+                if timed:
+                    tick = stats.lap('goal_test', tick)
+                if is_goal:
+                    self.solution.build(self._fill_jump_points_path(extracted_node))
+                    if notify:
+                        notify.on_goal(self, extracted_node)
+                    solved = True
+                    break
+
+                self.explored_nodes.add_node(extracted_node)
+
+                jump_points = []
+                for action in self._jump_directions(extracted_node):
+                    jump_point = self._jump(extracted_node.state, action)
+                    if jump_point is None:
+                        continue
+                    stats.generated += 1
+                    jump_cost = cost + self._manhattan_distance(extracted_node.state, jump_point)
+                    if jump_cost < best_cost.get(jump_point, jump_cost + 1):
+                        best_cost[jump_point] = jump_cost
+                        child = MazeNode(state=jump_point, parent=extracted_node, action=action)
+                        stats.nodes_built += 1
+                        heapq.heappush(frontier, (jump_cost + self._manhattan_distance(jump_point),
+                                                  push_count, jump_cost, child))
+                        push_count += 1
+                        jump_points.append(child)
+                    else:
+                        stats.duplicates += 1
+                stats.expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+                if timed:
+                    tick = stats.lap('expand', tick)
+
+                if notify:
+                    notify.on_expand(self, extracted_node, jump_points)
+                    if timed:
+                        stats.lap('observers', tick)
+
+            stats.stop(explored_size=len(self.explored_nodes))
+            if not solved:
+                self.solution = None
+            self.optimal = solved
+        except BaseException:
+            stats.stop()
+            if notify:
+                notify.on_finish(self, False)
+            raise
+        if notify:
+            notify.on_finish(self, solved)
+        return solved
+
+
+    def _jump_directions(self, node: 'MazeNode') -> List[str]:
+        """Directions worth jumping to from a jump point (pruned neighbors).
+
+        Start node jumps to every direction. A jump point reached vertically
+        jumps ahead, left and right. A jump point reached horizontally jumps
+        ahead, and up or down only if that neighbor is 'forced' (it can not
+        be reached by a path of the same length turning earlier).
+
+        Args:
+            node (MazeNode): The jump point to jump from.
+
+        Returns:
+            list: Actions (directions) to jump to.
+
+        """
+        if node.action is None:
+            return list(self.offset)
+        if node.action in ('up', 'down'):
+            return [node.action, 'left', 'right']
+
+        row, col = node.state
+        col_back = col - self.offset[node.action][1]
+        directions = [node.action]
+        for action in ('up', 'down'):
+            side_row = row + self.offset[action][0]
+            if self._is_open(side_row, col) and not self._is_open(side_row, col_back):
+                directions.append(action)
+        return directions
+
+
+    def _jump(self, position: Tuple[int, int], action: str) -> Optional[Tuple[int, int]]:
+        """Moves straight from 'position' towards 'action' until a jump point.
+
+        A jump point is the goal, a cell with a forced neighbor (horizontal
+        moves), or a cell from where a horizontal jump finds a jump point
+        (vertical moves).
+
+        Args:
+            position (tuple): (row, column) where the jump starts.
+            action (str): Direction of the jump.
+
+        Returns:
+            tuple: (row, column) of the jump point found, or None if the jump
+            hits a wall or maze boundary before finding one.
+
+        """
+        row, col = position
+        row_offset, col_offset = self.offset[action]
+        while True:
+            row += row_offset
+            col += col_offset
+            if not self._is_open(row, col):
+                return None
+            if (row, col) in self.goal_states:
+                return (row, col)
+            if row_offset == 0:
+                for side in (-1, 1):
+                    if self._is_open(row + side, col) \
+                        and not self._is_open(row + side, col - col_offset):
+                        return (row, col)
+            elif self._jump((row, col), 'left') or self._jump((row, col), 'right'):
+                return (row, col)
+
+
+    def _fill_jump_points_path(self, goal_jump_point: 'MazeNode') -> 'MazeNode':
+        """Rebuilds the cell by cell path of a jump points path.
+
+        Args:
+            goal_jump_point (MazeNode): Last jump point of the path.
+
+        Returns:
+            MazeNode: Goal node whose parents chain contains every cell of the
+            path, from start node.
+
+        """
+        jump_points = []
+        node = goal_jump_point
+        while node.parent is not None:
+            jump_points.append(node)
+            node = node.parent
+
+        cell_node = node
+        for jump_point in reversed(jump_points):
+            row_offset, col_offset = self.offset[jump_point.action]
+            while cell_node.state != jump_point.state:
+                row, col = cell_node.state
+                cell_node = MazeNode(state=(row + row_offset, col + col_offset),
+                                     parent=cell_node, action=jump_point.action)
+        return cell_node
+
+
+    def _is_open(self, row: int, col: int) -> bool:
+        """Checks if cell (row, col) is inside the maze and is not a wall.
+
+        Args:
+            row (int): Row of the cell.
+            col (int): Column of the cell.
+
+        Returns:
+            bool: True if cell can be occupied, False otherwise.
+
+        """
+        return 0 <= row < self.height and 0 <= col < self.width \
+            and not self.walls[row][col]
+
+
+    def _manhattan_distance(self, position: Tuple[int, int],
+                            target: Optional[Tuple[int, int]] = None) -> int:
+        """Manhattan distance between two cells.
+
+        Args:
+            position (tuple): (row, column) of first cell.
+            target (tuple, optional): (row, column) of second cell. Defaults
+                to the nearest goal position.
+
+        Returns:
+            int: Number of 4-connected moves between both cells, ignoring walls.
+
+        """
+        if target is None:
+            return min(abs(position[0] - row) + abs(position[1] - col)
+                       for row, col in self.goal_states)
+        return abs(position[0] - target[0]) + abs(position[1] - target[1])
+
+
+    def _heuristic(self, position: Tuple[int, int]) -> int:
+        """Admissible estimate of the cost from a cell to the nearest goal.
+
+        Args:
+            position (tuple): (row, column) of the cell.
+
+        Returns:
+            int: Manhattan distance, or landmark lower bound if larger (see
+            use_landmarks()).
+
+        """
+        estimate = self._manhattan_distance(position)
+        if self.landmarks is not None:
+            return max(estimate, self.landmarks.lower_bound(position, self.goal_states))
+        return estimate
+
+
+    def show_solution(self, dynamic: bool = False, show_stats: bool = False,
+                      fps: int = 30, speed: float = 1.0) -> bool:
         """Prints the maze and its solution.
 
         Args:
             dynamic (bool): If True, shows the solution step by step dynamically.
+            show_stats (bool): If True, static solution summary includes search
+                statistics.
+            fps (int): Dynamic solution frames per second.
+            speed (float): Dynamic solution initial speed factor.
 
         Returns:
             bool: True if the solution was shown successfully, False otherwise.
@@ -189,30 +775,88 @@ class Maze(SearchProblem):
         Raises:
             curses.error: If there is an error showing the dynamic solution.
 
+        Note:
+            Dynamic solution is built from the algorithm steps recorded by the
+            MemorySink observer of last solve() run (solve() default).
+
         """
 
         if dynamic:
-            self._calculate_maze_and_solution_layout_elements()
-
-            offset = self._calculate_display_offsets()
-            if offset == (0, 0):
-                return False
-            try:
-                curses.wrapper(lambda stdscr:
-                    self._show_dynamic_solution(stdscr, offset))
-                return True
-            except curses.error:
-                print("Error showing dynamic solution. Check terminal size.\n")
+            if self.algorithm_log is None:
+                print("Dynamic solution needs algorithm steps recorded "
+                      "in a MemorySink (solve() default observer).\n")
                 return False
+            exploration = [record['extracted'].state
+                           for record in self.algorithm_log.get_log()[1:]]
+            solution = None if self.solution is None else [node.state for node in self.solution]
+            return self._show_dynamic(exploration, solution,
+                                      self._solution_summary_str(), fps, speed)
         else:
-            for line in self._solution_summary_str():
+            for line in self._solution_summary_str(show_stats):
                 print(line)
             #print(self._solution_summary_str())
-            print(self._solution_layout_str())
+            self.write_solution_layout(sys.stdout)
+            print()
+            return True
+
+
+    def show_trace(self, trace_filename: str, fps: int = 30, speed: float = 1.0) -> bool:
+        """Shows dynamically a solution saved as a trace, without solving.
+
+        Args:
+            trace_filename (str): Trace file written by a TraceSink observer
+                while solving this maze.
+            fps (int): Frames per second.
+            speed (float): Initial speed factor.
+
+        Returns:
+            bool: True if the solution was shown successfully, False otherwise.
+
+        """
+        trace = TraceReader(trace_filename)
+        exploration = trace.exploration()[1:]
+        solution = None if trace.solution is None else trace.solution[1:]
+        summary = self._summary_lines(trace.algorithm,
+                                      len(trace) - (solution is not None),
+                                      None if solution is None else len(solution),
+                                      None if solution is None else self._path_cost(solution))
+        return self._show_dynamic(exploration, solution, summary, fps, speed)
+
+
+    def _show_dynamic(self, exploration: List[Tuple[int, int]],
+                      solution: Optional[List[Tuple[int, int]]],
+                      summary: List[str], fps: int, speed: float) -> bool:
+        """Shows dynamically the exploration and solution of the maze.
+
+        Args:
+            exploration (list): Explored positions, in exploration order.
+            solution (list): Solution path positions, or None if no solution.
+            summary (list): Solution summary lines.
+            fps (int): Frames per second.
+            speed (float): Initial speed factor.
+
+        Returns:
+            bool: True if the solution was shown successfully, False otherwise.
+
+        """
+        self._calculate_maze_and_solution_layout_elements(exploration, solution)
+
+        offset = self._calculate_display_offsets()
+        if offset == (0, 0):
+            return False
+        import curses   # pylint: disable=C0415,W0621
+        try:
+            curses.wrapper(lambda stdscr:
+                self._show_dynamic_solution(stdscr, offset, summary, fps, speed))
             return True
+        except curses.error:
+            print("Error showing dynamic solution. Check terminal size.\n")
+            return False
 
 
-    def _calculate_maze_and_solution_layout_elements(self) -> None:
+    def _calculate_maze_and_solution_layout_elements(
+            self, exploration: List[Tuple[int, int]],
+            solution: Optional[List[Tuple[int, int]]]) -> None:
         """Calculates and sets the layout elements for the maze and its solution.
 
         This method prepares the layout elements required for displaying the
@@ -220,31 +864,29 @@ class Maze(SearchProblem):
         solution path. The layout elements are stored in the
         `self.maze_solution_layout` attribute.
 
+        Args:
+            exploration (list): Explored positions, in exploration order.
+            solution (list): Solution path positions, or None if no solution.
+
         """
         # Define the maze layout for curses
         maze_walls = [
-            (x, y, self.layout_elements['walls']['char'] if brick else ' ')
-            for x, row in enumerate(self.walls)
-            for y, brick in enumerate(row)
+            (x, y, char)
+            for x in range(self.height)
+            for y, char in enumerate(self._row_chars(x, ' '))
         ]
 
         # Define start and goal nodes for curses
-        maze_start_goal = [self.start_node.state + ('A',), self.goal_node.state + ('B',)]
+        maze_start_goal = [self.start_node.state + ('A',)]
+        maze_start_goal += [goal + ('B',) for goal in sorted(self.goal_states)]
 
         # Define exploration path for curses
-        maze_exploration = []
-        for record in self.algorithm_log.get_log()[1:]:
-            x, y = record['extracted'].state
-            maze_exploration.append((x, y,
-                self.layout_elements['exploration']['char']))
+        expl_char = self.layout_elements['exploration']['char']
+        maze_exploration = [(x, y, expl_char) for x, y in exploration]
 
         # Define solution path for curses
-        maze_solution = []
-        if self.solution is not None:
-            for node in self.solution:
-                x, y = node.state
-                maze_solution.append((x, y,
-                    self.layout_elements['solution']['char']))
+        sol_char = self.layout_elements['solution']['char']
+        maze_solution = [(x, y, sol_char) for x, y in solution or []]
 
         # Create layout elements dictionary
         self.maze_solution_layout = {
@@ -252,6 +894,7 @@ class Maze(SearchProblem):
             'start_goal': maze_start_goal,
             'exploration': maze_exploration,
             'solution': maze_solution,
+            'solved': solution is not None,
             }
 
 
@@ -304,8 +947,9 @@ class Maze(SearchProblem):
             return (0, 0)
 
 
-    def _show_dynamic_solution(self, stdscr: curses.window,
-                               offset: Tuple[int, int]) -> None:
+    def _show_dynamic_solution(self, stdscr: 'curses.window',
+                               offset: Tuple[int, int], summary: List[str],
+                               fps: int = 30, speed: float = 1.0) -> None:
         """Shows the maze solution step by step dynamically.
 
         This method displays the maze solution step by step using the curses
@@ -319,16 +963,24 @@ class Maze(SearchProblem):
         vertical_offset = 1 if "side to side" display is to be shown.
         horizontal_offset = 0 if "one below the other" display is to be shown.
 
+        Walls are drawn once. Exploration and solution cells are animated in
+        frames by _FrameRenderer: while animating, 'f' key speeds it up and
+        's' key skips to the end.
+
         Args:
             stdscr (curses.window): The curses window object.
             offset (tuple): A tuple (horizontal_offset, vertical_offset)
                 indicating the offset for displaying the second solution.
+            summary (list): Solution summary lines.
+            fps (int): Frames per second.
+            speed (float): Initial speed factor.
 
         Raises:
             curses.error: If there is an error displaying the solution
                 dynamically.
 
         """
+        import curses   # pylint: disable=C0415,W0621
         self._set_curses_settings(stdscr)
         #time.sleep(1)
 
@@ -342,33 +994,38 @@ class Maze(SearchProblem):
 
         # Print Summary:s
         start = 3 if self.first_dynamic_solution_shown else 2
-        for line_count, line in enumerate(self._solution_summary_str()[start:], blank_line):
+        for line_count, line in enumerate(summary[start:], blank_line):
             stdscr.addstr(line_count + v_offs, 2 + h_offs, line)
 
+        # "press key" line position
+        if self.first_dynamic_solution_shown is True:
+            factor = 2 if h_offs == 0 else 1
+            press_key_v_offset = factor* (3 * blank_line + line_count + 1 + self.height)
+        else:
+            press_key_v_offset = 3 * blank_line + line_count + self.height
+
         # Elements to show in layout:
-        show_elements = ['walls', 'start_goal', 'exploration', 'start_goal']
-        if self.solution is not None:
+        show_elements = ['start_goal', 'exploration', 'start_goal']
+        if self.maze_solution_layout['solved']:
             show_elements += ['solution', 'start_goal']
 
         # Print layout:
-        for element_name in show_elements:
-            for (y, x, char) in self.maze_solution_layout[element_name]:
-
-                time.sleep(self.layout_elements[element_name]['wait'])
-
-                color = curses.color_pair(self.layout_elements[element_name]['color'])
-
-                stdscr.addch(y + line_count + 2 * blank_line + v_offs,
-                                x + 6 + h_offs, char, color)
-                stdscr.refresh()
+        renderer = _FrameRenderer(stdscr, fps, speed,
+                                  row_offset=line_count + 2 * blank_line + v_offs,
+                                  col_offset=6 + h_offs)
+        renderer.draw_static(
+            (y, x, char, curses.color_pair(self.layout_elements['walls']['color']))
+            for (y, x, char) in self.maze_solution_layout['walls'])
+
+        stdscr.addstr(press_key_v_offset, 2, _FrameRenderer.KEYS_HELP)
+        renderer.animate(
+            (y, x, char, curses.color_pair(self.layout_elements[element_name]['color']),
+             self.layout_elements[element_name]['wait'])
+            for element_name in show_elements
+            for (y, x, char) in self.maze_solution_layout[element_name])
 
         # Print "press key"
-        if self.first_dynamic_solution_shown is True:
-            line_count +=1
-            factor = 2 if h_offs == 0 else 1
-            press_key_v_offset = factor* (3 * blank_line + line_count + self.height)
-        else:
-            press_key_v_offset = 3 * blank_line + line_count + self.height
+        stdscr.addstr(press_key_v_offset, 2, " " * len(_FrameRenderer.KEYS_HELP))
         stdscr.addstr(press_key_v_offset, 2, "Press any key.")
         stdscr.refresh()
         # Wait for a key press to exit
@@ -380,7 +1037,7 @@ class Maze(SearchProblem):
         self.first_dynamic_solution_shown = True
 
 
-    def _set_curses_settings(self, stdscr: curses.window) -> None:
+    def _set_curses_settings(self, stdscr: 'curses.window') -> None:
         """Sets the curses settings for displaying the maze.
 
         This method configures the curses library settings, such as disabling the
@@ -391,6 +1048,7 @@ class Maze(SearchProblem):
             stdscr (curses.window): The curses window object.
 
         """
+        import curses   # pylint: disable=C0415,W0621
         # Disable cursor and enable instant character echoing
         curses.curs_set(0)
         # Blocking mode. getch() waits indefinitely for a key press.
@@ -412,6 +1070,7 @@ class Maze(SearchProblem):
                         error initializing color pairs.
 
         """
+        import curses   # pylint: disable=C0415,W0621
         if not curses.has_colors():
             raise RuntimeError("Your terminal does not support colors.")
         try:
@@ -423,7 +1082,7 @@ class Maze(SearchProblem):
                               "Ensure your terminal supports colors.") from exc
 
 
-    def _solution_summary_str(self) -> List[str]:
+    def _solution_summary_str(self, show_stats: bool = False) -> List[str]:
         """
         Generates and returns a summary of explored nodes and, if solution
         exists, solution path nodes.
@@ -432,28 +1091,87 @@ class Maze(SearchProblem):
         the maze being solved, the algorithm used, the number of explored
         nodes, and the solution path nodes if a solution exists.
 
+        Args:
+            show_stats (bool): If True, search statistics (counters, phase
+                times, peak memory) are added to the summary.
+
+        Returns:
+            list: A list of strings representing the summary of the maze solution.
+
+        """
+        lines = self._summary_lines(
+            self.algorithm, len(self.explored_nodes),
+            None if self.solution is None else len(self.solution),
+            None if self.solution is None
+            else self._path_cost(node.state for node in self.solution))
+        if self.solutions:
+            lines.append(f"- Goals found: {len(self.solutions)} of {len(self.goal_states)}")
+        if self.reduced and self.reduction is not None:
+            lines += self.reduction.summary_lines()
+        if self.landmarks is not None:
+            lines += self.landmarks.summary_lines()
+        if (self.algorithm in ('BEAM', 'SMA*', 'ANYTIME') or self.reduced) \
+                and self.solution is not None:
+            lines.append(f"- Provably optimal: {'yes' if self.optimal else 'no'}")
+        if self.suboptimality is not None:
+            lines.append(f"- Suboptimality bound: {self.suboptimality:.3f}")
+        if show_stats:
+            lines += self.stats.summary_lines()
+        return lines
+
+
+    def _summary_lines(self, algorithm: str, explored_count: int,
+                       solution_length: Optional[int],
+                       solution_cost: Optional[int] = None) -> List[str]:
+        """
+        Generates the solution summary lines.
+
+        Solution cost is only shown for weighted mazes (otherwise it equals
+        the number of solution nodes).
+
+        Args:
+            algorithm (str): Algorithm name.
+            explored_count (int): Number of explored nodes.
+            solution_length (int): Number of solution nodes, or None if no
+                solution was found.
+            solution_cost (int, optional): Total cost of the solution path.
+
         Returns:
             list: A list of strings representing the summary of the maze solution.
 
         """
         expl_char = self.layout_elements['exploration']['char']
         sol_char = self.layout_elements['solution']['char']
-        expl_len = len(self.explored_nodes)
-        sol_len = len(self.solution) if self.solution else '-'
-        sol = " No Solution found!" if self.solution is None else ""
+        sol_len = solution_length if solution_length else '-'
+        sol = " No Solution found!" if solution_length is None else ""
 
         lines=[
             "",
             f"{28*'-'}",
             f"- Solving: {self.filename}",
-            f"- Algorithm: {self.algorithm}",
-            f"- Explored nodes ({expl_char}, {sol_char}): {expl_len}",
+            f"- Algorithm: {algorithm}",
+            f"- Explored nodes ({expl_char}, {sol_char}): {explored_count}",
             f"- Solution nodes ({sol_char}): {sol_len}",
             f"- Solution: {sol}",
             ]
+        if self.weighted and solution_cost is not None:
+            lines.insert(-1, f"- Solution cost: {solution_cost}")
         return lines
 
 
+    def _path_cost(self, path: Iterable[Tuple[int, int]]) -> int:
+        """Total cost of moving along 'path'.
+
+        Args:
+            path (Iterable): Positions moved into, in order (start excluded).
+
+        Returns:
+            int: Sum of the move costs of the positions.
+
+        """
+        return sum(self.costs[row * self.width + col] for row, col in path)
+
+
     def _solution_layout_str(self) -> str:
         """
         Generates and returns the maze layout as a string, including the
@@ -468,25 +1186,86 @@ class Maze(SearchProblem):
             if it exists.
 
         """
-        string = "\n"
+        return "\n" + "".join(line + "\n" for line in self._solution_layout_lines())
+
+
+    def write_solution_layout(self, stream: TextIO) -> None:
+        """Writes the maze layout with the solution path to a text stream.
+
+        Same output as _solution_layout_str(), written line by line, so
+        layouts of large mazes are never held in memory as a single string.
+
+        Args:
+            stream (TextIO): Text stream (e.g. open file, sys.stdout).
+
+        """
+        stream.write("\n")
+        for line in self._solution_layout_lines():
+            stream.write(line + "\n")
+
+
+    def _solution_layout_lines(self) -> Iterator[str]:
+        """
+        Generates the maze layout lines, including the solution path and
+        explored nodes if a solution exists.
+
+        In 'all goals' mode, the solution path to every goal found is shown.
+
+        Solution and explored positions are grouped by row once, and each row
+        is built as a list of characters where they are overlaid, so layout
+        is generated in time proportional to the number of cells.
+
+        Yields:
+            str: Layout line for each maze row.
+
+        """
+        overlays = {}   # row -> [(column, char)], later ones prevail
+        if self.solution:
+            overlay_cells = [
+                (self.explored_nodes, self.layout_elements['exploration']['char']),
+                (self.solution, self.layout_elements['solution']['char']),
+            ]
+            overlay_cells += [(solution, self.layout_elements['solution']['char'])
+                              for solution in self.solutions.values()]
+            for nodes, char in overlay_cells:
+                for node in nodes:
+                    row, col = node.state
+                    overlays.setdefault(row, []).append((col, char))
+        overlay_points = [(self.start_node.state, self.start_char)]
+        overlay_points += [(goal, self.goal_char) for goal in self.goal_states]
+        for (row, col), char in overlay_points:
+            overlays.setdefault(row, []).append((col, char))
+
         for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                position = (i, j)
-                if col:
-                    string += "█"
-                elif position == self.start_node.state:
-                    string += self.start_char
-                elif position == self.goal_node.state:
-                    string += self.goal_char
-                elif self.solution and position in self.solution:
-                    string += self.layout_elements['solution']['char']
-                elif self.solution and position in self.explored_nodes:
-                    string += self.layout_elements['exploration']['char']
-                else:
-                    string += self.path_char
-            string += '\n'
-
-        return string
+            chars = self._row_chars(i, self.path_char)
+            for j, char in overlays.get(i, ()):
+                if not row[j]:
+                    chars[j] = char
+            yield "".join(chars)
+
+
+    def _row_chars(self, row_nr: int, path_char: str) -> List[str]:
+        """Layout characters of a maze row: walls, open path and terrain.
+
+        Terrain cells are shown with the terrain character of their cost (the
+        first one, if several terrain characters have the same cost).
+
+        Args:
+            row_nr (int): Row number.
+            path_char (str): Character for open path cells.
+
+        Returns:
+            list: One character (str) per column.
+
+        """
+        wall_char = self.layout_elements['walls']['char']
+        if not self.weighted:
+            return [wall_char if brick else path_char for brick in self.walls[row_nr]]
+        cost_chars = {0: wall_char, 1: path_char}
+        for char, cost in self.terrain.items():
+            cost_chars.setdefault(cost, char)
+        start = row_nr * self.width
+        return [cost_chars[cost] for cost in self.costs[start:start + self.width]]
 
 
     def save_algorithm_steps_to_file(self) -> None:
@@ -497,19 +1276,615 @@ class Maze(SearchProblem):
         _<algorithm name>_steps.txt.
 
         The file contains a summary of the solution and the maze layout with
-        the solution path.
+        the solution path, followed by the algorithm steps if last solve()
+        run recorded them in a MemorySink observer.
 
         """
         log_filename=f"{self.filename}_{self.algorithm}_steps.txt"
 
         with open(log_filename, 'w', encoding="utf-8") as file:
             file.writelines(line + "\n" for line in self._solution_summary_str())
-            file.write(self._solution_layout_str())
+            self.write_solution_layout(file)
 
-        self.algorithm_log.save_log(log_filename)
+        if self.algorithm_log is not None:
+            self.algorithm_log.save_log(log_filename)
         print(f"Algorithm steps saved to file:\n {log_filename}")
 
 
+class MazeReduction:
+    """Reduced graph of a maze: junctions linked by corridors.
+
+    Most maze cells are in dead ends, or in corridors (cells with exactly two
+    open neighbors) where there is nothing to decide. The reduced graph is
+    built in two stages:
+
+        Dead-end filling   Open cells with a single open neighbor (or none)
+                           are removed, repeatedly, so whole dead-end
+                           branches disappear. Start and goal cells are
+                           never removed.
+        Corridor contraction
+                           Remaining cells with other than two open
+                           neighbors (junctions), and start and goal cells,
+                           are the graph nodes. Each corridor between two of
+                           them becomes a single edge, whose cost is the sum
+                           of the move costs of its cells.
+
+    Edges are numbered, and their cells kept in a flat array, so a path of
+    edges can be filled back with every cell (see corridor()).
+
+    Attributes:
+        start (tuple): Start position the graph was built for.
+        goals (frozenset): Goal positions the graph was built for.
+        open_cells (int): Number of open cells of the maze.
+        dead_end_cells (int): Number of cells removed by dead-end filling.
+        junctions (int): Number of graph nodes.
+        build_time (float): Seconds taken to build the graph.
+
+    """
+
+    def __init__(self, maze: Maze, start: Tuple[int, int],
+                 goals: Iterable[Tuple[int, int]]) -> None:
+        """Builds the reduced graph of 'maze'.
+
+        Args:
+            maze (Maze): The maze to reduce.
+            start (tuple): Start position.
+            goals (Iterable): Goal positions.
+
+        """
+        started = time.perf_counter()
+        self.start = start
+        self.goals = frozenset(goals)
+        self.width = width = maze.width
+        cells = maze.height * width
+        is_open = bytearray(not wall for row in maze.walls for wall in row)
+        self.open_cells = sum(is_open)
+        kept = {row * width + col for row, col in chain([start], self.goals)}
+
+        degrees = bytearray(cells)
+        for cell in range(cells):
+            if is_open[cell]:
+                degrees[cell] = sum(1 for neighbor in self._neighbors(cell, cells)
+                                    if is_open[neighbor])
+
+        # Dead-end filling
+        pending = [cell for cell in range(cells)
+                   if is_open[cell] and degrees[cell] <= 1 and cell not in kept]
+        self.dead_end_cells = 0
+        while pending:
+            cell = pending.pop()
+            if not is_open[cell]:
+                continue
+            is_open[cell] = 0
+            self.dead_end_cells += 1
+            for neighbor in self._neighbors(cell, cells):
+                if is_open[neighbor]:
+                    degrees[neighbor] -= 1
+                    if degrees[neighbor] <= 1 and neighbor not in kept:
+                        pending.append(neighbor)
+
+        # Corridor contraction
+        nodes = [cell for cell in range(cells)
+                 if is_open[cell] and (degrees[cell] != 2 or cell in kept)]
+        is_node = bytearray(cells)
+        for cell in nodes:
+            is_node[cell] = 1
+        self.junctions = len(nodes)
+        self._edges = {}
+        self._targets = array('l')
+        self._costs = array('l')
+        self._cells = array('l')
+        self._offsets = array('l', [0])
+        costs = maze.costs
+        for node in nodes:
+            node_edges = []
+            for first in self._neighbors(node, cells):
+                if not is_open[first]:
+                    continue
+                previous, cell, cost = node, first, costs[first]
+                self._cells.append(cell)
+                while not is_node[cell]:
+                    following = next(neighbor for neighbor in self._neighbors(cell, cells)
+                                     if is_open[neighbor] and neighbor != previous)
+                    previous, cell = cell, following
+                    cost += costs[cell]
+                    self._cells.append(cell)
+                node_edges.append(len(self._targets))
+                self._targets.append(cell)
+                self._costs.append(cost)
+                self._offsets.append(len(self._cells))
+            self._edges[node] = node_edges
+        self.build_time = time.perf_counter() - started
+
+
+    def _neighbors(self, cell: int, cells: int) -> Iterator[int]:
+        """Cell numbers of the 4 neighbors of a cell, inside the maze.
+
+        Args:
+            cell (int): Cell number (row * width + column).
+            cells (int): Number of cells of the maze.
+
+        Yields:
+            int: Neighbor cell number.
+
+        """
+        width = self.width
+        if cell >= width:
+            yield cell - width
+        if cell % width + 1 < width:
+            yield cell + 1
+        if cell + width < cells:
+            yield cell + width
+        if cell % width:
+            yield cell - 1
+
+
+    def edges(self, position: Tuple[int, int]) -> List[int]:
+        """Edge numbers leaving a junction.
+
+        Args:
+            position (tuple): Junction position (row, column).
+
+        Returns:
+            list: Edge numbers.
+
+        """
+        return self._edges.get(position[0] * self.width + position[1], [])
+
+
+    def target(self, edge: int) -> Tuple[int, int]:
+        """Position of the junction an edge leads to.
+
+        Args:
+            edge (int): Edge number.
+
+        Returns:
+            tuple: Position (row, column).
+
+        """
+        return divmod(self._targets[edge], self.width)
+
+
+    def cost(self, edge: int) -> int:
+        """Cost of moving along an edge (move costs of its cells).
+
+        Args:
+            edge (int): Edge number.
+
+        Returns:
+            int: Edge cost.
+
+        """
+        return self._costs[edge]
+
+
+    def corridor(self, edge: int) -> List[Tuple[int, int]]:
+        """Cells moved into along an edge, in order, ending at its target.
+
+        Args:
+            edge (int): Edge number.
+
+        Returns:
+            list: Positions (row, column).
+
+        """
+        return [divmod(cell, self.width)
+                for cell in self._cells[self._offsets[edge]:self._offsets[edge + 1]]]
+
+
+    @property
+    def ratio(self) -> float:
+        """Junctions per open cell (search nodes left, as a fraction)."""
+        return self.junctions / self.open_cells if self.open_cells else 0.0
+
+
+    def summary_lines(self) -> List[str]:
+        """Human readable summary of the reduction.
+
+        Returns:
+            list: Summary lines (str).
+
+        """
+        return [f"- Reduced graph: {self.junctions} junctions, {len(self._targets)} "
+                f"corridors from {self.open_cells} open cells (ratio {self.ratio:.3f}, "
+                f"{self.dead_end_cells} dead-end cells filled)"]
+
+
+class MazeLandmarks:
+    """Landmark distances of a maze, for ALT heuristics (A*, landmarks and
+    triangle inequality).
+
+    A few open cells are chosen as landmarks, and the exact cost of moving
+    from each landmark to every cell is computed once (a breadth-first
+    search, or Dijkstra's algorithm in weighted mazes). By the triangle
+    inequality, the cost of moving from a cell to a goal is at least the
+    difference of their landmark distances, which is a lower bound that
+    follows walls, unlike Manhattan distance. Maximum over landmarks is
+    admissible and consistent, so A* solutions stay optimal.
+
+    Landmarks are chosen far apart (farthest point selection): each one is
+    the open cell farthest from the landmarks already chosen, starting from
+    the maze start cell. Distances are kept in compact arrays (4 bytes per
+    cell and landmark), and can be saved to and loaded from a binary file
+    (see save() and load()), so repeated queries on the same layout do not
+    compute them again.
+
+    Moving into a cell costs its move cost, so in weighted mazes the cost
+    from cell x to landmark L is not the cost from L to x. It is derived
+    from it, as reversing a path swaps its first and last cell costs:
+    cost(x, L) = cost(L, x) - cost(x) + cost(L).
+
+    Attributes:
+        cells (list): Landmark cell numbers (row * width + column).
+        build_time (float): Seconds taken to compute (or load) distances.
+
+    """
+
+    FILE_VERSION = 1
+    UNREACHED = 0xFFFFFFFF
+
+    def __init__(self, maze: Maze, cells: List[int], distances: List[array],
+                 build_time: float = 0.0) -> None:
+        """Initializes landmarks with their distances (see build() and load()).
+
+        Args:
+            maze (Maze): The maze the distances were computed for.
+            cells (list): Landmark cell numbers.
+            distances (list): One array per landmark, with the cost of moving
+                from the landmark into every cell (UNREACHED for walls and
+                unreachable cells).
+            build_time (float): Seconds taken to compute distances.
+
+        """
+        self.cells = cells
+        self.build_time = build_time
+        self.width = maze.width
+        self._header = {'version': self.FILE_VERSION, 'rows': maze.height, 'cols': maze.width,
+                        'layout': self._layout_checksum(maze),
+                        'itemsize': array('I').itemsize, 'byteorder': sys.byteorder}
+        self._costs = maze.costs
+        self._distances = distances
+        self._goal_terms = (None, [])
+
+
+    @classmethod
+    def build(cls, maze: Maze, count: int = 8) -> 'MazeLandmarks':
+        """Chooses 'count' landmarks of 'maze' and computes their distances.
+
+        Args:
+            maze (Maze): The maze.
+            count (int): Number of landmarks (fewer if the maze has fewer
+                reachable cells).
+
+        Returns:
+            MazeLandmarks: The landmarks.
+
+        Raises:
+            ValueError: If count is less than 1.
+
+        """
+        if count < 1:
+            raise ValueError(f"Invalid landmark count: {count}")
+        started = time.perf_counter()
+        unreached = cls.UNREACHED
+        row, col = maze.start_node.state
+        nearest = cls._distances_from(maze, row * maze.width + col)
+        cells, distances = [], []
+        while len(cells) < count:
+            farthest = max(range(len(nearest)),
+                           key=lambda cell: -1 if nearest[cell] == unreached else nearest[cell])
+            if nearest[farthest] in (0, unreached) and cells:
+                break   # Every reachable cell is a landmark
+            cells.append(farthest)
+            distances.append(cls._distances_from(maze, farthest))
+            nearest = array('I', map(min, nearest, distances[-1]))
+        return cls(maze, cells, distances, time.perf_counter() - started)
+
+
+    @classmethod
+    def _distances_from(cls, maze: Maze, source: int) -> array:
+        """Cost of moving from a cell into every cell of the maze.
+
+        Args:
+            maze (Maze): The maze.
+            source (int): Cell number of the first cell.
+
+        Returns:
+            array: Costs by cell number ('I' typecode), UNREACHED for walls
+            and unreachable cells.
+
+        """
+        width, costs = maze.width, maze.costs
+        cells = len(costs)
+        distances = array('I', [cls.UNREACHED]) * cells
+        distances[source] = 0
+
+        def neighbors(cell: int) -> Iterator[int]:
+            col = cell % width
+            for neighbor in (cell - width, cell + 1 if col + 1 < width else -1,
+                             cell + width, cell - 1 if col else -1):
+                if 0 <= neighbor < cells and costs[neighbor]:
+                    yield neighbor
+
+        if not maze.weighted:
+            # Breadth-first, level by level
+            level, distance = [source], 0
+            while level:
+                distance += 1
+                next_level = []
+                for cell in level:
+                    for neighbor in neighbors(cell):
+                        if distances[neighbor] == cls.UNREACHED:
+                            distances[neighbor] = distance
+                            next_level.append(neighbor)
+                level = next_level
+            return distances
+
+        frontier = [(0, source)]
+        while frontier:
+            distance, cell = heapq.heappop(frontier)
+            if distance > distances[cell]:
+                continue
+            for neighbor in neighbors(cell):
+                neighbor_distance = distance + costs[neighbor]
+                if neighbor_distance < distances[neighbor]:
+                    distances[neighbor] = neighbor_distance
+                    heapq.heappush(frontier, (neighbor_distance, neighbor))
+        return distances
+
+
+    def lower_bound(self, position: Tuple[int, int], goals: Iterable[Tuple[int, int]]) -> int:
+        """Lower bound of the cost of moving from a cell to the nearest goal.
+
+        Args:
+            position (tuple): Cell position (row, column).
+            goals (Iterable): Goal positions. Per goal landmark terms are
+                kept while the same goals object is given.
+
+        Returns:
+            int: Maximum over landmarks of their triangle inequality bounds,
+            minimum over goals (0 if no landmark reaches the cell).
+
+        """
+        cached_goals, goal_terms = self._goal_terms
+        if cached_goals is not goals:
+            goal_terms = self._terms(goals)
+            self._goal_terms = (goals, goal_terms)
+        cell = position[0] * self.width + position[1]
+        cell_cost = self._costs[cell]
+        unreached = self.UNREACHED
+        best = None
+        for terms in goal_terms:
+            bound = 0
+            for distances, goal_distance, goal_cost in terms:
+                distance = distances[cell]
+                if distance == unreached:
+                    continue
+                if goal_distance - distance > bound:
+                    bound = goal_distance - distance
+                if distance - goal_distance + goal_cost - cell_cost > bound:
+                    bound = distance - goal_distance + goal_cost - cell_cost
+            if best is None or bound < best:
+                best = bound
+        return best or 0
+
+
+    def _terms(self, goals: Iterable[Tuple[int, int]]) -> List[List[Tuple[array, int, int]]]:
+        """Landmark terms of every goal, for lower_bound().
+
+        Args:
+            goals (Iterable): Goal positions.
+
+        Returns:
+            list: One list per goal of (landmark distances, landmark to goal
+            distance, goal move cost), for landmarks reaching the goal.
+
+        """
+        goal_terms = []
+        for row, col in goals:
+            goal = row * self.width + col
+            goal_terms.append([(distances, distances[goal], self._costs[goal])
+                               for distances in self._distances
+                               if distances[goal] != self.UNREACHED])
+        return goal_terms
+
+
+    @staticmethod
+    def _layout_checksum(maze: Maze) -> int:
+        """Checksum of the maze layout (dimensions and move costs)."""
+        return zlib.crc32(maze.costs.tobytes(), maze.height * 65536 + maze.width)
+
+
+    def save(self, filename: str) -> None:
+        """Saves landmark distances to a binary file.
+
+        The file holds a JSON header line (version, maze dimensions and
+        layout checksum, array format, landmark cells), followed by the raw
+        distance arrays.
+
+        Args:
+            filename (str): File name.
+
+        """
+        header = dict(self._header, landmarks=self.cells)
+        with open(filename, 'wb') as file:
+            file.write(json.dumps(header).encode('utf-8') + b"\n")
+            for distances in self._distances:
+                distances.tofile(file)
+
+
+    @classmethod
+    def load(cls, filename: str, maze: Maze) -> Optional['MazeLandmarks']:
+        """Loads landmark distances saved by save().
+
+        Args:
+            filename (str): File name.
+            maze (Maze): The maze the distances are loaded for.
+
+        Returns:
+            Optional[MazeLandmarks]: The landmarks, or None if the file does
+            not exist, is not valid, or was saved for another layout.
+
+        """
+        started = time.perf_counter()
+        landmarks = cls(maze, [], [])
+        try:
+            with open(filename, 'rb') as file:
+                header = json.loads(file.readline())
+                cells = header.pop('landmarks')
+                if header != landmarks._header:  # pylint: disable=W0212
+                    return None
+                distances = []
+                for _ in cells:
+                    landmark_distances = array('I')
+                    landmark_distances.fromfile(file, len(maze.costs))
+                    distances.append(landmark_distances)
+        except (OSError, ValueError, EOFError, KeyError, TypeError, AttributeError):
+            return None
+        landmarks.cells = cells
+        landmarks._distances = distances  # pylint: disable=W0212
+        landmarks.build_time = time.perf_counter() - started
+        return landmarks
+
+
+    def summary_lines(self) -> List[str]:
+        """Human readable summary of the landmarks.
+
+        Returns:
+            list: Summary lines (str).
+
+        """
+        return [f"- Landmarks: {len(self.cells)} ({len(self._distances) * len(self._costs)} "
+                f"distances, {self.build_time:.3f} s)"]
+
+
+class _FrameRenderer:
+    """Draws maze cells on a curses window, batching cell updates in frames.
+
+    Static cells (e.g. walls) are drawn at once. Animated cell updates are
+    given with the time each one waits before being drawn: updates due in
+    the same frame are drawn together with a single screen refresh, at a
+    target frame rate. Only cells whose character or color changes are
+    repainted.
+
+    While animating, keys can be pressed:
+
+        f   fast-forward (speed x4, back to initial speed after x64)
+        s   skip to end (draws all remaining updates in one frame)
+
+    Attributes:
+        window (curses.window): The curses window to draw on.
+        fps (int): Frames per second.
+        speed (float): Animation speed factor.
+        row_offset (int): Window row of maze row 0.
+        col_offset (int): Window column of maze column 0.
+
+    """
+
+    KEYS_HELP = "f: faster, s: skip to end"
+
+    def __init__(self, window: 'curses.window', fps: int = 30, speed: float = 1.0,
+                 row_offset: int = 0, col_offset: int = 0) -> None:
+        """Initializes the _FrameRenderer object.
+
+        Args:
+            window (curses.window): The curses window to draw on.
+            fps (int): Frames per second.
+            speed (float): Initial animation speed factor.
+            row_offset (int): Window row of maze row 0.
+            col_offset (int): Window column of maze column 0.
+
+        """
+        self.window = window
+        self.fps = max(1, fps)
+        self.speed = speed
+        self.row_offset = row_offset
+        self.col_offset = col_offset
+        self._initial_speed = speed
+        self._screen = {}
+
+
+    def draw_static(self, cells: Iterable[Tuple[int, int, str, int]]) -> None:
+        """Draws cells at once.
+
+        Args:
+            cells (iterable): (row, col, char, color attribute) of each cell.
+
+        """
+        for row, col, char, color in cells:
+            self._draw(row, col, char, color)
+        self.window.refresh()
+
+
+    def animate(self, updates: Iterable[Tuple[int, int, str, int, float]]) -> None:
+        """Draws cell updates in frames, at their due time.
+
+        Args:
+            updates (iterable): (row, col, char, color attribute, wait) of
+                each cell update, where wait is the time in seconds (at speed
+                1) between previous update and this one.
+
+        """
+        updates = list(updates)
+        frame_time = 1 / self.fps
+        animation_time = 0.0    # Animation seconds shown so far
+        due_time = 0.0          # Animation second of last update drawn
+        next_frame = time.perf_counter()
+        skip = False
+        self.window.nodelay(True)
+        try:
+            index = 0
+            while index < len(updates):
+                skip = self._read_keys() or skip
+                animation_time += frame_time * self.speed
+                while index < len(updates) and \
+                        (skip or due_time + updates[index][4] <= animation_time):
+                    row, col, char, color, wait = updates[index]
+                    due_time += wait
+                    self._draw(row, col, char, color)
+                    index += 1
+                self.window.refresh()
+
+                next_frame += frame_time
+                time.sleep(max(0.0, next_frame - time.perf_counter()))
+        finally:
+            self.window.nodelay(False)
+
+
+    def _read_keys(self) -> bool:
+        """Reads pending key presses, adjusting speed.
+
+        Returns:
+            bool: True if skip to end was requested.
+
+        """
+        skip = False
+        key = self.window.getch()
+        while key != -1:
+            if key in (ord('f'), ord('F')):
+                self.speed = self.speed * 4 if self.speed < 64 * self._initial_speed \
+                    else self._initial_speed
+            elif key in (ord('s'), ord('S')):
+                skip = True
+            key = self.window.getch()
+        return skip
+
+
+    def _draw(self, row: int, col: int, char: str, color: int) -> None:
+        """Draws a cell, if its character or color changes.
+
+        Args:
+            row (int): Maze row.
+            col (int): Maze column.
+            char (str): Character to draw.
+            color (int): Color attribute.
+
+        """
+        if self._screen.get((row, col)) != (char, color):
+            self._screen[(row, col)] = (char, color)
+            self.window.addch(row + self.row_offset, col + self.col_offset, char, color)
+
+
 class MazeNode(Node):
     """Represents a node in the maze.
 
@@ -593,6 +1968,106 @@ class MazeNode(Node):
         return MazeNode(state=new_position, parent=self, action=action)
 
 
+    def successors(self, search_problem: SearchProblem) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """Positions of contiguous open cells, without building their nodes.
+
+        Lets solve() discard already reached positions before building a
+        node for them (see Node.successors()).
+
+        Args:
+            search_problem (SearchProblem): The maze being solved.
+
+        Yields:
+            tuple: (action, position) of each valid movement, in actions()
+            order.
+
+        """
+        row, col = self.state
+        height, width, walls = search_problem.height, search_problem.width, search_problem.walls
+        for action, (row_offset, col_offset) in search_problem.offset.items():
+            new_row, new_col = row + row_offset, col + col_offset
+            if 0 <= new_row < height and 0 <= new_col < width and not walls[new_row][new_col]:
+                yield action, (new_row, new_col)
+
+
+    @classmethod
+    def state_index(cls, state: Tuple[int, int], search_problem: SearchProblem) -> int:
+        """Cell number of a position, row by row.
+
+        Lets solve() keep explored and frontier membership in bit sets, 1 bit
+        per maze cell.
+
+        Args:
+            state (tuple): Position (row, column).
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            int: row * width + column.
+
+        """
+        return state[0] * search_problem.width + state[1]
+
+
+    @classmethod
+    def encode_state(cls, state: Tuple[int, int], search_problem: SearchProblem) -> int:
+        """Cell number of a position, for external memory search.
+
+        Args:
+            state (tuple): Position (row, column).
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            int: row * width + column (see state_index()).
+
+        """
+        return state[0] * search_problem.width + state[1]
+
+
+    @classmethod
+    def decode_state(cls, code: int, search_problem: SearchProblem) -> Tuple[int, int]:
+        """Position of a cell number.
+
+        Args:
+            code (int): Cell number, as encoded by encode_state().
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            tuple: Position (row, column).
+
+        """
+        return divmod(code, search_problem.width)
+
+
+    def heuristic(self, search_problem: SearchProblem) -> int:
+        """Manhattan distance to the nearest goal, or landmark lower bound if
+        larger (see Maze.use_landmarks()).
+
+        It is admissible and consistent, as every move costs at least 1.
+
+        Args:
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            int: Estimated cost to the nearest goal.
+
+        """
+        return search_problem._heuristic(self.state)  # pylint: disable=W0212
+
+
+    def step_cost(self, search_problem: SearchProblem) -> int:
+        """Cost of moving into this node position (see Maze 'costs').
+
+        Args:
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            int: Move cost of the cell.
+
+        """
+        row, col = self.state
+        return search_problem.costs[row * search_problem.width + col]
+
+
     def __repr__(self) -> str:
         """Returns a string representation of the object.
 
@@ -606,6 +2081,70 @@ class MazeNode(Node):
         return f"{self.state}'{self.action}'"
 
 
+class JunctionNode(MazeNode):
+    """Represents a junction of the reduced graph of a maze.
+
+    Actions are the numbers of the edges (corridors) leaving the junction
+    (see MazeReduction), so a single action crosses a whole corridor.
+
+    """
+
+    def actions(self, search_problem: SearchProblem) -> List[int]:
+        """Edges leaving this junction.
+
+        Args:
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            list: Edge numbers (int).
+
+        """
+        return search_problem.reduction.edges(self.state)
+
+
+    def result(self, action: int, search_problem: SearchProblem) -> 'JunctionNode':
+        """Returns the junction at the end of edge 'action'.
+
+        Args:
+            action (int): Edge number.
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            JunctionNode: The junction reached.
+
+        """
+        return JunctionNode(state=search_problem.reduction.target(action),
+                            parent=self, action=action)
+
+
+    def successors(self, search_problem: SearchProblem) -> Iterator[Tuple[int, Tuple[int, int]]]:
+        """Junctions at the end of each edge, without building their nodes.
+
+        Args:
+            search_problem (SearchProblem): The maze being solved.
+
+        Yields:
+            tuple: (edge number, junction position) of each edge.
+
+        """
+        reduction = search_problem.reduction
+        for edge in reduction.edges(self.state):
+            yield edge, reduction.target(edge)
+
+
+    def step_cost(self, search_problem: SearchProblem) -> int:
+        """Cost of the corridor that reached this junction.
+
+        Args:
+            search_problem (SearchProblem): The maze being solved.
+
+        Returns:
+            int: Edge cost.
+
+        """
+        return search_problem.reduction.cost(self.action)
+
+
 def search_module_simple_usage_example(filename: str) -> None:
     """Simple usage example of the 'search' module (shows maze static solution).
 
@@ -0,0 +1,227 @@
+"""
+Headless batch command line interface for maze.py.
+
+Solves many maze layout files with one or more algorithms, without any
+interaction, and writes one JSON line per file and algorithm:
+
+    {"file", "algorithm", "solved", "length", "cost", "expanded",
+     "generated", "duplicates", "peak_frontier", "load_s", "solve_s",
+     "error"}
+
+'error' is null unless the file could not be loaded or solved. Nothing is
+written to disk unless asked with --trace, and curses is only imported
+with --animate, so the command starts fast and can be used in pipelines.
+
+Trace levels:
+    none        No search events recorded (default, fastest).
+    counters    Search events counted by a CounterSink (added to results).
+    steps       Algorithm steps saved next to each layout file, as maze.py
+                does (<layout>_<algorithm>_steps.txt).
+    trace       Compact JSON lines trace saved next to each layout file
+                (<layout>_<algorithm>.trace), see TraceSink.
+
+Usage:
+    python3 maze_cli.py <files or glob patterns> [-a BFS ASTAR] [--jobs 4]
+                        [--trace none|counters|steps|trace] [-o results.jsonl]
+    python3 maze_cli.py mazes/maze_layout.txt --animate
+
+Exit status is 0 if every file was solved without error (unsolvable mazes
+are not errors), 1 otherwise.
+
+Dependencies:
+    Python 3.6 or higher
+    search module
+    maze.py
+    curses library, with --animate only
+
+"""
+import sys
+import json
+import glob
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List
+
+from search import CounterSink, MemorySink, TraceSink
+from maze import Maze
+
+ALGORITHMS = ('BFS', 'DFS', 'UCS', 'ASTAR', 'JPS')
+TRACE_LEVELS = ('none', 'counters', 'steps', 'trace')
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expands glob patterns, keeping plain file names as given.
+
+    Args:
+        patterns (list): File names or glob patterns ('**' recursive).
+
+    Returns:
+        list: File names, in pattern order, without repetitions.
+    """
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) \
+            else [pattern]
+        filenames += [name for name in matches if name not in filenames]
+    return filenames
+
+
+def solve_file(filename: str, algorithms: List[str], trace: str = 'none',
+               timed: bool = False) -> List[Dict[str, object]]:
+    """Loads a maze and solves it with every algorithm.
+
+    Args:
+        filename (str): Maze layout file.
+        algorithms (list): Algorithms to solve it with.
+        trace (str): Trace level (see TRACE_LEVELS).
+        timed (bool): If True, search phase times are added to results.
+
+    Returns:
+        list: One result record per algorithm.
+    """
+    start = time.perf_counter()
+    try:
+        maze = Maze(filename)
+    except (ValueError, SystemExit) as error:
+        return [_record(filename, algorithm, error=str(error)) for algorithm in algorithms]
+    load_time = time.perf_counter() - start
+
+    records = []
+    for algorithm in algorithms:
+        observers = []
+        if trace == 'counters':
+            observers = [CounterSink()]
+        elif trace == 'steps':
+            observers = [MemorySink()]
+        elif trace == 'trace':
+            observers = [TraceSink(f"{filename}_{algorithm}.trace")]
+        start = time.perf_counter()
+        try:
+            result = maze.solve(algorithm, timed=timed, observers=observers)
+        except ValueError as error:
+            records.append(_record(filename, algorithm, load_s=load_time, error=str(error)))
+            continue
+        solve_time = time.perf_counter() - start
+        solved = result.solved
+        path = [node.state for node in result.solution] if solved else None
+        record = _record(filename, algorithm, solved=solved,
+                         length=len(path) if solved else None,
+                         cost=maze._path_cost(path) if solved else None,  # pylint: disable=W0212
+                         expanded=result.stats.expanded, generated=result.stats.generated,
+                         duplicates=result.stats.duplicates,
+                         peak_frontier=result.stats.peak_frontier,
+                         load_s=load_time, solve_s=solve_time)
+        if trace == 'counters':
+            sink = observers[0]
+            record['events'] = {'extracted': sink.extracted, 'expanded': sink.expanded,
+                                'generated': sink.generated, 'goals': sink.goals}
+        if timed:
+            record['phase_times'] = result.stats.phase_times
+        if trace == 'steps':
+            # Keep stdout for results only
+            with contextlib.redirect_stdout(sys.stderr):
+                maze.save_algorithm_steps_to_file()
+        records.append(record)
+    return records
+
+
+def _record(filename: str, algorithm: str, **values) -> Dict[str, object]:
+    """Result record with every field, null unless given.
+
+    Args:
+        filename (str): Maze layout file.
+        algorithm (str): Algorithm name.
+        **values: Known field values.
+
+    Returns:
+        dict: Result record.
+    """
+    record = dict.fromkeys(('solved', 'length', 'cost', 'expanded', 'generated',
+                            'duplicates', 'peak_frontier', 'load_s', 'solve_s', 'error'))
+    record.update(file=filename, algorithm=algorithm, **values)
+    return record
+
+
+def solve_all(filenames: List[str], algorithms: List[str], trace: str = 'none',
+              timed: bool = False, jobs: int = 1) -> Iterator[Dict[str, object]]:
+    """Solves every file, in 'jobs' parallel processes.
+
+    Args:
+        filenames (list): Maze layout files.
+        algorithms (list): Algorithms to solve each file with.
+        trace (str): Trace level (see TRACE_LEVELS).
+        timed (bool): If True, search phase times are added to results.
+        jobs (int): Number of worker processes (1 solves in this process).
+
+    Yields:
+        dict: Result records, in file order.
+    """
+    if jobs <= 1 or len(filenames) <= 1:
+        for filename in filenames:
+            yield from solve_file(filename, algorithms, trace, timed)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(solve_file, filename, algorithms, trace, timed)
+                   for filename in filenames]
+        for future in futures:
+            yield from future.result()
+
+
+def animate(filenames: List[str], algorithms: List[str]) -> None:
+    """Shows dynamic solutions of every file and algorithm, one at a time.
+
+    Args:
+        filenames (list): Maze layout files.
+        algorithms (list): Algorithms to solve each file with.
+    """
+    for filename in filenames:
+        maze = Maze(filename)
+        for algorithm in algorithms:
+            maze.solve(algorithm)
+            if not maze.show_solution(dynamic=True):
+                return
+
+
+def main() -> None:
+    """Parses command line arguments, and solves or animates mazes."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('inputs', nargs='+', metavar='FILE',
+                        help="maze layout files or glob patterns")
+    parser.add_argument('-a', '--algorithms', nargs='+', choices=ALGORITHMS,
+                        default=['BFS'], help="search algorithms (default: BFS)")
+    parser.add_argument('--trace', choices=TRACE_LEVELS, default='none',
+                        help="search events recorded (default: none)")
+    parser.add_argument('--timed', action='store_true',
+                        help="add search phase times to results")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="parallel worker processes (default: 1)")
+    parser.add_argument('-o', '--output', help="JSON lines results file (default: stdout)")
+    parser.add_argument('--animate', action='store_true',
+                        help="show dynamic solutions in the terminal (curses), "
+                             "instead of writing results")
+    args = parser.parse_args()
+
+    filenames = expand_inputs(args.inputs)
+    if not filenames:
+        parser.error("no maze layout files match")
+    if args.animate:
+        animate(filenames, args.algorithms)
+        return
+
+    failed = False
+    output = open(args.output, 'w', encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in solve_all(filenames, args.algorithms, args.trace, args.timed, args.jobs):
+            failed = failed or record['error'] is not None
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,392 @@
+"""
+Long-running local path query server for mazes.
+
+Loads maze layout files once and keeps their parsed layouts in memory, so
+path queries pay neither process startup nor layout parsing. Queries are
+JSON requests over HTTP, answered concurrently (one thread per request),
+and their results are kept in a bounded LRU cache.
+
+Endpoints:
+    GET  /mazes     Loaded mazes: name, rows, columns, start and goals.
+    POST /solve     Path query. JSON body:
+                        {"maze": name, "algorithm": "BFS",
+                         "start": [row, col], "goals": [[row, col], ...]}
+                    'algorithm', 'start' and 'goals' are optional, and
+                    default to 'BFS' and the maze layout endpoints. Answer:
+                        {"solved", "path", "length", "cost", "expanded",
+                         "cached", "solve_ms"}
+                    'path' holds positions from start to goal (both
+                    included).
+    GET  /metrics   Requests, errors, cache hits and misses, latency
+                    percentiles and throughput.
+
+Invalid queries are answered with status 400 and {"error": message}, and
+unexpected server errors with status 500.
+
+Usage:
+    python3 maze_server.py <maze layout files> [--port 8000] [--cache-size 1024]
+
+Mazes are named by their file name without extension. The server only
+listens on localhost by default.
+
+Dependencies:
+    Python 3.7 or higher
+    search module
+    maze.py
+
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from maze import Maze
+
+ALGORITHMS = ('BFS', 'DFS', 'UCS', 'ASTAR', 'JPS')
+
+
+class ResultCache:
+    """Thread safe LRU cache of query results.
+
+    Attributes:
+        max_size (int): Maximum number of results kept.
+        hits (int): Lookups that found a result.
+        misses (int): Lookups that found nothing.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initializes an empty cache.
+
+        Args:
+            max_size (int): Maximum number of results kept (0 disables the
+                cache).
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        """Returns the result cached for 'key', or None.
+
+        Args:
+            key (tuple): Query key.
+
+        Returns:
+            Optional[dict]: Cached result.
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._results.move_to_end(key)
+            return result
+
+    def put(self, key: tuple, result: dict) -> None:
+        """Caches 'result', dropping the least recently used one if full.
+
+        Args:
+            key (tuple): Query key.
+            result (dict): Query result.
+        """
+        if self.max_size < 1:
+            return
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            if len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Number of cached results."""
+        return len(self._results)
+
+
+class ServerMetrics:
+    """Thread safe request counters and latencies.
+
+    Latency percentiles and recent throughput are computed over the last
+    'window' requests.
+
+    Attributes:
+        requests (int): Requests answered.
+        errors (int): Requests answered with an error status.
+        started (float): time.monotonic() value when the server started.
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        """Initializes zeroed metrics.
+
+        Args:
+            window (int): Number of recent requests kept for percentiles.
+        """
+        self.requests = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: bool = False) -> None:
+        """Records an answered request.
+
+        Args:
+            latency (float): Request handling time, in seconds.
+            error (bool): True if the request failed.
+        """
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self._recent.append((time.monotonic(), latency))
+
+    def snapshot(self) -> Dict[str, object]:
+        """Returns current metrics.
+
+        Returns:
+            dict: Counters, latency percentiles in milliseconds (of recent
+            requests) and throughput in requests per second (overall and
+            recent).
+        """
+        with self._lock:
+            recent = list(self._recent)
+            requests, errors = self.requests, self.errors
+        now = time.monotonic()
+        latencies = sorted(latency for _, latency in recent)
+        percentiles = {}
+        for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+            percentiles[name] = (latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+                                 * 1000 if latencies else None)
+        recent_span = now - recent[0][0] if recent else 0.0
+        return {
+            'requests': requests,
+            'errors': errors,
+            'uptime_s': now - self.started,
+            'throughput_rps': requests / (now - self.started),
+            'recent_throughput_rps': len(recent) / recent_span if recent_span > 0 else None,
+            'latency_ms': percentiles,
+        }
+
+
+class MazeServer(ThreadingHTTPServer):
+    """HTTP server answering path queries on preloaded mazes.
+
+    Attributes:
+        mazes (dict): Loaded mazes by name.
+        cache (ResultCache): Query results cache.
+        metrics (ServerMetrics): Request metrics.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: tuple, mazes: Dict[str, Maze],
+                 cache_size: int = 1024) -> None:
+        """Initializes the server, ready to serve_forever().
+
+        Args:
+            address (tuple): (host, port) to listen on. Port 0 picks a free
+                port (see 'server_address').
+            mazes (dict): Loaded mazes by name.
+            cache_size (int): Maximum number of cached results.
+        """
+        super().__init__(address, _RequestHandler)
+        self.mazes = mazes
+        self.cache = ResultCache(cache_size)
+        self.metrics = ServerMetrics()
+
+    def maze_list(self) -> List[dict]:
+        """Describes loaded mazes.
+
+        Returns:
+            list: One dict per maze, with name, rows, columns, start and goals.
+        """
+        return [{'name': name, 'rows': maze.height, 'cols': maze.width,
+                 'start': maze.start_node.state, 'goals': sorted(maze.goal_states)}
+                for name, maze in sorted(self.mazes.items())]
+
+    def solve(self, query: dict) -> dict:
+        """Answers a path query, from the cache if possible.
+
+        Queries with the maze endpoints are solved on the maze itself, as
+        concurrent runs do not interfere with each other (see
+        SearchResult). Other ones are solved on a copy of the maze with their
+        endpoints (see Maze.with_endpoints()), sharing the parsed layout.
+
+        Args:
+            query (dict): Path query (see module docstring).
+
+        Returns:
+            dict: Query result (see module docstring).
+
+        Raises:
+            ValueError: If the query is not valid.
+        """
+        if not isinstance(query, dict):
+            raise ValueError("Query must be a JSON object")
+        if not isinstance(query.get('maze'), str):
+            raise ValueError(f"Maze must be a maze name: {query.get('maze')!r}")
+        maze = self.mazes.get(query['maze'])
+        if maze is None:
+            raise ValueError(f"Unknown maze: {query.get('maze')}")
+        algorithm = query.get('algorithm', 'BFS')
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        start = _position(query['start']) if 'start' in query else maze.start_node.state
+        if 'goals' in query:
+            if not isinstance(query['goals'], list):
+                raise ValueError(f"Goals must be a list of positions: {query['goals']!r}")
+            goals = tuple(sorted(_position(goal) for goal in query['goals']))
+        else:
+            goals = tuple(sorted(maze.goal_states))
+
+        key = (query['maze'], algorithm, start, goals)
+        result = self.cache.get(key)
+        if result is not None:
+            return dict(result, cached=True)
+
+        query_maze = maze if start == maze.start_node.state \
+            and set(goals) == maze.goal_states else maze.with_endpoints(start, goals)
+        started = time.perf_counter()
+        search_result = query_maze.solve(algorithm, observers=[])
+        solve_time = time.perf_counter() - started
+        solved = search_result.solved
+        path = [start] + [node.state for node in search_result.solution] if solved else None
+        result = {
+            'solved': solved,
+            'path': path,
+            'length': len(path) - 1 if solved else None,
+            'cost': maze._path_cost(path[1:]) if solved else None,  # pylint: disable=W0212
+            'expanded': search_result.stats.expanded,
+            'solve_ms': solve_time * 1000,
+        }
+        self.cache.put(key, result)
+        return dict(result, cached=False)
+
+    def metrics_snapshot(self) -> dict:
+        """Returns request and cache metrics.
+
+        Returns:
+            dict: ServerMetrics.snapshot() plus cache counters.
+        """
+        metrics = self.metrics.snapshot()
+        metrics['cache'] = {'size': len(self.cache), 'max_size': self.cache.max_size,
+                            'hits': self.cache.hits, 'misses': self.cache.misses}
+        return metrics
+
+
+def _position(value: object) -> Tuple[int, int]:
+    """Parses a query position.
+
+    Args:
+        value (object): JSON value of the position.
+
+    Returns:
+        tuple: Position (row, column).
+
+    Raises:
+        ValueError: If the value is not a list of two integers.
+    """
+    if not isinstance(value, list) or len(value) != 2 \
+            or not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+        raise ValueError(f"Invalid position, expected [row, col] integers: {value!r}")
+    return tuple(value)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handles MazeServer HTTP requests (see module docstring)."""
+
+    server: MazeServer
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:  # pylint: disable=C0103
+        """Answers /mazes and /metrics requests."""
+        started = time.perf_counter()
+        if self.path == '/mazes':
+            self._send_json(200, self.server.maze_list(), started)
+        elif self.path == '/metrics':
+            self._send_json(200, self.server.metrics_snapshot(), started)
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"}, started)
+
+    def do_POST(self) -> None:  # pylint: disable=C0103
+        """Answers /solve requests."""
+        started = time.perf_counter()
+        if self.path != '/solve':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"}, started)
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            query = json.loads(self.rfile.read(length) or b'null')
+            result = self.server.solve(query)
+        except (ValueError, KeyError) as error:
+            self._send_json(400, {'error': str(error)}, started)
+            return
+        except Exception as error:  # pylint: disable=W0703
+            self._send_json(500, {'error': f"{type(error).__name__}: {error}"}, started)
+            return
+        self._send_json(200, result, started)
+
+    def _send_json(self, status: int, body: object, started: float) -> None:
+        """Sends a JSON answer and records its metrics.
+
+        Args:
+            status (int): HTTP status code.
+            body (object): JSON serializable answer.
+            started (float): time.perf_counter() value when the request
+                handling started.
+        """
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.metrics.record(time.perf_counter() - started, error=status >= 400)
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=W0622
+        """Does not log every request to stderr."""
+
+
+def load_mazes(filenames: List[str]) -> Dict[str, Maze]:
+    """Loads maze layout files.
+
+    Args:
+        filenames (list): Maze layout file paths.
+
+    Returns:
+        dict: Mazes by name (file name without extension).
+    """
+    return {os.path.splitext(os.path.basename(filename))[0]: Maze(filename)
+            for filename in filenames}
+
+
+def main() -> None:
+    """Parses command line arguments and serves queries until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0])
+    parser.add_argument('mazes', nargs='+', help="maze layout files")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help="maximum number of cached results (default: 1024)")
+    args = parser.parse_args()
+
+    server = MazeServer((args.host, args.port), load_mazes(args.mazes), args.cache_size)
+    print(f"Serving {len(server.mazes)} mazes on http://{args.host}:{server.server_address[1]}",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,11 @@
 """
     This module provides a framework for solving path finding problems using
-    common search algorithms like Breadth-First Search (BFS) and
-    Depth-First Search (DFS).
+    common search algorithms like Breadth-First Search (BFS),
+    Depth-First Search (DFS), Uniform Cost Search (UCS) and A*, memory
+    bounded ones (beam search and simplified memory-bounded A*), an
+    anytime weighted A* for searches with a deadline, an external memory
+    BFS, for state spaces larger than RAM, and parallel BFS and A* across
+    worker processes.
 
     It presents two interface classes: 'SearchProblem' and 'Node'. Both are
     abstract classes. You must subclass each one. Create your own two derived
@@ -16,6 +20,12 @@
 
         Node.__init__()
         Node.__repr__()
+        Node.iter_children()  (to generate children lazily, see also actions())
+        Node.step_cost()    (for problems with different action costs)
+        Node.heuristic()    (for A*, beam search and SMA*)
+        Node.state_index()  (for faster and smaller duplicate detection)
+        Node.canonical_state()  (for problems with symmetric states)
+        Node.encode_state(), Node.decode_state()  (for external memory BFS)
 
     To achieve a solution representation adapted to your specific problem, you
     may also want to override this methods:
@@ -29,14 +39,112 @@
         solve()
         show_solution()
         save_algorithm_steps_to_file()
+        path_to(), distance_to()  (after solve(keep_tree=True))
+
+    solve() returns a SearchResult holding the solution and every other state
+    of the run, so the problem is not modified by its searches and the same
+    problem instance may be solved from several threads at once. Problem
+    attributes 'solution', 'stats', etc. still show the last run. Solving
+    methods added by subclasses (e.g. a problem specific algorithm) are
+    decorated with @search_run to get the same behavior.
+
+    Problems that are just explicit graphs need no subclass: GraphProblem
+    keeps vertices and edges in adjacency arrays, and searches them on plain
+    integers (see GraphProblem.from_edges()).
 
     Dependencies:
         - Python 3.6 or higher
 """
 
-from typing import Optional, List, Union
+import os
+import json
+import time
+import zlib
+import heapq
+import queue
+import pickle
+import struct
+import tempfile
+import functools
+import threading
+import tracemalloc
+import multiprocessing
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Optional, List, Union
 from abc import ABC, abstractmethod
 
+_THREAD_RUNS = threading.local()
+
+
+def _thread_results() -> dict:
+    """
+    Returns the runs in progress in the calling thread.
+
+    Returns:
+        dict: SearchResult of each problem being solved, by problem id().
+    """
+    results = getattr(_THREAD_RUNS, 'results', None)
+    if results is None:
+        results = _THREAD_RUNS.results = {}
+    return results
+
+
+def search_run(solver: Callable[..., bool]) -> Callable[..., 'SearchResult']:
+    """
+    Decorates a SearchProblem solving method, so it runs on a new
+    SearchResult.
+
+    While the method runs, the new result is the 'current_result' of the
+    problem in the calling thread, so search attributes the method sets
+    (frontier, solution, stats...) go to the result, not to the problem.
+    The result then becomes the problem 'last_result', and is returned.
+
+    Args:
+        solver (Callable[..., bool]): Method returning True if a solution is
+            found.
+
+    Returns:
+        Callable[..., SearchResult]: The decorated method.
+    """
+    @functools.wraps(solver)
+    def run_solver(search_problem: 'SearchProblem', *args, **kwargs) -> 'SearchResult':
+        results = _thread_results()
+        key = id(search_problem)
+        outer_result = results.get(key)
+        result = results[key] = SearchResult()
+        try:
+            result.solved = bool(solver(search_problem, *args, **kwargs))
+        finally:
+            if outer_result is None:
+                del results[key]
+            else:
+                results[key] = outer_result
+        search_problem.last_result = result
+        return result
+    return run_solver
+
+
+class _RunAttribute:
+    """
+    SearchProblem attribute kept in its current SearchResult (see
+    SearchProblem.current_result).
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, search_problem: Optional['SearchProblem'],
+                owner: Optional[type] = None) -> object:
+        if search_problem is None:
+            return self
+        return getattr(search_problem.current_result, self.name)
+
+    def __set__(self, search_problem: 'SearchProblem', value: object) -> None:
+        setattr(search_problem.current_result, self.name, value)
+
+
 class SearchProblem(ABC):
     """
     Represents an abstract search problem.
@@ -48,9 +156,18 @@ class SearchProblem(ABC):
     problem-specific attributes. show_solution() and
     save_algorithm_steps_to_file() methods are usual candidates for override.
 
+    Each solve() run keeps its state (frontier, explored nodes, solution,
+    statistics...) in its own SearchResult, that solve() returns, so the
+    problem itself is only read by searches and may be shared by concurrent
+    runs (e.g. in threads). The run attributes below are a view of
+    'current_result': the run in progress in the calling thread (so
+    observers and nodes see their own run), or else the last finished run.
+
     Attributes:
         start_node (Optional[Node]): The initial state of the search problem.
         goal_node (Optional[Node]): The goal state of the search problem.
+        goal_states (Optional[set]): Set of goal states, for problems with
+            several goals. If None, 'goal_node' state is the only goal.
         algorithm (Optional[str]): The search algorithm to use (e.g., 'BFS',
             'DFS').
         frontier (_Frontier): The frontier used in the search algorithm.
@@ -58,11 +175,33 @@ class SearchProblem(ABC):
             explored.
         solution (_Solution): The solution path from the start node to the
             goal node.
-        algorithm_log (_LogHandler): A handler for recording algorithm
-            execution steps.
+        solutions (dict): Solution path to each goal state found, in
+            'all goals' mode (see solve()).
+        algorithm_log (Optional[MemorySink]): Recorded algorithm execution
+            steps of the last solve() run, if recorded.
+        stats (SearchStats): Counters and timings of the last solve() run.
+        optimal (bool): True if the solution of the last solve() run is
+            provably optimal (see solve()).
+        search_tree (Optional[SearchTree]): Parent map of the last solve()
+            run, if kept (see solve()).
+        suboptimality (Optional[float]): Bound on the solution cost over
+            the optimal cost, for 'ANYTIME' runs (see solve()).
+        last_result (SearchResult): Result of the last finished run.
 
     """
 
+    algorithm = _RunAttribute()
+    frontier = _RunAttribute()
+    explored_nodes = _RunAttribute()
+    solution = _RunAttribute()
+    solutions = _RunAttribute()
+    algorithm_log = _RunAttribute()
+    stats = _RunAttribute()
+    optimal = _RunAttribute()
+    search_tree = _RunAttribute()
+    suboptimality = _RunAttribute()
+    _run = _RunAttribute()
+
     def __init__(self) -> None:
         """
         Initializes the SearchProblem object.
@@ -76,7 +215,8 @@ class SearchProblem(ABC):
             This method MUST be overridden. Redefined method in subclass:
 
             - MUST assign 'start_node' and 'goal_node' attributes with
-              appropriate values.
+              appropriate values. Problems with several goals MAY assign
+              'goal_states' instead of 'goal_node', or override goal_test().
             - MUST call `super().__init__()` (generally as first statement)
             - MAY define other attributes relevant to the specific search
               problem, if needed by actions() or result() methods in 'Node'
@@ -88,18 +228,43 @@ class SearchProblem(ABC):
         """
         self.start_node = None
         self.goal_node = None
+        self.goal_states = None
+        self.last_result = SearchResult()
 
-        self._initialize_search_components()
+    def __getstate__(self) -> dict:
+        """
+        Returns the problem attributes to pickle (e.g. for parallel search
+        workers started by spawn), without the last run result, whose
+        frontier and explored nodes may hold local functions.
+
+        Returns:
+            dict: Problem attributes but 'last_result'.
+        """
+        state = self.__dict__.copy()
+        state.pop('last_result', None)
+        return state
+
+    @property
+    def current_result(self) -> 'SearchResult':
+        """
+        Result of the run in progress in the calling thread or, if none, of
+        the last finished run.
+        """
+        result = _thread_results().get(id(self))
+        if result is None:
+            result = self.__dict__.get('last_result')
+            if result is None:
+                result = self.last_result = SearchResult()
+        return result
 
     def _initialize_search_components(self) -> None:
         """
         Initializes components required for the search.
 
         This method is responsible for initializing the search attributes,
-        such as the algorithm type, frontier, explored nodes, solution, and log
-        handler.
-        It is called during both initialization of class object, and
-        at the start of the solve process, that is why it is apart from __init__() method.
+        such as the algorithm type, frontier, explored nodes, solution,
+        algorithm steps log and search statistics, of the current run (see
+        'current_result').
 
         Returns:
             None
@@ -108,74 +273,1082 @@ class SearchProblem(ABC):
         self.frontier = _Frontier()
         self.explored_nodes = _ExploredNodes()
         self.solution = _Solution()
-        self.algorithm_log = _LogHandler()
-
-    def solve(self, search_algorithm: str = 'BFS') -> bool:
+        self.solutions = {}
+        self.algorithm_log = None
+        self.stats = SearchStats()
+        self.optimal = False
+        self.search_tree = None
+        self._run = None
+
+    @search_run
+    def solve(self, search_algorithm: str = 'BFS', timed: bool = False,
+              trace_memory: bool = False,
+              observers: Optional[List['SearchObserver']] = None,
+              all_goals: bool = False, keep_tree: bool = False,
+              complete_tree: bool = False, beam_width: Optional[int] = None,
+              node_limit: Optional[int] = None,
+              checkpoint_path: Optional[str] = None,
+              checkpoint_every: Optional[int] = None,
+              checkpoint_interval: Optional[float] = None,
+              work_dir: Optional[str] = None,
+              buffer_size: Optional[int] = None,
+              duplicate_layers: Optional[int] = None,
+              workers: Optional[int] = None,
+              deadline: Optional[float] = None,
+              weight: Optional[float] = None,
+              goal_on_generate: bool = False) -> 'SearchResult':
         """
-        Solves the search problem using BFS or DFS algorithms.
+        Solves the search problem using BFS, DFS, UCS, A*, beam search,
+        SMA*, anytime weighted A* or external memory BFS algorithms.
 
         This method initializes the search components (frontier, explored
-        nodes, solution) and executes either Breadth-First Search (BFS) or
-        Depth-First Search (DFS) to find a path from the initial state to
-        the goal state.
+        nodes, solution) and executes either Breadth-First Search (BFS),
+        Depth-First Search (DFS), Uniform Cost Search (UCS), A* (ASTAR), beam
+        search (BEAM) or simplified memory-bounded A* (SMA*) to find a path
+        from the initial state to the goal state.
 
         Breadth-First Search (BFS) explores nodes level by level, whereas
         Depth-First Search (DFS) explores nodes as far as possible along each
-        branch.
-
-        Maintains detailed algorithm execution log including frontier state,
-        explored nodes, and node expansion sequence BEFORE each node expansion.
+        branch. Uniform Cost Search (UCS, i.e. Dijkstra's algorithm) explores
+        nodes in order of path cost (sum of Node.step_cost() along the path),
+        with a heap based frontier, so it finds the cheapest path. A* explores
+        nodes in order of path cost plus Node.heuristic() estimate of the
+        remaining cost.
+
+        Memory bounded algorithms give up optimality to keep at most
+        'node_limit' nodes (frontier plus explored nodes): once the limit is
+        reached, the worst frontier nodes (highest path cost plus heuristic)
+        are evicted. Evicted nodes may be generated again later from another
+        path. BEAM explores level by level like BFS, keeping only the
+        'beam_width' best nodes of each level. SMA* is A* with eviction (a
+        simplification of SMA*: f-costs of evicted nodes are not backed up to
+        their parents, so the search may fail if the limit is too low).
+
+        'optimal' tells if the solution is provably optimal: always for UCS
+        and A* (with an admissible and consistent heuristic), for SMA* if no
+        evicted node could lead to a cheaper solution (its path cost plus
+        heuristic is not lower than the solution cost), and for BFS in number
+        of actions (BEAM too, if no node was evicted, as it then explores as
+        BFS). DFS solutions are not provably optimal.
+
+        Extracted nodes are checked with goal_test(), so problems may have
+        several goals: the search stops at the first goal found (the nearest
+        one, for BFS). In 'all goals' mode, the search goes on after finding
+        a goal (goal nodes are expanded too) until every goal in
+        'goal_states' is found or the frontier is exhausted, and 'solutions'
+        holds the path to each goal found, from a single expansion of the
+        graph. 'solution' is then the path to the first goal found.
+
+        Children are generated one at a time (see Node.iter_children()), so
+        BFS and DFS may test them when generated instead, with
+        'goal_on_generate': the search stops as soon as a new child is a
+        goal, without generating its siblings nor expanding the rest of its
+        level. BFS solutions still have the fewest actions.
+
+        If 'keep_tree' is True, the parent map of every reached state is
+        kept in 'search_tree', so paths from the start to any of them are
+        answered later by path_to() and distance_to() without searching
+        again. If 'complete_tree' is True, the search goes on after the goal
+        until the whole reachable state space is explored.
+
+        Search events (node extracted, node expanded, goal found, search
+        finished) are notified to 'observers' (see SearchObserver). By
+        default, a MemorySink records the detailed algorithm execution log
+        including frontier state, explored nodes, and node expansion sequence
+        BEFORE each node expansion. Pass an empty list to skip all recording.
+
+        Search counters (expanded, generated and duplicate nodes, peak
+        frontier and explored sizes) are always collected in 'stats'.
+        Wall time per phase and peak memory are only measured on request, as
+        they slow down the search.
+
+        Long searches may save their progress to 'checkpoint_path' every
+        'checkpoint_every' expansions and/or every 'checkpoint_interval'
+        seconds (see checkpoint()), so they can be continued with resume()
+        if the process dies.
+
+        Anytime weighted A* (ANYTIME) finds a first solution fast, and better
+        ones while time allows. It runs weighted A* searches (path cost plus
+        'weight' times the heuristic), starting with an aggressive 'weight'
+        that is halved towards 1 after each solution found, and pruning nodes
+        whose path cost plus heuristic is not lower than the best solution
+        cost. Each improved solution is notified to observers (see
+        SearchObserver.on_improve()) with a bound on its suboptimality (its
+        cost over the optimal cost, which is at most 'weight' and at least
+        1). The search stops when the solution is proved optimal (weight 1,
+        or no node left that could improve it), or at 'deadline' seconds
+        after it started, with the best solution found: 'suboptimality'
+        holds its final bound, and 'optimal' is True if it is 1. Frontier
+        and explored nodes are not kept ('frontier' and 'explored_nodes'
+        stay empty), observers are not attached by default, and other
+        options are not supported.
+
+        External memory BFS (EXTERNAL_BFS) is BFS for state spaces larger
+        than RAM, with delayed duplicate detection: each level is kept on disk
+        (in 'work_dir') as a file of encoded states (see Node.encode_state())
+        sorted by code. Children are buffered in memory, 'buffer_size' at
+        most, and sorted buffers are written to run files, that are merged
+        into the next level file once the level is expanded, dropping states
+        already in previous levels. By default, every previous level is
+        checked, which is right for any problem. For problems whose actions
+        can all be undone (e.g. mazes), checking the 2 previous levels with
+        'duplicate_layers' is enough, and cheaper. Disk I/O volume and level
+        timings are collected in 'stats'. As frontier and explored nodes are
+        on disk, 'frontier' and 'explored_nodes' stay empty, observers are
+        not attached by default, and all_goals, keep_tree, complete_tree and
+        checkpoint options are not supported.
+
+        BFS and A* may run in parallel across 'workers' processes (hash
+        distributed A*, HDA*): states are partitioned by a hash of the state
+        among workers, each one with its own frontier and explored states.
+        Children owned by another worker are sent to it in batches. The
+        first goal found bounds the search, that goes on until no worker has
+        a node that may lead to a cheaper solution and no batch is in
+        transit, so solutions are as optimal as serial ones (BFS, in number
+        of actions). States, actions and the problem must be picklable, and
+        the node class defined at module level. Counters in 'stats' are
+        summed over workers; 'frontier' and 'explored_nodes' stay empty,
+        observers are only notified of search start, goal and finish, and
+        other options are not supported.
 
         Args:
-            search_algorithm (str): The search strategy to use. Must be either
-                'BFS' or 'DFS'.
+            search_algorithm (str): The search strategy to use. Must be 'BFS',
+                'DFS', 'UCS', 'ASTAR', 'BEAM', 'SMA*', 'ANYTIME' or
+                'EXTERNAL_BFS'.
+            timed (bool): If True, measures wall time of each search phase
+                (see SearchStats). Default is False.
+            trace_memory (bool): If True, measures peak memory allocated
+                during the search with tracemalloc. Default is False.
+            observers (Optional[List[SearchObserver]]): Observers notified of
+                search events. Default is None, meaning a new MemorySink.
+            all_goals (bool): If True, finds a path to every reachable goal.
+                Default is False.
+            keep_tree (bool): If True, keeps the parent map of the search in
+                'search_tree'. Default is False.
+            complete_tree (bool): If True, explores every reachable state and
+                keeps the parent map (implies 'keep_tree'). Default is False.
+            beam_width (Optional[int]): Nodes kept per level, for 'BEAM'
+                (required).
+            node_limit (Optional[int]): Maximum number of nodes kept, for
+                'BEAM' and 'SMA*' (required for 'SMA*'). Default is None (no
+                limit).
+            checkpoint_path (Optional[str]): File automatic checkpoints are
+                saved to. Default is None (no automatic checkpoints).
+            checkpoint_every (Optional[int]): Expansions between automatic
+                checkpoints.
+            checkpoint_interval (Optional[float]): Seconds between automatic
+                checkpoints.
+            work_dir (Optional[str]): Directory of level files, for
+                'EXTERNAL_BFS', created if it does not exist. Default is None
+                (system temporary directory).
+            buffer_size (Optional[int]): Children kept in memory before being
+                written to disk, for 'EXTERNAL_BFS'. Default is None (100000).
+            duplicate_layers (Optional[int]): Previous levels checked for
+                duplicates, for 'EXTERNAL_BFS'. Default is None (all).
+            workers (Optional[int]): Worker processes, for parallel 'BFS' and
+                'ASTAR'. Default is None (serial search in this process).
+            deadline (Optional[float]): Seconds the search may last, for
+                'ANYTIME'. Default is None (until the solution is optimal).
+            weight (Optional[float]): Initial heuristic weight, not lower
+                than 1, for 'ANYTIME'. Default is None (3).
+            goal_on_generate (bool): If True, children are goal tested when
+                generated, for serial 'BFS' and 'DFS' without all_goals and
+                complete_tree. Default is False.
 
         Returns:
-            bool: True if a solution is found, False otherwise.
+            SearchResult: Result of the run, true if a solution is found.
 
         Raises:
-            ValueError: If search_algorithm is not 'BFS' or 'DFS'.
+            ValueError: If search_algorithm is unknown, or beam_width or
+                node_limit are missing, not positive or not supported by
+                search_algorithm, or options are not supported by
+                'EXTERNAL_BFS', 'ANYTIME', parallel search or
+                goal_on_generate.
         """
+        if goal_on_generate and (search_algorithm not in ('BFS', 'DFS') or all_goals
+                                 or complete_tree or workers is not None):
+            raise ValueError("goal_on_generate is for serial 'BFS' and 'DFS' only, "
+                             "without all_goals and complete_tree")
         self._initialize_search_components()
         self.algorithm = search_algorithm
+        self.stats = SearchStats(timed=timed, trace_memory=trace_memory)
+        if search_algorithm == 'ANYTIME':
+            if any((all_goals, keep_tree, complete_tree, beam_width, node_limit,
+                    checkpoint_path, checkpoint_every, checkpoint_interval, work_dir,
+                    buffer_size, duplicate_layers, workers)):
+                raise ValueError("'ANYTIME' only supports deadline and weight options")
+            if (deadline is not None and deadline <= 0) or (weight is not None and weight < 1):
+                raise ValueError("deadline must be positive, and weight at least 1")
+            notify = self._attach_observers(observers if observers is not None else [])
+            return self._anytime_search(notify, deadline, 3.0 if weight is None else weight)
+        if deadline is not None or weight is not None:
+            raise ValueError("deadline and weight are 'ANYTIME' options only")
+        external_options = (work_dir, buffer_size, duplicate_layers)
+        if search_algorithm == 'EXTERNAL_BFS':
+            if any((all_goals, keep_tree, complete_tree, beam_width, node_limit,
+                    checkpoint_path, checkpoint_every, checkpoint_interval)):
+                raise ValueError("'EXTERNAL_BFS' only supports work_dir, buffer_size "
+                                 "and duplicate_layers options")
+            if (buffer_size is not None and buffer_size < 1) \
+                    or (duplicate_layers is not None and duplicate_layers < 1):
+                raise ValueError("buffer_size and duplicate_layers must be positive")
+            notify = self._attach_observers(observers if observers is not None else [])
+            return self._external_search(notify, *external_options)
+        if any(option is not None for option in external_options):
+            raise ValueError("work_dir, buffer_size and duplicate_layers are "
+                             "'EXTERNAL_BFS' options only")
+        if workers is not None:
+            if search_algorithm not in ('BFS', 'ASTAR') or workers < 1:
+                raise ValueError("workers must be positive, for 'BFS' or 'ASTAR' only")
+            if any((all_goals, keep_tree, complete_tree, checkpoint_path,
+                    checkpoint_every, checkpoint_interval)):
+                raise ValueError("Parallel search does not support all_goals, keep_tree, "
+                                 "complete_tree and checkpoint options")
+            notify = self._attach_observers(observers if observers is not None else [])
+            return self._parallel_search(notify, workers)
+        self.frontier = self._new_frontier(search_algorithm, beam_width)
+        if search_algorithm == 'SMA*' and node_limit is None:
+            raise ValueError("'SMA*' requires a node_limit")
+        if node_limit is not None and (search_algorithm not in ('BEAM', 'SMA*') or node_limit < 1):
+            raise ValueError("node_limit must be positive, for 'BEAM' or 'SMA*' only")
+        notify = self._attach_observers(observers)
+
+        self._run = _SearchRun(all_goals=all_goals, keep_tree=keep_tree,
+                               complete_tree=complete_tree, beam_width=beam_width,
+                               node_limit=node_limit, goal_on_generate=goal_on_generate)
+        self._run.goals_left = len(self.goal_states) if self.goal_states else None
+        self._run.set_checkpoints(checkpoint_path, checkpoint_every, checkpoint_interval)
+        self.frontier.add_node(self.start_node)
+        self.stats.peak_frontier = 1
+        return self._search(notify)
+
+    def _new_frontier(self, search_algorithm: str,
+                      beam_width: Optional[int] = None) -> '_Frontier':
+        """
+        Creates an empty frontier for 'search_algorithm', and empty explored
+        nodes (keyed as the frontier, see _state_keys()).
+
+        Args:
+            search_algorithm (str): The search algorithm.
+            beam_width (Optional[int]): Nodes kept per level, for 'BEAM'.
 
-        self.algorithm_log = _LogHandler()
+        Returns:
+            _Frontier: The frontier.
 
+        Raises:
+            ValueError: If search_algorithm is unknown or beam_width is not
+                valid.
+        """
+        state_key, key_set = self._state_keys()
+        if state_key is not None:
+            self.explored_nodes = _ExploredNodes(state_key, key_set)
         if search_algorithm == 'BFS':
-            self.frontier = _QueueFrontier()
-        elif search_algorithm == 'DFS':
-            self.frontier = _StackFrontier()
-        else:
-            raise ValueError(f"Unknown search algorithm: {search_algorithm}")
+            return _QueueFrontier(state_key, key_set)
+        if search_algorithm == 'DFS':
+            return _StackFrontier(state_key, key_set)
+        if search_algorithm == 'UCS':
+            return _PriorityFrontier(state_key)
+        if search_algorithm in ('ASTAR', 'SMA*'):
+            return _PriorityFrontier(state_key, self._estimated_cost)
+        if search_algorithm == 'BEAM':
+            if beam_width is None or beam_width < 1:
+                raise ValueError("'BEAM' requires a positive beam_width")
+            return _BeamFrontier(beam_width, self._estimated_cost, state_key, key_set)
+        raise ValueError(f"Unknown search algorithm: {search_algorithm}")
+
+    def _search(self, notify: Optional['_ObserverGroup']) -> bool:
+        """
+        Runs the search loop of solve() and resume(), from the current
+        frontier and explored nodes, until a goal is found (or every goal,
+        in 'all goals' mode) or the frontier is exhausted.
 
-        self.frontier.add_node(self.start_node)
+        Args:
+            notify (Optional[_ObserverGroup]): Observers of the run.
+
+        Returns:
+            bool: True if a solution is found, False otherwise.
+        """
+        run = self._run
+        stats = self.stats
+        timed = stats.timed
+        all_goals, complete_tree, node_limit = run.all_goals, run.complete_tree, run.node_limit
+        goal_on_generate = run.goal_on_generate
+        state_key = self._state_keys()[0]
+        weighted = self.algorithm in ('UCS', 'ASTAR', 'BEAM', 'SMA*')
+        goal_test = self.goal_test
+        frontier, explored_nodes = self.frontier, self.explored_nodes
+        extracted_node = self.start_node
+        stats.start()
+        tick = 0.0
+        if notify:
+            notify.on_start(self)
+        try:
+            while frontier.not_empty():
+                if timed:
+                    tick = time.perf_counter()
+                extracted_node = frontier.extract()
+                if timed:
+                    tick = stats.lap('frontier', tick)
+                if notify:
+                    notify.on_extract(self, extracted_node)
+                    if timed:
+                        tick = stats.lap('observers', tick)
+
+                is_goal = goal_test(extracted_node.state)
+                if timed:
+                    tick = stats.lap('goal_test', tick)
+                if is_goal:
+                    if run.first_goal is None:
+                        run.first_goal = extracted_node
+                    if notify:
+                        notify.on_goal(self, extracted_node)
+                    if all_goals:
+                        self.solutions[extracted_node.state] = _Solution()
+                        self.solutions[extracted_node.state].build(extracted_node)
+                        if run.goals_left is not None:
+                            run.goals_left -= 1
+                            if run.goals_left == 0 and not complete_tree:
+                                break
+                    elif not complete_tree:
+                        break
+
+                explored_nodes.add_node(extracted_node)
+
+                # Children are generated lazily, one at a time, so a goal child
+                # stops the expansion before its siblings are generated
+                child_nodes = [] if notify else None
+                goal_child = None
+                generated = 0
+                successors = (None if notify or state_key is None
+                              else extracted_node.successors(self))
+                if successors is not None:
+                    # Nodes are only built for admitted states
+                    node_class = type(extracted_node)
+                    built = 0
+                    for action, state in successors:
+                        generated += 1
+                        if timed:
+                            tick = stats.lap('expand', tick)
+                        if state in explored_nodes or (not weighted and state in frontier):
+                            stats.duplicates += 1
+                            if timed:
+                                tick = stats.lap('membership', tick)
+                            continue
+                        child = node_class(state=state, parent=extracted_node, action=action)
+                        built += 1
+                        if weighted:
+                            child.path_cost = extracted_node.path_cost + child.step_cost(self)
+                        if timed:
+                            tick = stats.lap('expand', tick)
+                        if weighted and state in frontier and not frontier.improves(child):
+                            stats.duplicates += 1
+                        else:
+                            frontier.add_node(child)
+                            if goal_on_generate and goal_test(state):
+                                goal_child = child
+                                break
+                        if timed:
+                            tick = stats.lap('membership', tick)
+                    stats.nodes_built += built
+                else:
+                    for child in extracted_node.iter_children(self):
+                        generated += 1
+                        if weighted:
+                            child.path_cost = extracted_node.path_cost + child.step_cost(self)
+                        if child_nodes is not None:
+                            child_nodes.append(child)
+                        if timed:
+                            tick = stats.lap('expand', tick)
+                        if (child not in frontier or frontier.improves(child)) \
+                                and child not in explored_nodes:
+                            frontier.add_node(child)
+                            if goal_on_generate and goal_test(child.state):
+                                goal_child = child
+                                break
+                        else:
+                            stats.duplicates += 1
+                        if timed:
+                            tick = stats.lap('membership', tick)
+                    stats.nodes_built += generated
+                stats.expanded += 1
+                stats.generated += generated
+                if goal_child is not None:
+                    run.first_goal = goal_child
+                    if notify:
+                        notify.on_goal(self, goal_child)
+                if node_limit is not None:
+                    excess = len(frontier) + len(explored_nodes) - node_limit
+                    if excess > 0:
+                        # Evict some extra nodes, so evictions are not done at every expansion
+                        frontier.evict(excess + node_limit // 16)
+                if len(frontier) > stats.peak_frontier:
+                    stats.peak_frontier = len(frontier)
+                if timed:
+                    tick = stats.lap('membership', tick)
+
+                if notify:
+                    notify.on_expand(self, extracted_node, child_nodes)
+                    if timed:
+                        stats.lap('observers', tick)
+                if goal_child is not None:
+                    break
+                if run.checkpoint_path is not None and run.checkpoint_due(stats.expanded):
+                    self.checkpoint(run.checkpoint_path)
+
+            solved = run.first_goal is not None
+            if solved:
+                self.solution.build(run.first_goal)
+            stats.pruned = frontier.pruned
+            if run.keep_tree or complete_tree:
+                self.search_tree = SearchTree(
+                    self.start_node,
+                    chain(explored_nodes, frontier, [extracted_node]),
+                    complete=not frontier.not_empty() and not stats.pruned)
+            stats.stop(explored_size=len(explored_nodes))
+            if not solved:
+                self.solution = None
+            self.optimal = solved and self.algorithm != 'DFS' and (
+                frontier.pruned_bound is None
+                or (self.algorithm == 'SMA*'
+                    and self.solution.cost() <= frontier.pruned_bound))
+            self._run = None
+        except BaseException:
+            stats.stop()
+            if notify:
+                notify.on_finish(self, False)
+            raise
+        if notify:
+            notify.on_finish(self, solved)
+        return solved
+
+    def _anytime_search(self, notify: Optional['_ObserverGroup'],
+                        deadline: Optional[float], weight: float) -> bool:
+        """
+        Runs anytime weighted A* (see solve() 'ANYTIME').
 
-        while self.frontier.not_empty():
-            self.algorithm_log.add_to_record(
-                frontier=self.frontier.copy(),
-                explored=self.explored_nodes.copy()
-            )
+        Weighted A* searches are restarted from the start node with lower
+        weights, each one bounded by the best solution cost found so far
+        (restarting weighted A*). Suboptimality bounds are the lowest of
+        the search weight, when a solution is found, and the best cost over
+        a lower bound of the optimal cost: the lowest path cost plus
+        heuristic of frontier nodes, as nodes are reopened when reached
+        through a cheaper path.
 
-            extracted_node = self.frontier.extract()
-            self.algorithm_log.add_to_record(extracted=extracted_node)
+        Args:
+            notify (Optional[_ObserverGroup]): Observers of the run.
+            deadline (Optional[float]): Seconds the search may last.
+            weight (float): Initial heuristic weight.
+
+        Returns:
+            bool: True if a solution is found, False otherwise.
+        """
+        stats = self.stats
+        stats.start()
+        started = time.perf_counter()
+        stop_time = None if deadline is None else started + deadline
+        best_node, bound = None, float('inf')
+        if notify:
+            notify.on_start(self)
+        try:
+            while True:
+                goal_node, lower_bound, timed_out = self._weighted_search(
+                    weight, float('inf') if best_node is None else best_node.path_cost,
+                    stop_time, notify)
+                if goal_node is not None:
+                    best_node = goal_node
+                    bound = min(weight, bound)
+                if best_node is not None:
+                    best_cost = best_node.path_cost
+                    if (goal_node is None and not timed_out) or lower_bound >= best_cost:
+                        bound = 1.0     # No node left that could lead to a cheaper solution
+                    elif lower_bound > 0:
+                        bound = min(bound, best_cost / lower_bound)
+                if goal_node is not None:
+                    stats.improvements.append(
+                        (time.perf_counter() - started, best_node.path_cost, weight, bound))
+                    if notify:
+                        notify.on_goal(self, goal_node)
+                        notify.on_improve(self, goal_node, bound)
+                if timed_out or goal_node is None or bound <= 1.0:
+                    break
+                weight = 1.0 if weight < 1.05 else 1 + (weight - 1) / 2
+
+            solved = best_node is not None
+            if solved:
+                self.solution.build(best_node)
+            else:
+                self.solution = None
+            self.suboptimality = bound if solved else None
+            self.optimal = solved and bound <= 1.0
+            stats.stop()
+        except BaseException:
+            stats.stop()
+            if notify:
+                notify.on_finish(self, False)
+            raise
+        if notify:
+            notify.on_finish(self, solved)
+        return solved
+
+    def _weighted_search(self, weight: float, cost_limit: float,
+                         stop_time: Optional[float],
+                         notify: Optional['_ObserverGroup']) -> tuple:
+        """
+        Runs a weighted A* search, for anytime weighted A*.
 
-            if extracted_node.state == self.goal_node.state:
-                self.solution.build(extracted_node)
-                self.algorithm_log.save_record()
-                return True
+        Nodes are ordered by path cost plus 'weight' times heuristic, and
+        reopened when reached through a cheaper path. Nodes whose path cost
+        plus heuristic is not lower than 'cost_limit' are pruned.
 
-            self.explored_nodes.add_node(extracted_node)
+        Args:
+            weight (float): Heuristic weight.
+            cost_limit (float): Best solution cost so far.
+            stop_time (Optional[float]): time.perf_counter() value when the
+                search must stop.
+            notify (Optional[_ObserverGroup]): Observers of the run.
 
-            child_nodes = extracted_node.expand(self)
-            self.algorithm_log.add_to_record(expanded=child_nodes)
+        Returns:
+            tuple: Goal node found (None if not found), lowest path cost plus
+            heuristic of frontier nodes (infinite if none), and True if the
+            search stopped at 'stop_time'.
+        """
+        stats = self.stats
+        goal_test = self.goal_test
+        start_node = self.start_node
+        heuristic = start_node.heuristic(self)
+        best_costs = {start_node.state: 0}
+        frontier = [(weight * heuristic, 0, 0, heuristic, start_node)]
+        push_count = 1
+        goal_node, timed_out = None, False
+        while frontier:
+            if stop_time is not None and time.perf_counter() >= stop_time:
+                timed_out = True
+                break
+            _, _, path_cost, heuristic, node = heapq.heappop(frontier)
+            if path_cost > best_costs[node.state]:
+                continue    # Stale entry: a cheaper path was pushed later
+            if path_cost + heuristic >= cost_limit:
+                stats.pruned += 1
+                continue
+            if notify:
+                notify.on_extract(self, node)
+            if goal_test(node.state):
+                goal_node = node
+                break
+            child_nodes = list(node.iter_children(self))
+            stats.expanded += 1
+            stats.generated += len(child_nodes)
+            stats.nodes_built += len(child_nodes)
             for child in child_nodes:
-                if child not in self.frontier and child not in self.explored_nodes:
-                    self.frontier.add_node(child)
+                child.path_cost = path_cost + child.step_cost(self)
+                if child.path_cost >= best_costs.get(child.state, cost_limit):
+                    stats.duplicates += 1
+                    continue
+                child_heuristic = child.heuristic(self)
+                if child.path_cost + child_heuristic >= cost_limit:
+                    stats.pruned += 1
+                    continue
+                best_costs[child.state] = child.path_cost
+                heapq.heappush(frontier, (child.path_cost + weight * child_heuristic, push_count,
+                                          child.path_cost, child_heuristic, child))
+                push_count += 1
+            stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+            if notify:
+                notify.on_expand(self, node, child_nodes)
+
+        stats.peak_explored = max(stats.peak_explored, len(best_costs))
+        lower_bound = min((path_cost + heuristic for _, _, path_cost, heuristic, node in frontier
+                           if path_cost == best_costs[node.state]), default=float('inf'))
+        if goal_node is not None:
+            lower_bound = min(lower_bound, goal_node.path_cost)
+        return goal_node, lower_bound, timed_out
+
+    def _external_search(self, notify: Optional['_ObserverGroup'],
+                         work_dir: Optional[str] = None,
+                         buffer_size: Optional[int] = None,
+                         duplicate_layers: Optional[int] = None) -> bool:
+        """
+        Runs external memory BFS (see solve() 'EXTERNAL_BFS').
 
-            self.algorithm_log.save_record()
+        Nodes of each level are rebuilt from their decoded states, without
+        parent. Once the goal is found, the solution path is rebuilt backwards
+        looking up parent codes in level files, and then forwards expanding
+        nodes again to get actual actions.
 
-        self.solution = None
-        return False
+        Args:
+            notify (Optional[_ObserverGroup]): Observers of the run.
+            work_dir (Optional[str]): Directory of level files, created if
+                it does not exist.
+            buffer_size (Optional[int]): Children kept in memory.
+            duplicate_layers (Optional[int]): Previous levels checked for
+                duplicates.
+
+        Returns:
+            bool: True if a solution is found, False otherwise.
+
+        Raises:
+            ValueError: If the node class does not encode states.
+        """
+        node_class = type(self.start_node)
+        start_code = node_class.encode_state(self.start_node.state, self)
+        if start_code is None:
+            raise ValueError("'EXTERNAL_BFS' requires Node.encode_state() and "
+                             "Node.decode_state()")
+        if isinstance(start_code, int):
+            def to_key(state: object) -> bytes:
+                code = node_class.encode_state(state, self)
+                return code.to_bytes(max(1, (code.bit_length() + 7) // 8), 'big')
+
+            def from_key(key: bytes) -> object:
+                return node_class.decode_state(int.from_bytes(key, 'big'), self)
+        else:
+            def to_key(state: object) -> bytes:
+                return bytes(node_class.encode_state(state, self))
+
+            def from_key(key: bytes) -> object:
+                return node_class.decode_state(key, self)
+
+        stats = self.stats
+        goal_test = self.goal_test
+        goal_key = None
+        depth = 0
+        if work_dir is not None:
+            os.makedirs(work_dir, exist_ok=True)
+        stats.start()
+        if notify:
+            notify.on_start(self)
+        try:
+            with tempfile.TemporaryDirectory(prefix='external_bfs_', dir=work_dir) as directory:
+                levels = _ExternalLevels(directory, buffer_size or 100000, stats,
+                                         keep_visited=duplicate_layers is None)
+                level_size = levels.start(to_key(self.start_node.state))
+                stats.peak_frontier = 1
+                while level_size:
+                    tick = time.perf_counter()
+                    generated = stats.generated
+                    for key in levels.keys(depth):
+                        node = node_class(state=from_key(key))
+                        if notify:
+                            notify.on_extract(self, node)
+                        if goal_test(node.state):
+                            goal_key = key
+                            if notify:
+                                notify.on_goal(self, node)
+                            break
+                        child_nodes = list(node.iter_children(self))
+                        stats.expanded += 1
+                        stats.generated += len(child_nodes)
+                        stats.nodes_built += len(child_nodes)
+                        for child in child_nodes:
+                            levels.add(to_key(child.state), key)
+                        if notify:
+                            notify.on_expand(self, node, child_nodes)
+                    if goal_key is not None:
+                        stats.levels.append((level_size, time.perf_counter() - tick))
+                        break
+                    next_size = levels.close_level(depth, duplicate_layers)
+                    stats.duplicates += stats.generated - generated - next_size
+                    stats.levels.append((level_size, time.perf_counter() - tick))
+                    stats.peak_frontier = max(stats.peak_frontier, next_size)
+                    level_size = next_size
+                    depth += 1
+
+                solved = goal_key is not None
+                if solved:
+                    keys = [goal_key]
+                    for level in range(depth, 0, -1):
+                        keys.append(levels.parent_key(level, keys[-1]))
+                    node = self.start_node
+                    for key in reversed(keys[:-1]):
+                        node = next(child for child in node.iter_children(self)
+                                    if to_key(child.state) == key)
+                    self.solution.build(node)
+                stats.stop(explored_size=levels.states)
+            if not solved:
+                self.solution = None
+            self.optimal = solved
+        except BaseException:
+            stats.stop()
+            if notify:
+                notify.on_finish(self, False)
+            raise
+        if notify:
+            notify.on_finish(self, solved)
+        return solved
+
+    def _parallel_search(self, notify: Optional['_ObserverGroup'], workers: int) -> bool:
+        """
+        Runs parallel BFS or A* across worker processes (see solve()
+        'workers').
+
+        This process coordinates the search: it sends the start node to its
+        owner, broadcasts the cost of the best goal found so far, and detects
+        termination with waves of probes (four counter method): the search is
+        over when two consecutive waves find every worker idle, and the same
+        number of batches sent and received. The solution path is then
+        rebuilt asking the owner of each state for its parent.
+
+        Args:
+            notify (Optional[_ObserverGroup]): Observers of the run.
+            workers (int): Number of worker processes.
+
+        Returns:
+            bool: True if a solution is found, False otherwise.
+        """
+        stats = self.stats
+        stats.start()
+        if notify:
+            notify.on_start(self)
+        try:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            inboxes = [context.Queue() for _ in range(workers)]
+            results = context.Queue()
+            processes = [context.Process(target=_run_parallel_worker, daemon=True,
+                                         args=(self, self.algorithm, worker, inboxes,
+                                               results))
+                         for worker in range(workers)]
+            for process in processes:
+                process.start()
+            try:
+                start_state = self.start_node.state
+                inboxes[_state_owner(start_state, workers)].put(
+                    ('nodes', [(start_state, 0, None, None)]))
+                best_cost, goal_state = None, None
+                previous_wave, wave = None, 0
+                while True:
+                    wave += 1
+                    for inbox in inboxes:
+                        inbox.put(('probe', wave))
+                    replies = []
+                    while len(replies) < workers:
+                        message = results.get()
+                        if message[0] == 'goal' and (best_cost is None or message[1] < best_cost):
+                            best_cost, goal_state = message[1], message[2]
+                            for inbox in inboxes:
+                                inbox.put(('bound', best_cost))
+                        elif message[0] == 'probe' and message[1] == wave:
+                            replies.append(message[2:])
+                    idle = all(reply[0] for reply in replies)
+                    # The start node is the only batch not sent by a worker
+                    counts = (sum(reply[1] for reply in replies) + 1,
+                              sum(reply[2] for reply in replies))
+                    if idle and counts[0] == counts[1] and counts == previous_wave:
+                        break
+                    previous_wave = counts if idle else None
+                    if not idle:
+                        time.sleep(0.001)
+
+                solved = goal_state is not None
+                if solved:
+                    path = []
+                    state = goal_state
+                    while state is not None:
+                        inboxes[_state_owner(state, workers)].put(('parent', state))
+                        _, parent_state, action, path_cost = results.get()
+                        path.append((state, action, path_cost))
+                        state = parent_state
+                    node_class = type(self.start_node)
+                    node = self.start_node
+                    for state, action, path_cost in reversed(path[:-1]):
+                        node = node_class(state=state, parent=node, action=action)
+                        node.path_cost = path_cost
+                    self.solution.build(node)
+                    if notify:
+                        notify.on_goal(self, node)
+
+                for inbox in inboxes:
+                    inbox.put(('stop',))
+                worker_counters = [results.get()[1] for _ in range(workers)]
+            finally:
+                for process in processes:
+                    process.join(timeout=1)
+                    if process.is_alive():
+                        process.terminate()
+            for name in ('expanded', 'generated', 'duplicates', 'peak_frontier', 'peak_explored'):
+                setattr(stats, name, sum(counters[name] for counters in worker_counters))
+            stats.nodes_built = stats.generated     # Workers build every child
+            stats.worker_expanded = [counters['expanded'] for counters in worker_counters]
+            stats.stop(explored_size=stats.peak_explored)
+            if not solved:
+                self.solution = None
+            self.optimal = solved
+        except BaseException:
+            stats.stop()
+            if notify:
+                notify.on_finish(self, False)
+            raise
+        if notify:
+            notify.on_finish(self, solved)
+        return solved
+
+    def checkpoint(self, checkpoint_path: str) -> None:
+        """
+        Saves the progress of the running search to a file, so it can be
+        continued later with resume().
+
+        Nodes are saved compactly: states, actions and path costs in lists,
+        and parent links as node indexes in an array, together with frontier
+        and explored node indexes, search options and counters. The file is
+        written to a temporary file first, and then renamed, so a crash while
+        saving does not spoil the previous checkpoint.
+
+        Only 'state', 'parent', 'action' and 'path_cost' node attributes are
+        saved, and search observers are not.
+
+        Args:
+            checkpoint_path (str): Checkpoint file path.
+
+        Raises:
+            RuntimeError: If no search is running. Checkpoints can be taken
+                from a search observer on_expand() event, or automatically
+                (see solve()).
+        """
+        run = self._run
+        if run is None:
+            raise RuntimeError("No search running: checkpoint() must be called during solve()")
+        node_ids = {}
+        nodes = []
+        extra_nodes = [run.first_goal] if run.first_goal is not None else []
+        for node in chain(self.explored_nodes, self.frontier, extra_nodes):
+            pending = []
+            while node is not None and id(node) not in node_ids:
+                pending.append(node)
+                node = node.parent
+            for pending_node in reversed(pending):
+                node_ids[id(pending_node)] = len(nodes)
+                nodes.append(pending_node)
+        parents = array('l', (-1 if node.parent is None else node_ids[id(node.parent)]
+                              for node in nodes))
+        data = {
+            'version': 1,
+            'algorithm': self.algorithm,
+            'options': run.options(),
+            'states': [node.state for node in nodes],
+            'actions': [node.action for node in nodes],
+            'path_costs': [node.path_cost for node in nodes],
+            'parents': parents,
+            'explored': array('l', (node_ids[id(node)] for node in self.explored_nodes)),
+            'frontier': self.frontier.snapshot(node_ids),
+            'first_goal': None if run.first_goal is None else node_ids[id(run.first_goal)],
+            'goals_left': run.goals_left,
+            'solutions': {state: node_ids[id(solution.nodes[-1])] if solution.nodes else 0
+                          for state, solution in self.solutions.items()},
+            'counters': self.stats.counters(),
+        }
+        temp_path = checkpoint_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, checkpoint_path)
+
+    @search_run
+    def resume(self, checkpoint_path: str, timed: bool = False,
+               trace_memory: bool = False,
+               observers: Optional[List['SearchObserver']] = None,
+               checkpoint_every: Optional[int] = None,
+               checkpoint_interval: Optional[float] = None) -> 'SearchResult':
+        """
+        Continues a search saved by checkpoint(), with the same result as the
+        uninterrupted search.
+
+        The problem must be initialized as when the checkpoint was taken
+        (same start state, goals and node class). Observers only see the
+        resumed part of the search, and counters in 'stats' include the work
+        done before the checkpoint.
+
+        Args:
+            checkpoint_path (str): Checkpoint file path. Automatic
+                checkpoints, if requested, are saved to it too.
+            timed (bool): If True, measures wall time of each search phase.
+            trace_memory (bool): If True, measures peak memory.
+            observers (Optional[List[SearchObserver]]): Observers notified of
+                search events. Default is None, meaning a new MemorySink.
+            checkpoint_every (Optional[int]): Expansions between automatic
+                checkpoints.
+            checkpoint_interval (Optional[float]): Seconds between automatic
+                checkpoints.
+
+        Returns:
+            SearchResult: Result of the run, true if a solution is found.
+
+        Raises:
+            ValueError: If the checkpoint file is not valid or was taken from
+                another start state.
+        """
+        with open(checkpoint_path, 'rb') as file:
+            data = pickle.load(file)
+        if not isinstance(data, dict) or data.get('version') != 1:
+            raise ValueError(f"Not a search checkpoint file: {checkpoint_path}")
+        if data['states'][0] != self.start_node.state:
+            raise ValueError("Checkpoint was taken from another start state")
+
+        self._initialize_search_components()
+        self.algorithm = data['algorithm']
+        self.stats = SearchStats(timed=timed, trace_memory=trace_memory)
+        self.stats.restore_counters(data['counters'])
+        options = data['options']
+        self.frontier = self._new_frontier(self.algorithm, options['beam_width'])
+        notify = self._attach_observers(observers)
+
+        node_class = type(self.start_node)
+        nodes = []
+        for state, action, path_cost, parent in zip(data['states'], data['actions'],
+                                                    data['path_costs'], data['parents']):
+            if parent == -1:
+                node = self.start_node
+            else:
+                node = node_class(state=state, parent=nodes[parent], action=action)
+            node.path_cost = path_cost
+            nodes.append(node)
+        for node_id in data['explored']:
+            self.explored_nodes.add_node(nodes[node_id])
+        self.frontier.restore(data['frontier'], nodes)
+        for state, node_id in data['solutions'].items():
+            self.solutions[state] = _Solution()
+            self.solutions[state].build(nodes[node_id])
+
+        self._run = _SearchRun(**options)
+        self._run.goals_left = data['goals_left']
+        if data['first_goal'] is not None:
+            self._run.first_goal = nodes[data['first_goal']]
+        self._run.set_checkpoints(checkpoint_path if checkpoint_every or checkpoint_interval
+                                  else None, checkpoint_every, checkpoint_interval,
+                                  self.stats.expanded)
+        return self._search(notify)
+
+    def path_to(self, state: object) -> Optional[List[object]]:
+        """
+        Returns the path from the start state to 'state' found by the last
+        solve() run, without searching again.
+
+        Args:
+            state (object): The state to reach.
+
+        Returns:
+            Optional[list]: States from start state to 'state' (both
+            included), or None if 'state' was not reached.
+
+        Raises:
+            RuntimeError: If the last solve() run did not keep its search
+                tree (see solve() 'keep_tree' argument).
+        """
+        return self._kept_search_tree().path_to(state)
+
+    def distance_to(self, state: object) -> Optional[int]:
+        """
+        Returns the number of actions from the start state to 'state' in the
+        search tree of the last solve() run.
+
+        Args:
+            state (object): The state to reach.
+
+        Returns:
+            Optional[int]: Path length to 'state', or None if 'state' was not
+            reached.
+
+        Raises:
+            RuntimeError: If the last solve() run did not keep its search
+                tree (see solve() 'keep_tree' argument).
+        """
+        return self._kept_search_tree().distance_to(state)
+
+    def _kept_search_tree(self) -> 'SearchTree':
+        """
+        Returns 'search_tree', checking it was kept by the last solve() run.
+
+        Returns:
+            SearchTree: The search tree.
+
+        Raises:
+            RuntimeError: If there is no search tree.
+        """
+        if self.search_tree is None:
+            raise RuntimeError("No search tree kept: call solve() with keep_tree=True")
+        return self.search_tree
+
+    def _state_keys(self) -> tuple:
+        """
+        Returns the duplicate detection key of states, according to the hooks
+        provided by the problem node class: the state index (see
+        Node.state_index()) of the canonical state (see
+        Node.canonical_state()), or the state itself if the node class
+        provides Node.successors() only.
+
+        Returns:
+            tuple: Function mapping a state to its key, and the set class to
+            keep keys in (_BitSet for integer indexes, set otherwise), or
+            (None, None) if the node class provides no hook.
+        """
+        node_class = type(self.start_node)
+        indexed = node_class.state_index(self.start_node.state, self) is not None
+        canonical = node_class.canonical_state.__func__ is not Node.canonical_state.__func__
+        if indexed and canonical:
+            return (lambda state: node_class.state_index(
+                node_class.canonical_state(state, self), self)), _BitSet
+        if indexed:
+            return (lambda state: node_class.state_index(state, self)), _BitSet
+        if canonical:
+            return (lambda state: node_class.canonical_state(state, self)), set
+        if node_class.successors is not Node.successors:
+            # Successor states are checked before any node is built
+            return (lambda state: state), set
+        return None, None
+
+    def _estimated_cost(self, node: 'Node') -> float:
+        """
+        Estimated cost of the cheapest solution through 'node': its path cost
+        plus its heuristic estimate (A* f-cost).
+
+        Args:
+            node (Node): The node to evaluate.
+
+        Returns:
+            float: Estimated solution cost.
+        """
+        return node.path_cost + node.heuristic(self)
+
+    def goal_test(self, state: object) -> bool:
+        """
+        Checks if a state is a goal.
+
+        Default goal test compares 'state' with 'goal_states' (if assigned)
+        or with 'goal_node' state.
+
+        Args:
+            state (object): The state to check.
+
+        Returns:
+            bool: True if 'state' is a goal, False otherwise.
+
+        Note:
+            This method MAY be overridden to define goals with a predicate
+            instead of a set of goal states.
+        """
+        if self.goal_states:
+            return state in self.goal_states
+        return state == self.goal_node.state
+
+    def _attach_observers(self, observers: Optional[List['SearchObserver']]
+                          ) -> Optional['_ObserverGroup']:
+        """
+        Prepares observers for a search run.
+
+        The first MemorySink among observers becomes 'algorithm_log', used by
+        save_algorithm_steps_to_file().
+
+        Args:
+            observers (Optional[List[SearchObserver]]): Observers of the run.
+                None means a new MemorySink.
+
+        Returns:
+            Optional[_ObserverGroup]: Single observer forwarding events to
+            all 'observers', or None if there is nothing to notify.
+        """
+        if observers is None:
+            observers = [MemorySink()]
+        self.algorithm_log = next(
+            (observer for observer in observers if isinstance(observer, MemorySink)), None)
+        return _ObserverGroup(observers) if observers else None
 
     def show_solution(self) -> None:
         """
@@ -211,7 +1384,8 @@ class SearchProblem(ABC):
 
         Details algorithm name, number of explored and solution nodes, and for
         each algorithm step, the current state of explored nodes, frontier,
-        extracted nodes, and expanded nodes.
+        extracted nodes, and expanded nodes. Algorithm steps are only saved
+        if last solve() run recorded them in a MemorySink.
         If no solution exists, prints "No Solution found!".
 
         Returns:
@@ -231,499 +1405,3201 @@ class SearchProblem(ABC):
         with open(log_filename, 'w', encoding="utf-8") as file:
             file.writelines(line + "\n" for line in lines)
 
-        self.algorithm_log.save_log(log_filename)
+        if self.algorithm_log is not None:
+            self.algorithm_log.save_log(log_filename)
         print(f"Algorithm steps saved to file: {log_filename}\n")
 
 
-class Node(ABC):
-    """Represents a node in the search tree.
-
-    Derived classes need to override actions() and result() methods to include
-    problem-specific logic. __init__() is likely to be overridden as well.
+class SearchResult:
+    """
+    Result and state of a search run, returned by SearchProblem.solve().
 
+    Every run has its own result, so runs of the same problem do not
+    interfere with each other, even at once. A result is true if a solution
+    was found, so `if problem.solve():` still works.
 
     Attributes:
-        state (Optional[object]): The state represented by this node.
-        parent (Optional[Node]): The parent node from which this node was generated.
-        action (Optional[object]): The action taken to reach this node from its parent.
+        solved (bool): True if a solution was found.
+        algorithm (Optional[str]): The search algorithm of the run.
+        frontier (_Frontier): Frontier nodes, when the run ended.
+        explored_nodes (_ExploredNodes): Explored nodes, when the run ended.
+        solution (Optional[_Solution]): The solution path, or None if not
+            solved.
+        solutions (dict): Solution path to each goal state found, in
+            'all goals' mode.
+        algorithm_log (Optional[MemorySink]): Recorded algorithm execution
+            steps, if recorded.
+        stats (SearchStats): Counters and timings of the run.
+        optimal (bool): True if the solution is provably optimal.
+        search_tree (Optional[SearchTree]): Parent map of the run, if kept.
+        suboptimality (Optional[float]): Bound on the solution cost over the
+            optimal cost, for 'ANYTIME' runs.
     """
 
-    def __init__(self, state: Optional[object] = None,
-                 parent: Optional['Node'] = None,
-                 action: Optional[object] = None) -> None:
+    def __init__(self) -> None:
         """
-        Initialize a Node object in the search tree.
+        Initializes an empty result, of a run not started yet.
+        """
+        self.solved = False
+        self.algorithm = None
+        self.frontier = _Frontier()
+        self.explored_nodes = _ExploredNodes()
+        self.solution = _Solution()
+        self.solutions = {}
+        self.algorithm_log = None
+        self.stats = SearchStats()
+        self.optimal = False
+        self.search_tree = None
+        self.suboptimality = None
+        self._run = None
+
+    def __bool__(self) -> bool:
+        """
+        Returns True if a solution was found.
+        """
+        return self.solved
 
-        Args:
-            state (Optional[object]): The state represented by this node.
-                Default is None.
-            parent (Optional[Node]): The parent node from which this node was
-                generated. Default is None.
-            action (Optional[object]): The action that was taken to reach
-                this node from its parent. Default is None.
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the result.
 
         Returns:
-            None
+            str: Algorithm, solved flag, solution length and expanded nodes.
+        """
+        length = None if self.solution is None else len(self.solution)
+        return (f"SearchResult(algorithm={self.algorithm!r}, solved={self.solved}, "
+                f"length={length}, expanded={self.stats.expanded})")
 
-        Note:
-            This method MAY be overridden. Redefined method in subclass:
 
-            - MUST call `super().__init__()` (generally as first statement)
-            - MAY define other attributes relevant to the specific search
-              problem, if needed by actions() or result() methods
+class _SearchRun:
+    """
+    Options and progress of a running search, that must survive a
+    checkpoint (see SearchProblem.checkpoint()).
 
-        """
-        self.state = state
-        self.parent = parent
-        self.action = action
+    Attributes:
+        all_goals, keep_tree, complete_tree, beam_width, node_limit,
+            goal_on_generate: Search options (see SearchProblem.solve()).
+        first_goal (Optional[Node]): First goal node found.
+        goals_left (Optional[int]): Goals not found yet, in 'all goals' mode.
+        checkpoint_path (Optional[str]): Automatic checkpoints file.
+    """
 
-    @abstractmethod
-    def actions(self, search_problem: SearchProblem) -> List[object]:
+    def __init__(self, all_goals: bool = False, keep_tree: bool = False,
+                 complete_tree: bool = False, beam_width: Optional[int] = None,
+                 node_limit: Optional[int] = None, goal_on_generate: bool = False) -> None:
         """
-        Return a list of valid actions for this node.
-
-        Note:
-            This method MUST be implemented in a subclass.
+        Initializes the _SearchRun object with search options.
 
         Args:
-            search_problem (SearchProblem): The problem being solved, which
-                provides the context and constraints for determining valid
-                actions.
+            all_goals, keep_tree, complete_tree, beam_width, node_limit,
+                goal_on_generate: Search options (see SearchProblem.solve()).
+        """
+        self.all_goals = all_goals
+        self.keep_tree = keep_tree
+        self.complete_tree = complete_tree
+        self.beam_width = beam_width
+        self.node_limit = node_limit
+        self.goal_on_generate = goal_on_generate
+        self.first_goal = None
+        self.goals_left = None
+        self.checkpoint_path = None
+        self._every = None
+        self._interval = None
+        self._last_expanded = 0
+        self._last_time = 0.0
+
+    def options(self) -> dict:
+        """
+        Returns search options, as keyword arguments of __init__().
 
         Returns:
-            list: A list of actions available from this node. If no actions are
-            available, an empty list should be returned.
+            dict: Options by name.
+        """
+        return {'all_goals': self.all_goals, 'keep_tree': self.keep_tree,
+                'complete_tree': self.complete_tree, 'beam_width': self.beam_width,
+                'node_limit': self.node_limit, 'goal_on_generate': self.goal_on_generate}
 
-            Example: If your search problem is to find a path in a maze,
-            this method should return all valid moves (e.g., 'up', 'down',
-            'left', 'right') that can be taken from the current state.
+    def set_checkpoints(self, path: Optional[str], every: Optional[int] = None,
+                        interval: Optional[float] = None, expanded: int = 0) -> None:
+        """
+        Sets automatic checkpoints.
+
+        Args:
+            path (Optional[str]): Checkpoint file, None for no checkpoints.
+            every (Optional[int]): Expansions between checkpoints.
+            interval (Optional[float]): Seconds between checkpoints.
+            expanded (int): Nodes expanded so far.
 
         Raises:
-            NotImplementedError: If the method is not implemented by a subclass.
+            ValueError: If only one of 'path' and 'every' or 'interval' is
+                given.
         """
+        if (path is None) != (not (every or interval)):
+            raise ValueError("Automatic checkpoints need checkpoint_path, "
+                             "and checkpoint_every or checkpoint_interval")
+        self.checkpoint_path = path
+        self._every = every
+        self._interval = interval
+        self._last_expanded = expanded
+        self._last_time = time.monotonic()
+
+    def checkpoint_due(self, expanded: int) -> bool:
+        """
+        Checks if an automatic checkpoint is due, and if so, restarts the
+        expansions and time counts.
 
-        pass
+        Args:
+            expanded (int): Nodes expanded so far.
 
-    @abstractmethod
-    def result(self, action: object, search_problem: SearchProblem) -> 'Node':
+        Returns:
+            bool: True if a checkpoint must be saved now.
         """
-        Return the resulting node from performing the given action.
+        due = self._every is not None and expanded - self._last_expanded >= self._every
+        if not due and self._interval is not None:
+            due = time.monotonic() - self._last_time >= self._interval
+        if due:
+            self._last_expanded = expanded
+            self._last_time = time.monotonic()
+        return due
 
-        Note:
-            This method MUST be implemented in a subclass.
 
-        Args:
-            action (object): The action to be performed.
-            search_problem (SearchProblem): The problem being solved.
+class SearchStats:
+    """
+    Counters and per phase wall times of a search run.
 
-        Returns:
-            Node: The resulting node after 'action' is performed.
+    Counters are cheap and always collected. Phase times are only collected
+    if 'timed' is True, and peak memory only if 'trace_memory' is True.
 
-            Example: returns node representing new position in a maze after a
-            movement ('action') provided by 'actions()'
+    Search phases are:
+
+        goal_test   Testing if extracted nodes are the goal.
+        expand      Generating children (actions(), result() and step_cost()).
+        membership  Checking if children are already in frontier or explored
+                    nodes, and adding new ones to the frontier.
+        frontier    Extracting nodes from the frontier.
+        observers   Notifying search events to observers (e.g. copying and
+                    recording algorithm steps).
 
+    Attributes:
+        timed (bool): If True, phase times are measured.
+        trace_memory (bool): If True, peak memory is measured.
+        phase_times (dict): Wall time in seconds of each search phase.
+        total_time (float): Wall time in seconds of the whole search.
+        expanded (int): Number of nodes expanded.
+        generated (int): Number of child nodes generated by expansions.
+        duplicates (int): Generated nodes discarded for being already in the
+            frontier or explored nodes.
+        nodes_built (int): Child nodes built by the search loop of solve():
+            every generated child, unless the node class provides
+            Node.successors(), so duplicate states are discarded unbuilt.
+        pruned (int): Frontier nodes evicted by memory bounded algorithms.
+        peak_frontier (int): Maximum number of nodes in the frontier.
+        peak_explored (int): Maximum number of explored nodes.
+        peak_memory (Optional[int]): Peak memory allocated during the search,
+            in bytes, if traced. If tracemalloc was already tracing, before
+            Python 3.9 (no tracemalloc.reset_peak()) it is the peak since
+            tracing started.
+        previous_time (float): Wall time in seconds of the search before it
+            was resumed from a checkpoint (included in 'total_time').
+        bytes_written (int): Bytes written to disk by external memory search.
+        bytes_read (int): Bytes read from disk by external memory search.
+        levels (list): Number of states and wall time in seconds (expansion
+            and duplicate removal) of each level, for external memory search.
+        worker_expanded (list): Number of nodes expanded by each worker, for
+            parallel search.
+        improvements (list): Seconds since the search started, solution
+            cost, heuristic weight and suboptimality bound of each improved
+            solution, for anytime search.
+    """
+
+    COUNTERS = ('expanded', 'generated', 'duplicates', 'nodes_built', 'pruned',
+                'peak_frontier', 'peak_explored', 'total_time')
+
+    PHASES = ('goal_test', 'expand', 'membership', 'frontier', 'observers')
+
+    def __init__(self, timed: bool = False, trace_memory: bool = False) -> None:
         """
-        pass
+        Initializes the SearchStats object with zeroed counters.
 
-    def node_action(self) -> Optional[object]:
+        Args:
+            timed (bool): If True, phase times are measured. Default is False.
+            trace_memory (bool): If True, peak memory is measured with
+                tracemalloc. Default is False.
         """
-        Returns the action that was taken to reach this node from its parent.
+        self.timed = timed
+        self.trace_memory = trace_memory
+        self.phase_times = dict.fromkeys(self.PHASES, 0.0)
+        self.total_time = 0.0
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.nodes_built = 0
+        self.pruned = 0
+        self.peak_frontier = 0
+        self.peak_explored = 0
+        self.peak_memory = None
+        self.previous_time = 0.0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.levels = []
+        self.worker_expanded = []
+        self.improvements = []
+        self._start_time = None
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        """
+        Starts measuring search wall time and, if requested, memory.
 
         Returns:
-            Optional[object]: The action that was taken to reach this node.
+            None
         """
-        return self.action
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                if hasattr(tracemalloc, 'reset_peak'):     # Python 3.9+
+                    tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._started_tracemalloc = True
+        self._start_time = time.perf_counter()
+
+    def stop(self, explored_size: int = 0) -> None:
+        """
+        Stops measuring search wall time and memory.
 
-    def node_state(self) -> Optional[object]:
+        Args:
+            explored_size (int): Number of explored nodes at the end of the
+                search.
+
+        Returns:
+            None
         """
-        Returns the state represented by this node.
+        self.total_time = self.previous_time + time.perf_counter() - self._start_time
+        self.peak_explored = max(self.peak_explored, explored_size)
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def counters(self) -> dict:
+        """
+        Returns current counters, to be saved in a search checkpoint.
 
         Returns:
-            Optional[object]: The state represented by this node.
+            dict: Counter values by name (see COUNTERS). 'total_time' is
+            the wall time elapsed up to now.
         """
-        return self.state
+        counters = {name: getattr(self, name) for name in self.COUNTERS}
+        if self._start_time is not None:
+            counters['total_time'] = \
+                self.previous_time + time.perf_counter() - self._start_time
+        return counters
 
-    def expand(self, search_problem: SearchProblem) -> List['Node']:
+    def restore_counters(self, counters: dict) -> None:
+        """
+        Restores counters saved by counters(), to resume a search.
+
+        Args:
+            counters (dict): Counter values by name.
+        """
+        for name in self.COUNTERS:
+            setattr(self, name, counters.get(name, 0))
+        self.previous_time = counters['total_time']
+
+    def lap(self, phase: str, since: float) -> float:
+        """
+        Adds time elapsed since 'since' to 'phase'.
+
+        Args:
+            phase (str): Search phase name (see PHASES).
+            since (float): time.perf_counter() value when phase started.
+
+        Returns:
+            float: Current time.perf_counter() value, so it can be used as
+            start of next phase.
+        """
+        now = time.perf_counter()
+        self.phase_times[phase] += now - since
+        return now
+
+    def summary_lines(self) -> List[str]:
+        """
+        Returns a human readable summary of the statistics.
+
+        Returns:
+            list: Summary lines (str).
+        """
+        lines = [
+            f"- Search time: {self.total_time:.6f} s",
+            f"- Expanded / generated / duplicate nodes: "
+            f"{self.expanded} / {self.generated} / {self.duplicates}",
+            f"- Peak frontier / explored sizes: "
+            f"{self.peak_frontier} / {self.peak_explored}",
+        ]
+        if 0 < self.nodes_built < self.generated:
+            lines.append(f"- Child nodes built: {self.nodes_built} "
+                         f"({self.generated - self.nodes_built} duplicate states not built)")
+        if self.pruned:
+            lines.append(f"- Pruned nodes: {self.pruned}")
+        if self.worker_expanded:
+            lines.append("- Expanded nodes per worker: "
+                         + " / ".join(str(expanded) for expanded in self.worker_expanded))
+        if self.improvements:
+            seconds, cost, _, bound = self.improvements[-1]
+            lines.append(f"- Improved solutions: {len(self.improvements)} (last one at "
+                         f"{seconds:.6f} s, cost {cost}, suboptimality bound {bound:.3f})")
+        if self.levels:
+            lines.append(f"- Levels / disk written / read: {len(self.levels)} / "
+                         f"{self.bytes_written / 1024:.1f} KiB / "
+                         f"{self.bytes_read / 1024:.1f} KiB")
+        if self.timed:
+            lines += [f"    {phase:<11} {seconds:.6f} s"
+                      for phase, seconds in self.phase_times.items()]
+        if self.peak_memory is not None:
+            lines.append(f"- Peak memory: {self.peak_memory / 1024:.1f} KiB")
+        return lines
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the statistics.
+
+        Returns:
+            str: The statistics summary, one line per item.
+        """
+        return "\n".join(self.summary_lines())
+
+
+class SearchTree:
+    """
+    Parent map of a search run, rooted at its start state.
+
+    States are interned to consecutive integer ids, and parent ids and depths
+    are kept in compact arrays (no Node objects are referenced), so the tree
+    outlives the search run at a small memory cost. Path queries only walk
+    parent ids back to the root.
+
+    For BFS, paths are shortest paths (in number of actions) to every state
+    reached, and for UCS, cheapest paths (in path cost) to every explored
+    state. For DFS, they are just the paths the search found.
+
+    Attributes:
+        root (object): Start state.
+        complete (bool): True if every state reachable from the root was
+            explored, so states not in the tree are unreachable.
+    """
+
+    def __init__(self, root: 'Node', nodes: Iterable['Node'],
+                 complete: bool = False) -> None:
+        """
+        Builds the tree from the nodes of a search run.
+
+        Args:
+            root (Node): Start node.
+            nodes (Iterable[Node]): Nodes reached by the search (explored and
+                frontier nodes). Their ancestors must be included too.
+            complete (bool): True if the search explored every reachable state.
+        """
+        self.root = root.state
+        self.complete = complete
+        self._ids = {root.state: 0}
+        self._states = [root.state]
+        node_parents = [None]
+        for node in nodes:
+            if node.state not in self._ids:
+                self._ids[node.state] = len(self._states)
+                self._states.append(node.state)
+                node_parents.append(node.parent.state)
+        self._parents = array('l', [-1])
+        self._parents.extend(self._ids[state] for state in node_parents[1:])
+        self._depths = array('l', [0]) * len(self._states)
+        for state_id in range(1, len(self._states)):
+            self._set_depth(state_id)
+
+    def _set_depth(self, state_id: int) -> None:
+        """
+        Sets depth of a state and its ancestors not set yet.
+
+        Args:
+            state_id (int): Id of the state.
+        """
+        pending = []
+        while state_id and not self._depths[state_id]:
+            pending.append(state_id)
+            state_id = self._parents[state_id]
+        depth = self._depths[state_id]
+        for state_id in reversed(pending):
+            depth += 1
+            self._depths[state_id] = depth
+
+    def __len__(self) -> int:
+        """
+        Returns the number of states in the tree.
+
+        Returns:
+            int: Number of states reached, including the root.
+        """
+        return len(self._states)
+
+    def __contains__(self, state: object) -> bool:
+        """
+        Checks if 'state' was reached by the search.
+
+        Args:
+            state (object): The state to check.
+
+        Returns:
+            bool: True if 'state' is in the tree.
+        """
+        return state in self._ids
+
+    def path_to(self, state: object) -> Optional[List[object]]:
+        """
+        Returns the path from the root to 'state'.
+
+        Args:
+            state (object): The state to reach.
+
+        Returns:
+            Optional[list]: States from root to 'state' (both included), or
+            None if 'state' is not in the tree.
+        """
+        state_id = self._ids.get(state)
+        if state_id is None:
+            return None
+        path = []
+        while state_id != -1:
+            path.append(self._states[state_id])
+            state_id = self._parents[state_id]
+        path.reverse()
+        return path
+
+    def distance_to(self, state: object) -> Optional[int]:
+        """
+        Returns the number of actions from the root to 'state'.
+
+        Args:
+            state (object): The state to reach.
+
+        Returns:
+            Optional[int]: Depth of 'state', or None if it is not in the tree.
+        """
+        state_id = self._ids.get(state)
+        return None if state_id is None else self._depths[state_id]
+
+
+class Node(ABC):
+    """Represents a node in the search tree.
+
+    Derived classes need to override actions() and result() methods to include
+    problem-specific logic. __init__() is likely to be overridden as well.
+
+
+    Attributes:
+        state (Optional[object]): The state represented by this node.
+        parent (Optional[Node]): The parent node from which this node was generated.
+        action (Optional[object]): The action taken to reach this node from its parent.
+        path_cost (float): Cost of the path from the start node to this node
+            (only computed by cost aware algorithms, e.g. 'UCS').
+    """
+
+    def __init__(self, state: Optional[object] = None,
+                 parent: Optional['Node'] = None,
+                 action: Optional[object] = None) -> None:
+        """
+        Initialize a Node object in the search tree.
+
+        Args:
+            state (Optional[object]): The state represented by this node.
+                Default is None.
+            parent (Optional[Node]): The parent node from which this node was
+                generated. Default is None.
+            action (Optional[object]): The action that was taken to reach
+                this node from its parent. Default is None.
+
+        Returns:
+            None
+
+        Note:
+            This method MAY be overridden. Redefined method in subclass:
+
+            - MUST call `super().__init__()` (generally as first statement)
+            - MAY define other attributes relevant to the specific search
+              problem, if needed by actions() or result() methods
+
+        """
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.path_cost = 0
+
+    @abstractmethod
+    def actions(self, search_problem: SearchProblem) -> Iterable[object]:
+        """
+        Return a list of valid actions for this node.
+
+        Note:
+            This method MUST be implemented in a subclass. It MAY be a
+            generator, yielding actions on demand: searches stop asking for
+            actions once they have seen enough children (see
+            iter_children()).
+
+        Args:
+            search_problem (SearchProblem): The problem being solved, which
+                provides the context and constraints for determining valid
+                actions.
+
+        Returns:
+            Iterable: Actions available from this node (a list, or any
+            iterable). If no actions are available, an empty list should be
+            returned.
+
+            Example: If your search problem is to find a path in a maze,
+            this method should return all valid moves (e.g., 'up', 'down',
+            'left', 'right') that can be taken from the current state.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by a subclass.
+        """
+
+        pass
+
+    @abstractmethod
+    def result(self, action: object, search_problem: SearchProblem) -> 'Node':
+        """
+        Return the resulting node from performing the given action.
+
+        Note:
+            This method MUST be implemented in a subclass.
+
+        Args:
+            action (object): The action to be performed.
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            Node: The resulting node after 'action' is performed.
+
+            Example: returns node representing new position in a maze after a
+            movement ('action') provided by 'actions()'
+
+        """
+        pass
+
+    @classmethod
+    def state_index(cls, state: object, search_problem: SearchProblem) -> Optional[int]:
+        """
+        Maps a state to a dense non negative integer.
+
+        If implemented, solve() keeps explored and frontier membership as
+        bits of a bytearray indexed by this integer, instead of hashing nodes
+        into sets (1 bit instead of a set entry per state). Different states
+        MUST map to different integers, and the integers should be dense
+        (e.g. cell number in a grid), as the bit array is as long as the
+        largest index.
+
+        Args:
+            state (object): The state to map.
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            Optional[int]: Index of 'state'. Default is None (no mapping).
+
+        Note:
+            This method MAY be overridden.
+        """
+        return None
+
+    @classmethod
+    def canonical_state(cls, state: object, search_problem: SearchProblem) -> object:
+        """
+        Maps a state to the representative of its equivalence class (e.g.
+        the smallest of its rotations and reflections).
+
+        If implemented, solve() detects duplicates by canonical state, so only
+        one state of each class is expanded. Nodes keep their actual states,
+        so paths are still made of concrete actions. Equivalent states MUST
+        have equivalent successors, and either all or none of them be goals.
+
+        Args:
+            state (object): The state to map.
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            object: Canonical state. Default is 'state' itself (no symmetry).
+
+        Note:
+            This method MAY be overridden.
+        """
+        return state
+
+    @classmethod
+    def encode_state(cls, state: object,
+                     search_problem: SearchProblem) -> Optional[Union[int, bytes]]:
+        """
+        Encodes a state as a non negative integer or as bytes, so it can be
+        written to disk by external memory search ('EXTERNAL_BFS').
+
+        Different states MUST have different codes, and decode_state() MUST
+        return the state back from its code. Every state must be encoded as
+        the same type (int or bytes).
+
+        Args:
+            state (object): The state to encode.
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            Optional[Union[int, bytes]]: Code of 'state'. Default is None (no
+            encoding, external memory search is not supported).
+
+        Note:
+            This method MAY be overridden, together with decode_state().
+        """
+        return None
+
+    @classmethod
+    def decode_state(cls, code: Union[int, bytes], search_problem: SearchProblem) -> object:
+        """
+        Decodes a state encoded by encode_state().
+
+        Args:
+            code (Union[int, bytes]): Code of the state.
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            object: The state.
+
+        Raises:
+            NotImplementedError: If encode_state() is not implemented.
+
+        Note:
+            This method MAY be overridden, together with encode_state().
+        """
+        raise NotImplementedError(f"{cls.__name__} does not decode states")
+
+    def heuristic(self, search_problem: SearchProblem) -> float:
+        """
+        Returns an estimate of the cost from this node to the nearest goal.
+
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            float: Estimated remaining cost. Default is 0 (no estimate, A*
+            behaves as UCS).
+
+        Note:
+            This method MAY be overridden, for 'ASTAR', 'BEAM' and 'SMA*'
+            algorithms. It should be admissible (never overestimate) and
+            consistent for A* solutions to be optimal.
+        """
+        return 0
+
+    def step_cost(self, search_problem: SearchProblem) -> float:
+        """
+        Returns the cost of the action that reached this node from its parent.
+
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            float: Action cost, that must not be negative. Default is 1 (every
+            action costs the same).
+
+        Note:
+            This method MAY be overridden, for problems whose actions have
+            different costs (see 'UCS' algorithm in SearchProblem.solve()).
+        """
+        return 1
+
+    def node_action(self) -> Optional[object]:
+        """
+        Returns the action that was taken to reach this node from its parent.
+
+        Returns:
+            Optional[object]: The action that was taken to reach this node.
+        """
+        return self.action
+
+    def node_state(self) -> Optional[object]:
+        """
+        Returns the state represented by this node.
+
+        Returns:
+            Optional[object]: The state represented by this node.
+        """
+        return self.state
+
+    def expand(self, search_problem: SearchProblem) -> List['Node']:
         """
         Expands the current node by generating all possible child nodes.
 
         This method uses the node's actions() method to get valid actions
         and result() method to generate child nodes for each action.
 
+        Note:
+            This method MAY be overridden, returning a list or any iterable
+            of children (e.g. as a generator). Searches call
+            iter_children(), that uses it if overridden.
+
+        Args:
+            search_problem (SearchProblem): The search problem instance
+                providing the context for expanding this node.
+
+        Returns:
+            list: A list of child Node objects resulting from applying all
+                valid actions to the current node.
+        """
+        child_nodes = []
+        valid_actions = self.actions(search_problem)
+        for action in valid_actions:
+            expanded = self.result(action, search_problem)
+            child_nodes.append(expanded)
+        return child_nodes
+
+    def iter_children(self, search_problem: SearchProblem) -> Iterator['Node']:
+        """
+        Generates child nodes on demand, as searches consume them.
+
+        Each child is built by result() when the search asks for it, from
+        actions() (that may be a generator too), so a search that stops
+        early (e.g. at a goal child, see SearchProblem.solve()
+        'goal_on_generate') neither asks for the remaining actions nor
+        builds the remaining children. Subclasses overriding expand() get
+        their children from it instead.
+
+        Note:
+            This method MAY be overridden, as a generator of child nodes.
+
+        Args:
+            search_problem (SearchProblem): The search problem instance
+                providing the context for expanding this node.
+
+        Yields:
+            Node: Child nodes, in actions() order.
+        """
+        if type(self).expand is not Node.expand:
+            yield from self.expand(search_problem)
+            return
+        for action in self.actions(search_problem):
+            yield self.result(action, search_problem)
+
+    def successors(self, search_problem: SearchProblem) -> Optional[Iterable[tuple]]:
+        """
+        Returns the successor states of this node, without building nodes.
+
+        Optional hook, for problems where most children are duplicates:
+        solve() then checks each successor state against the frontier and
+        explored nodes, and only builds a node (as
+        node_class(state=state, parent=self, action=action)) for states it
+        admits, instead of building every child with result() and
+        discarding duplicates. Goals are tested on states too.
+
+        It is used when no observer is attached (observers are notified of
+        every child node), and children must be the same as iter_children()
+        ones, in the same order.
+
+        Note:
+            This method MAY be overridden, as a generator, if result() only
+            sets the node state, parent and action. Subclasses of a node
+            class implementing it, that override actions() or result(), must
+            override it too (returning None uses iter_children() again).
+
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+
+        Returns:
+            Optional[Iterable]: (action, state) of each child, or None
+            (default) to get child nodes from iter_children().
+        """
+        return None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self.state == other.state
+
+    def __hash__(self) -> int:
+        return hash(self.state)
+
+
+class GraphProblem(SearchProblem):
+    """
+    Explicit graph search problem, stored as compressed sparse row (CSR)
+    adjacency arrays.
+
+    States are vertex numbers, from 0 to 'vertices' - 1. Edges leaving
+    vertex v are numbered from offsets[v] to offsets[v + 1] - 1: edge e leads
+    to vertex targets[e] and costs weights[e] (1 if there are no weights).
+
+    BFS, DFS, UCS and A* run on plain integers (see solve()): visited
+    vertices, parent edges and path costs are kept in arrays indexed by
+    vertex, and only the solution path is built as GraphNode nodes. Other
+    algorithms and options run the generic node based search, with GraphNode
+    nodes whose actions are edge numbers.
+
+    Attributes:
+        vertices (int): Number of vertices.
+        offsets (array): First edge number of each vertex ('vertices' + 1
+            items, the last one is the number of edges).
+        targets (array): Target vertex of each edge.
+        weights (Optional[array]): Cost of each edge, or None if every edge
+            costs 1.
+        heuristics (Optional[array]): Estimated cost from each vertex to the
+            nearest goal, for A*, or None (no estimate).
+    """
+
+    def __init__(self, offsets: Iterable[int], targets: Iterable[int], start: int,
+                 goals: Iterable[int], weights: Optional[Iterable[float]] = None,
+                 heuristics: Optional[Iterable[float]] = None) -> None:
+        """
+        Initializes the GraphProblem object from CSR arrays.
+
+        Args:
+            offsets (Iterable[int]): First edge number of each vertex, and
+                number of edges.
+            targets (Iterable[int]): Target vertex of each edge.
+            start (int): Start vertex.
+            goals (Iterable[int]): Goal vertices, at least one.
+            weights (Optional[Iterable[float]]): Cost of each edge, not
+                negative. Default is None (every edge costs 1).
+            heuristics (Optional[Iterable[float]]): Estimated cost from each
+                vertex to the nearest goal. It should be admissible and
+                consistent for A* solutions to be optimal. Default is None.
+
+        Raises:
+            ValueError: If arrays are not consistent, start or goals are not
+                vertices, or there is no goal.
+        """
+        super().__init__()
+        self.offsets = _number_array(offsets)
+        self.targets = _number_array(targets)
+        self.weights = None if weights is None else _number_array(weights)
+        self.heuristics = None if heuristics is None else _number_array(heuristics)
+        self.vertices = len(self.offsets) - 1
+        if self.vertices < 1 or self.offsets[0] != 0 \
+                or self.offsets[-1] != len(self.targets) \
+                or any(first > last for first, last in zip(self.offsets, self.offsets[1:])):
+            raise ValueError("offsets must grow from 0 to the number of edges")
+        if self.targets and not 0 <= min(self.targets) <= max(self.targets) < self.vertices:
+            raise ValueError("Edge targets must be vertices")
+        if self.weights is not None and (len(self.weights) != len(self.targets)
+                                         or (self.weights and min(self.weights) < 0)):
+            raise ValueError("weights must be one non negative cost per edge")
+        if self.heuristics is not None and len(self.heuristics) != self.vertices:
+            raise ValueError("heuristics must be one estimate per vertex")
+        goals = set(goals)
+        if not goals:
+            raise ValueError("At least one goal vertex is required")
+        if not all(0 <= vertex < self.vertices for vertex in chain([start], goals)):
+            raise ValueError("start and goals must be vertices")
+        self.start_node = GraphNode(state=start)
+        self.goal_node = GraphNode(state=min(goals))
+        self.goal_states = goals
+
+    @classmethod
+    def from_edges(cls, vertices: int, edges: Iterable[tuple], start: int,
+                   goals: Iterable[int], directed: bool = True,
+                   heuristics: Optional[Iterable[float]] = None) -> 'GraphProblem':
+        """
+        Builds a GraphProblem from an edge list.
+
+        Edges leaving each vertex keep their order in the list.
+
+        Args:
+            vertices (int): Number of vertices.
+            edges (Iterable[tuple]): (source, target) or (source, target,
+                cost) tuples, all of the same length.
+            start (int): Start vertex.
+            goals (Iterable[int]): Goal vertices, at least one.
+            directed (bool): If False, every edge is added in both
+                directions. Default is True.
+            heuristics (Optional[Iterable[float]]): Estimated cost from each
+                vertex to the nearest goal. Default is None.
+
+        Returns:
+            GraphProblem: The graph problem.
+
+        Raises:
+            ValueError: If edges, start or goals are not valid (see
+                __init__()).
+        """
+        edges = list(edges)
+        if not directed:
+            edges += [(edge[1], edge[0]) + tuple(edge[2:]) for edge in edges]
+        weighted = bool(edges) and len(edges[0]) > 2
+        offsets = array('l', [0]) * (vertices + 1)
+        for edge in edges:
+            if not 0 <= edge[0] < vertices:
+                raise ValueError(f"Edge source is not a vertex: {edge}")
+            offsets[edge[0] + 1] += 1
+        for vertex in range(vertices):
+            offsets[vertex + 1] += offsets[vertex]
+        slots = offsets[:-1]
+        targets = array('l', [0]) * len(edges)
+        weights = [0] * len(edges) if weighted else None
+        for edge in edges:
+            slot = slots[edge[0]]
+            slots[edge[0]] = slot + 1
+            targets[slot] = edge[1]
+            if weighted:
+                weights[slot] = edge[2]
+        return cls(offsets, targets, start, goals, weights, heuristics)
+
+    def solve(self, search_algorithm: str = 'BFS', timed: bool = False,
+              trace_memory: bool = False,
+              observers: Optional[List['SearchObserver']] = None,
+              **options) -> 'SearchResult':
+        """
+        Solves the graph problem.
+
+        BFS, DFS, UCS and ASTAR run on vertex numbers and arrays, unless
+        observers or other options are given: they then run, like any other
+        algorithm, the generic search of SearchProblem.solve(). Vertex
+        searches find the same solutions as generic ones, but do not
+        record an algorithm log ('frontier' and 'explored_nodes' stay
+        empty) nor phase times ('timed' only measures total time).
+
+        Args:
+            search_algorithm (str): The search strategy to use (see
+                SearchProblem.solve()).
+            timed (bool): If True, measures wall time.
+            trace_memory (bool): If True, measures peak memory.
+            observers (Optional[List[SearchObserver]]): Observers notified of
+                search events, by the generic search. Default is None (no
+                observers, on vertex searches).
+            **options: Other `SearchProblem.solve()` options.
+
+        Returns:
+            SearchResult: Result of the run, true if a solution is found.
+
+        Raises:
+            ValueError: If search_algorithm or options are not valid.
+        """
+        if observers or any(value is not None and value is not False
+                            for value in options.values()) \
+                or search_algorithm not in ('BFS', 'DFS', 'UCS', 'ASTAR'):
+            return super().solve(search_algorithm, timed, trace_memory, observers, **options)
+        return self._solve_vertices(search_algorithm, timed, trace_memory)
+
+    @search_run
+    def _solve_vertices(self, search_algorithm: str, timed: bool = False,
+                        trace_memory: bool = False) -> bool:
+        """
+        Runs BFS, DFS, UCS or A* on vertex numbers (see solve()).
+
+        Args:
+            search_algorithm (str): 'BFS', 'DFS', 'UCS' or 'ASTAR'.
+            timed (bool): If True, measures wall time.
+            trace_memory (bool): If True, measures peak memory.
+
+        Returns:
+            SearchResult: Result of the run, true if a solution is found.
+        """
+        self._initialize_search_components()
+        self.algorithm = search_algorithm
+        self.stats = SearchStats(timed=timed, trace_memory=trace_memory)
+        self.stats.start()
+        try:
+            if search_algorithm in ('BFS', 'DFS'):
+                goal, parent_edges = self._vertex_search(search_algorithm == 'BFS')
+            else:
+                goal, parent_edges = self._vertex_cost_search(search_algorithm == 'ASTAR')
+            solved = goal is not None
+            if solved:
+                self.solution.build(self._vertex_path(goal, parent_edges,
+                                                      search_algorithm in ('UCS', 'ASTAR')))
+            else:
+                self.solution = None
+        finally:
+            self.stats.stop(explored_size=self.stats.expanded)
+        self.optimal = solved and search_algorithm != 'DFS'
+        return solved
+
+    def _vertex_search(self, breadth_first: bool) -> tuple:
+        """
+        Runs BFS or DFS on vertex numbers.
+
+        Vertices are marked as reached when generated, so each one enters
+        the frontier once, as in the generic search (frontier or explored).
+
+        Args:
+            breadth_first (bool): True for BFS, False for DFS.
+
+        Returns:
+            tuple: Goal vertex found (None if not found), and parent edge of
+            each reached vertex (array).
+        """
+        offsets, targets = self.offsets, self.targets
+        is_goal = bytearray(self.vertices)
+        for vertex in self.goal_states:
+            is_goal[vertex] = 1
+        reached = bytearray(self.vertices)
+        parent_edges = array('l', [-1]) * self.vertices
+        start = self.start_node.state
+        reached[start] = 1
+        frontier = array('l', [start])
+        head = 0
+        expanded = generated = duplicates = 0
+        peak_frontier = 1
+        goal = None
+        while len(frontier) > head:
+            if breadth_first:
+                vertex = frontier[head]
+                head += 1
+            else:
+                vertex = frontier.pop()
+            if is_goal[vertex]:
+                goal = vertex
+                break
+            expanded += 1
+            first, last = offsets[vertex], offsets[vertex + 1]
+            generated += last - first
+            for edge in range(first, last):
+                target = targets[edge]
+                if reached[target]:
+                    duplicates += 1
+                    continue
+                reached[target] = 1
+                parent_edges[target] = edge
+                frontier.append(target)
+            if len(frontier) - head > peak_frontier:
+                peak_frontier = len(frontier) - head
+        stats = self.stats
+        stats.expanded, stats.generated, stats.duplicates = expanded, generated, duplicates
+        stats.peak_frontier = peak_frontier
+        return goal, parent_edges
+
+    def _vertex_cost_search(self, informed: bool) -> tuple:
+        """
+        Runs UCS or A* on vertex numbers.
+
+        The frontier is a heap of (estimated cost, vertex) entries; entries
+        of vertices reached again through a cheaper path are left stale in
+        the heap and skipped when extracted.
+
+        Args:
+            informed (bool): True for A* (uses 'heuristics'), False for UCS.
+
+        Returns:
+            tuple: Goal vertex found (None if not found), and parent edge of
+            each reached vertex (array).
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        estimates = self.heuristics if informed else None
+        is_goal = bytearray(self.vertices)
+        for vertex in self.goal_states:
+            is_goal[vertex] = 1
+        closed = bytearray(self.vertices)
+        parent_edges = array('l', [-1]) * self.vertices
+        costs = array('d', [float('inf')]) * self.vertices
+        start = self.start_node.state
+        costs[start] = 0
+        frontier = [(estimates[start] if estimates is not None else 0, start)]
+        expanded = generated = duplicates = 0
+        peak_frontier = 1
+        goal = None
+        while frontier:
+            _, vertex = heapq.heappop(frontier)
+            if closed[vertex]:
+                continue    # Stale entry: a cheaper path was pushed later
+            if is_goal[vertex]:
+                goal = vertex
+                break
+            closed[vertex] = 1
+            expanded += 1
+            path_cost = costs[vertex]
+            first, last = offsets[vertex], offsets[vertex + 1]
+            generated += last - first
+            for edge in range(first, last):
+                target = targets[edge]
+                cost = path_cost + (weights[edge] if weights is not None else 1)
+                if closed[target] or cost >= costs[target]:
+                    duplicates += 1
+                    continue
+                costs[target] = cost
+                parent_edges[target] = edge
+                heapq.heappush(frontier, (cost + estimates[target] if estimates is not None
+                                          else cost, target))
+            if len(frontier) > peak_frontier:
+                peak_frontier = len(frontier)
+        stats = self.stats
+        stats.expanded, stats.generated, stats.duplicates = expanded, generated, duplicates
+        stats.peak_frontier = peak_frontier
+        return goal, parent_edges
+
+    def _vertex_path(self, goal: int, parent_edges: array, weighted: bool) -> 'GraphNode':
+        """
+        Builds the nodes of the path to 'goal' from parent edges.
+
+        Args:
+            goal (int): Goal vertex.
+            parent_edges (array): Parent edge of each reached vertex.
+            weighted (bool): If True, path costs of nodes are set.
+
+        Returns:
+            GraphNode: Goal node, whose parents chain leads to the start node.
+        """
+        path = []
+        vertex = goal
+        while vertex != self.start_node.state:
+            edge = parent_edges[vertex]
+            path.append((vertex, edge))
+            vertex = bisect_right(self.offsets, edge) - 1   # Source of the edge
+        node = self.start_node
+        for vertex, edge in reversed(path):
+            child = GraphNode(state=vertex, parent=node, action=edge)
+            if weighted:
+                child.path_cost = node.path_cost + child.step_cost(self)
+            node = child
+        return node
+
+
+class GraphNode(Node):
+    """
+    Represents a vertex of a GraphProblem.
+
+    Actions are the numbers of the edges leaving the vertex.
+    """
+
+    def actions(self, search_problem: GraphProblem) -> range:
+        """
+        Returns the numbers of the edges leaving this vertex.
+
+        Args:
+            search_problem (GraphProblem): The graph being searched.
+
+        Returns:
+            range: Edge numbers.
+        """
+        return range(search_problem.offsets[self.state], search_problem.offsets[self.state + 1])
+
+    def result(self, action: int, search_problem: GraphProblem) -> 'GraphNode':
+        """
+        Returns the node of the vertex edge 'action' leads to.
+
+        Args:
+            action (int): Edge number.
+            search_problem (GraphProblem): The graph being searched.
+
+        Returns:
+            GraphNode: The target vertex node.
+        """
+        return GraphNode(state=search_problem.targets[action], parent=self, action=action)
+
+    def successors(self, search_problem: GraphProblem) -> Iterator[tuple]:
+        """
+        Yields (edge number, target vertex) of each edge leaving this vertex
+        (see Node.successors()).
+        """
+        targets = search_problem.targets
+        for edge in range(search_problem.offsets[self.state],
+                          search_problem.offsets[self.state + 1]):
+            yield edge, targets[edge]
+
+    @classmethod
+    def state_index(cls, state: int, search_problem: GraphProblem) -> int:
+        """
+        Returns the vertex number itself (see Node.state_index()).
+        """
+        return state
+
+    @classmethod
+    def encode_state(cls, state: int, search_problem: GraphProblem) -> int:
+        """
+        Returns the vertex number itself (see Node.encode_state()).
+        """
+        return state
+
+    @classmethod
+    def decode_state(cls, code: int, search_problem: GraphProblem) -> int:
+        """
+        Returns the vertex number itself (see Node.decode_state()).
+        """
+        return code
+
+    def heuristic(self, search_problem: GraphProblem) -> float:
+        """
+        Returns the estimate of 'heuristics' for this vertex, or 0.
+
+        Args:
+            search_problem (GraphProblem): The graph being searched.
+
+        Returns:
+            float: Estimated cost to the nearest goal.
+        """
+        if search_problem.heuristics is None:
+            return 0
+        return search_problem.heuristics[self.state]
+
+    def step_cost(self, search_problem: GraphProblem) -> float:
+        """
+        Returns the cost of the edge that reached this vertex.
+
+        Args:
+            search_problem (GraphProblem): The graph being searched.
+
+        Returns:
+            float: Edge cost (1 if the graph has no weights).
+        """
+        if search_problem.weights is None:
+            return 1
+        return search_problem.weights[self.action]
+
+
+def _number_array(values: Iterable[float]) -> array:
+    """
+    Returns 'values' as an array of integers or, if any is not an integer,
+    of floats. Arrays are returned as they are.
+
+    Args:
+        values (Iterable[float]): Numbers.
+
+    Returns:
+        array: The numbers.
+    """
+    if isinstance(values, array):
+        return values
+    values = list(values)
+    try:
+        return array('l', values)
+    except TypeError:
+        return array('d', values)
+
+
+class _NodeContainer(ABC):
+    """
+    Represents a generic container for storing nodes.
+
+    Attributes:
+        nodes (Union[List[Node], set]): The container to store nodes, which can
+            be either a list or a set, depending on the container type.
+    """
+    def __init__(self, node: Optional[Union[List[Node], set]] = None) -> None:
+        """
+        Initializes the _NodeContainer object.
+
+        Args:
+            node (Optional[Union[List[Node], set]]): The initial node or nodes
+            to be added to the container. Default is None.
+        """
+        self.nodes = node if node is not None else []
+
+    def __contains__(self, element: Union[Node, tuple]) -> bool:
+        """
+        Checks if the container contains the given element.
+
+        Args:
+            element (Union[Node, tuple]): The element to check for. Must be a
+                Node or a tuple representing a state.
+
+        Returns:
+            bool: True if the element is in the container, False otherwise.
+
+        Raises:
+            ValueError: If the element is not a Node or a tuple.
+        """
+        if isinstance(element, Node):
+            return element in self.nodes
+        elif isinstance(element, tuple):
+            return any(element == nd.state for nd in self.nodes)
+        else:
+            raise ValueError("Element must be a Node or a tuple (state)")
+
+    def __iter__(self):
+        """
+        Returns an iterator over the nodes in the container.
+
+        Returns:
+            Iterator: An iterator over the nodes in the container.
+        """
+        return iter(self.nodes)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the container.
+
+        Returns:
+            str: A string representation of the container.
+        """
+        return f"{[node.state for node in self.nodes]}"
+
+    def __len__(self) -> int:
+        """
+        Returns the number of nodes in the container.
+
+        Returns:
+            int: The number of nodes in the container.
+        """
+        return len(self.nodes)
+
+    def not_empty(self) -> bool:
+        """
+        Checks if the container is not empty.
+
+        Returns:
+            bool: True if the container is not empty, False otherwise.
+        """
+        return len(self.nodes) > 0
+
+    def copy(self) -> '_NodeContainer':
+        """
+        Creates a copy of the container.
+
+        Returns:
+            _NodeContainer: A copy of the container.
+        """
+        copied = self.__class__()  # Create a new instance of the same class
+        copied.nodes = self.nodes.copy()  # Copy the nodes
+        return copied
+
+
+class _ExploredNodes(_NodeContainer):
+    """
+    Represents the set of explored nodes in the search.
+
+    If a state key is given (see SearchProblem._state_keys()), nodes are kept
+    in exploration order and membership is checked by key (in a bit set, for
+    integer keys).
+
+    Attributes:
+        nodes (Union[set, list]): The set of nodes that have been explored
+            during the search (a list, in exploration order, if keyed).
+    """
+
+    def __init__(self, state_key: Optional[Callable[[object], object]] = None,
+                 key_set: type = set) -> None:
+        """
+        Initializes the _ExploredNodes object as an empty set.
+
+        Args:
+            state_key (Optional[Callable]): Function mapping states to their
+                duplicate detection key. Default is None (nodes are hashed).
+            key_set (type): Class of the keys container (set or _BitSet).
+        """
+        super().__init__(set() if state_key is None else [])
+        self._state_key = state_key
+        self._keys = None if state_key is None else key_set()
+
+    def __contains__(self, element: Union[Node, tuple]) -> bool:
+        """
+        Checks if the container contains the given node or state.
+
+        Args:
+            element (Union[Node, tuple]): A Node or a tuple state.
+
+        Returns:
+            bool: True if the element is in the container, False otherwise.
+        """
+        if self._keys is None:
+            return super().__contains__(element)
+        if isinstance(element, Node):
+            element = element.state
+        return self._state_key(element) in self._keys
+
+    def add_node(self, node: Node) -> None:
+        """
+        Adds a node to the explored nodes set.
+
+        Args:
+            node (Node): The node to be added.
+
+        Returns:
+            None
+        """
+        if self._keys is None:
+            self.nodes.add(node)
+        else:
+            self.nodes.append(node)
+            self._keys.add(self._state_key(node.state))
+
+
+class _Frontier(_NodeContainer):
+    """
+    Represents the frontier in a search, i.e., nodes yet to be explored.
+
+    This is an abstract class and must be subclassed to implement the extract()
+
+    If a state key is given (see SearchProblem._state_keys()), membership is
+    checked by key (in a bit set, for integer keys), instead of searching the
+    list.
+
+    Attributes:
+        nodes (list): The list of nodes in the frontier.
+        pruned (int): Number of nodes evicted from the frontier.
+        pruned_bound (Optional[float]): Lowest priority (estimated solution
+            cost) of evicted nodes, or None if no node was evicted.
+    """
+
+    def __init__(self, state_key: Optional[Callable[[object], object]] = None,
+                 key_set: type = set) -> None:
+        """
+        Initializes the _Frontier object as an empty list.
+
+        Args:
+            state_key (Optional[Callable]): Function mapping states to their
+                duplicate detection key. Default is None (nodes are compared).
+            key_set (type): Class of the keys container (set or _BitSet).
+        """
+        super().__init__(list())
+        self._state_key = state_key
+        self._keys = None if state_key is None else key_set()
+        self.pruned = 0
+        self.pruned_bound = None
+
+    def __contains__(self, element: Union[Node, tuple]) -> bool:
+        """
+        Checks if the frontier contains the given node or state.
+
+        Args:
+            element (Union[Node, tuple]): A Node or a tuple state.
+
+        Returns:
+            bool: True if the element is in the frontier, False otherwise.
+        """
+        if self._keys is None:
+            return super().__contains__(element)
+        if isinstance(element, Node):
+            element = element.state
+        return self._state_key(element) in self._keys
+
+    def add_node(self, node: Node) -> None:
+        """
+        Adds a node to the frontier.
+
+        Args:
+            node (Node): The node to be added.
+
+        Returns:
+            None
+        """
+        self.nodes.append(node)
+        if self._keys is not None:
+            self._keys.add(self._state_key(node.state))
+
+    def _extracted(self, node: Node) -> Node:
+        """
+        Updates membership keys after 'node' extraction.
+
+        Args:
+            node (Node): The extracted node.
+
+        Returns:
+            Node: The extracted node.
+        """
+        if self._keys is not None:
+            self._keys.discard(self._state_key(node.state))
+        return node
+
+    def extract(self) -> Node:
+        """
+        Extracts a node from the frontier.
+
+        Returns:
+            Node: The extracted node.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by a subclass.
+
+        Note:
+            Subclasses (_StackFrontier, _QueueFrontier) must implement this method.
+
+        """
+        raise NotImplementedError
+
+    def snapshot(self, node_ids: dict) -> dict:
+        """
+        Returns frontier contents as node indexes, for a search checkpoint.
+
+        Args:
+            node_ids (dict): Node index by node id().
+
+        Returns:
+            dict: Frontier snapshot, that restore() rebuilds the frontier from.
+        """
+        return {'nodes': array('l', (node_ids[id(node)] for node in self.nodes)),
+                'pruned': self.pruned, 'pruned_bound': self.pruned_bound}
+
+    def restore(self, snapshot: dict, nodes: List[Node]) -> None:
+        """
+        Rebuilds the frontier from a snapshot(), on an empty frontier.
+
+        Args:
+            snapshot (dict): Frontier snapshot.
+            nodes (list): Nodes by index.
+        """
+        for node_id in snapshot['nodes']:
+            self.add_node(nodes[node_id])
+        self.pruned = snapshot['pruned']
+        self.pruned_bound = snapshot['pruned_bound']
+
+    def evict(self, count: int) -> None:
+        """
+        Evicts the 'count' worst nodes from the frontier.
+
+        Args:
+            count (int): Number of nodes to evict.
+
+        Raises:
+            NotImplementedError: If the frontier does not support eviction.
+
+        Note:
+            Memory bounded frontiers (_PriorityFrontier, _BeamFrontier)
+            implement this method.
+        """
+        raise NotImplementedError
+
+    def _record_pruned(self, count: int, priority: float) -> None:
+        """
+        Accounts evicted nodes.
+
+        Args:
+            count (int): Number of nodes evicted.
+            priority (float): Lowest priority among them.
+        """
+        self.pruned += count
+        if self.pruned_bound is None or priority < self.pruned_bound:
+            self.pruned_bound = priority
+
+    def improves(self, node: Node) -> bool:  # pylint: disable=W0613
+        """
+        Checks if 'node' improves the node with the same state in the frontier.
+
+        Args:
+            node (Node): Node whose state is already in the frontier.
+
+        Returns:
+            bool: True if 'node' should replace the frontier node. Always
+            False, except for priority frontiers.
+        """
+        return False
+
+
+class _StackFrontier(_Frontier):
+    """
+    Implements a stack-based frontier (LIFO) for depth-first search (DFS).
+
+    Attributes:
+        nodes (list): The list of nodes in the stack-based frontier.
+    """
+
+    def extract(self) -> Node:
+        """
+        Extracts a node from the stack-based frontier, using Last-In-First-Out
+        (LIFO) extraction (suitable for depth-first search).
+
+        Returns:
+            Node: The extracted node.
+
+        Raises:
+            RuntimeError: If trying to extract from an empty frontier.
+        """
+        if self.not_empty():
+            return self._extracted(self.nodes.pop())
+        else:
+            raise RuntimeError("Trying to extract node from an empty frontier")
+
+
+class _QueueFrontier(_Frontier):
+    """
+    Implements a queue-based frontier (FIFO) for breadth-first search (BFS).
+
+    Attributes:
+        nodes (list): The list of nodes in the queue-based frontier.
+    """
+
+    def extract(self) -> Node:
+        """
+        Extracts a node from the queue-based frontier, using First-In-First-Out
+        (FIFO) extraction (suitable for breadth-first search).
+
+        Returns:
+            Node: The extracted node.
+
+        Raises:
+            RuntimeError: If trying to extract from an empty frontier.
+        """
+        if self.not_empty():
+            return self._extracted(self.nodes.pop(0))
+        else:
+            raise RuntimeError("Trying to extract node from an empty frontier")
+
+
+class _PriorityFrontier(_Frontier):
+    """
+    Represents a frontier that extracts the node with lowest priority first:
+    path cost (used by Uniform Cost Search) or a given priority function
+    (e.g. A* estimated solution cost).
+
+    Nodes are kept in a binary heap. A node that improves the path cost of a
+    state already in the frontier is pushed as a new entry, and the replaced
+    entry is discarded when it reaches the top of the heap.
+
+    Attributes:
+        nodes (dict): Current (cheapest) frontier node of each state (of each
+            state key, if given).
+    """
+
+    def __init__(self, state_key: Optional[Callable[[object], object]] = None,
+                 priority: Optional[Callable[[Node], float]] = None) -> None:
+        """
+        Initializes the _PriorityFrontier object as an empty heap.
+
+        Args:
+            state_key (Optional[Callable]): Function mapping states to their
+                duplicate detection key. Default is None (the state itself).
+            priority (Optional[Callable]): Function returning the priority
+                of a node. Default is None (node path cost).
+        """
+        super().__init__()
+        self.nodes = {}
+        self._state_key = state_key or (lambda state: state)
+        self._priority = priority
+        self._heap = []
+        self._push_count = 0
+
+    def __contains__(self, element: Union[Node, tuple]) -> bool:
+        """
+        Checks if the frontier contains a node with the element state.
+
+        Args:
+            element (Union[Node, tuple]): A Node or a state.
+
+        Returns:
+            bool: True if the state is in the frontier.
+        """
+        if isinstance(element, Node):
+            element = element.state
+        return self._state_key(element) in self.nodes
+
+    def __iter__(self):
+        """
+        Returns an iterator over the frontier nodes, in extraction order.
+
+        Returns:
+            Iterator: An iterator over the nodes in the frontier.
+        """
+        return (entry[2] for entry in sorted(self._heap) if self._is_current(entry[2]))
+
+    def _is_current(self, node: Node) -> bool:
+        """
+        Checks if a heap entry node is the current frontier node of its state
+        (not replaced by a cheaper node, nor extracted, nor evicted).
+
+        Args:
+            node (Node): Heap entry node.
+
+        Returns:
+            bool: True if 'node' is in the frontier.
+        """
+        return self.nodes.get(self._state_key(node.state)) is node
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the frontier.
+
+        Returns:
+            str: A string representation of the frontier.
+        """
+        return f"{[node.state for node in self]}"
+
+    def copy(self) -> _Frontier:
+        """
+        Creates a copy of the frontier nodes, in extraction order.
+
+        Returns:
+            _Frontier: A list frontier with the nodes in extraction order.
+        """
+        copied = _Frontier()
+        copied.nodes = list(self)
+        return copied
+
+    def add_node(self, node: Node) -> None:
+        """
+        Adds a node to the frontier, replacing the node with the same state,
+        if any.
+
+        Args:
+            node (Node): The node to be added.
+
+        Returns:
+            None
+        """
+        self.nodes[self._state_key(node.state)] = node
+        priority = node.path_cost if self._priority is None else self._priority(node)
+        heapq.heappush(self._heap, (priority, self._push_count, node))
+        self._push_count += 1
+
+    def snapshot(self, node_ids: dict) -> dict:
+        """
+        Returns frontier contents as node indexes, for a search checkpoint.
+
+        Args:
+            node_ids (dict): Node index by node id().
+
+        Returns:
+            dict: Current heap entries, as (priority, push count, node index).
+        """
+        return {'heap': [(entry[0], entry[1], node_ids[id(entry[2])])
+                         for entry in sorted(self._heap) if self._is_current(entry[2])],
+                'push_count': self._push_count,
+                'pruned': self.pruned, 'pruned_bound': self.pruned_bound}
+
+    def restore(self, snapshot: dict, nodes: List[Node]) -> None:
+        """
+        Rebuilds the frontier from a snapshot(), on an empty frontier.
+
+        Args:
+            snapshot (dict): Frontier snapshot.
+            nodes (list): Nodes by index.
+        """
+        self._heap = [(priority, count, nodes[node_id])
+                      for priority, count, node_id in snapshot['heap']]
+        for entry in self._heap:
+            self.nodes[self._state_key(entry[2].state)] = entry[2]
+        self._push_count = snapshot['push_count']
+        self.pruned = snapshot['pruned']
+        self.pruned_bound = snapshot['pruned_bound']
+
+    def evict(self, count: int) -> None:
+        """
+        Evicts the 'count' nodes with highest priority from the frontier.
+
+        The heap is rebuilt without them (and without replaced entries).
+
+        Args:
+            count (int): Number of nodes to evict.
+        """
+        entries = sorted(entry for entry in self._heap if self._is_current(entry[2]))
+        count = min(count, len(entries))
+        if count == 0:
+            return
+        for entry in entries[-count:]:
+            del self.nodes[self._state_key(entry[2].state)]
+        self._record_pruned(count, entries[-count][0])
+        self._heap = entries[:-count]   # a sorted list is a valid heap
+
+    def improves(self, node: Node) -> bool:
+        """
+        Checks if 'node' has a lower path cost than the frontier node with the
+        same state.
+
         Args:
-            search_problem (SearchProblem): The search problem instance
-                providing the context for expanding this node.
+            node (Node): Node whose state is already in the frontier.
 
         Returns:
-            list: A list of child Node objects resulting from applying all
-                valid actions to the current node.
+            bool: True if 'node' is cheaper.
         """
-        child_nodes = []
-        valid_actions = self.actions(search_problem)
-        for action in valid_actions:
-            expanded = self.result(action, search_problem)
-            child_nodes.append(expanded)
-        return child_nodes
+        return node.path_cost < self.nodes[self._state_key(node.state)].path_cost
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Node):
-            return NotImplemented
-        return self.state == other.state
+    def extract(self) -> Node:
+        """
+        Extracts the node with lowest priority (first added among equals).
 
-    def __hash__(self) -> int:
-        return hash(self.state)
+        Returns:
+            Node: The extracted node.
+
+        Raises:
+            RuntimeError: If the frontier is empty.
+        """
+        while self._heap:
+            node = heapq.heappop(self._heap)[2]
+            key = self._state_key(node.state)
+            if self.nodes.get(key) is node:
+                del self.nodes[key]
+                return node
+        raise RuntimeError("Trying to extract node from an empty frontier")
 
 
-class _NodeContainer(ABC):
+class _BeamFrontier(_Frontier):
     """
-    Represents a generic container for storing nodes.
+    Represents a beam search frontier: nodes are extracted level by level,
+    as in a queue, but only the 'width' best nodes (lowest priority) of each
+    level are kept.
+
+    Nodes added while extracting a level make up the next level, which is
+    truncated to 'width' nodes when the current level is exhausted.
 
     Attributes:
-        nodes (Union[List[Node], set]): The container to store nodes, which can
-            be either a list or a set, depending on the container type.
+        nodes (list): Nodes of current level, in reverse extraction order.
+        width (int): Nodes kept per level.
     """
-    def __init__(self, node: Optional[Union[List[Node], set]] = None) -> None:
+
+    def __init__(self, width: int, priority: Callable[[Node], float],
+                 state_key: Optional[Callable[[object], object]] = None,
+                 key_set: type = set) -> None:
         """
-        Initializes the _NodeContainer object.
+        Initializes the _BeamFrontier object with empty levels.
 
         Args:
-            node (Optional[Union[List[Node], set]]): The initial node or nodes
-            to be added to the container. Default is None.
+            width (int): Nodes kept per level.
+            priority (Callable): Function returning the priority of a node.
+            state_key (Optional[Callable]): Function mapping states to their
+                duplicate detection key. Default is None (the state itself).
+            key_set (type): Class of the keys container (set or _BitSet).
         """
-        self.nodes = node if node is not None else []
+        super().__init__(state_key or (lambda state: state),
+                         key_set if state_key is not None else set)
+        self.width = width
+        self._priority = priority
+        self._next_level = []   # (priority, push count, node)
+        self._push_count = 0
 
-    def __contains__(self, element: Union[Node, tuple]) -> bool:
+    def __iter__(self):
         """
-        Checks if the container contains the given element.
+        Returns an iterator over the frontier nodes, in extraction order
+        (next level nodes are not sorted yet).
+
+        Returns:
+            Iterator: An iterator over the nodes in the frontier.
+        """
+        return chain(reversed(self.nodes), (entry[2] for entry in self._next_level))
+
+    def __len__(self) -> int:
+        """
+        Returns the number of nodes in the frontier.
+
+        Returns:
+            int: Nodes in current and next levels.
+        """
+        return len(self.nodes) + len(self._next_level)
+
+    def not_empty(self) -> bool:
+        """
+        Checks if the frontier is not empty.
+
+        Returns:
+            bool: True if there are nodes in current or next levels.
+        """
+        return bool(self.nodes or self._next_level)
+
+    def copy(self) -> _Frontier:
+        """
+        Creates a copy of the frontier nodes, in extraction order.
+
+        Returns:
+            _Frontier: A list frontier with the nodes.
+        """
+        copied = _Frontier()
+        copied.nodes = list(self)
+        return copied
+
+    def add_node(self, node: Node) -> None:
+        """
+        Adds a node to the next level.
 
         Args:
-            element (Union[Node, tuple]): The element to check for. Must be a
-                Node or a tuple representing a state.
+            node (Node): The node to be added.
 
         Returns:
-            bool: True if the element is in the container, False otherwise.
+            None
+        """
+        self._next_level.append((self._priority(node), self._push_count, node))
+        self._push_count += 1
+        self._keys.add(self._state_key(node.state))
+
+    def extract(self) -> Node:
+        """
+        Extracts the best node of current level, moving to the next level if
+        current one is exhausted.
+
+        Returns:
+            Node: The extracted node.
 
         Raises:
-            ValueError: If the element is not a Node or a tuple.
+            RuntimeError: If trying to extract from an empty frontier.
         """
-        if isinstance(element, Node):
-            return element in self.nodes
-        elif isinstance(element, tuple):
-            return any(element == nd.state for nd in self.nodes)
+        if not self.nodes:
+            if not self._next_level:
+                raise RuntimeError("Trying to extract node from an empty frontier")
+            self._next_level.sort()
+            self._drop(self._next_level[self.width:])
+            self.nodes = [entry[2] for entry in reversed(self._next_level[:self.width])]
+            self._next_level = []
+        return self._extracted(self.nodes.pop())
+
+    def snapshot(self, node_ids: dict) -> dict:
+        """
+        Returns frontier contents as node indexes, for a search checkpoint.
+
+        Args:
+            node_ids (dict): Node index by node id().
+
+        Returns:
+            dict: Current level node indexes, and next level entries as
+            (priority, push count, node index).
+        """
+        return {'nodes': array('l', (node_ids[id(node)] for node in self.nodes)),
+                'next_level': [(entry[0], entry[1], node_ids[id(entry[2])])
+                               for entry in self._next_level],
+                'push_count': self._push_count,
+                'pruned': self.pruned, 'pruned_bound': self.pruned_bound}
+
+    def restore(self, snapshot: dict, nodes: List[Node]) -> None:
+        """
+        Rebuilds the frontier from a snapshot(), on an empty frontier.
+
+        Args:
+            snapshot (dict): Frontier snapshot.
+            nodes (list): Nodes by index.
+        """
+        self.nodes = [nodes[node_id] for node_id in snapshot['nodes']]
+        self._next_level = [(priority, count, nodes[node_id])
+                            for priority, count, node_id in snapshot['next_level']]
+        for node in chain(self.nodes, (entry[2] for entry in self._next_level)):
+            self._keys.add(self._state_key(node.state))
+        self._push_count = snapshot['push_count']
+        self.pruned = snapshot['pruned']
+        self.pruned_bound = snapshot['pruned_bound']
+
+    def evict(self, count: int) -> None:
+        """
+        Evicts the 'count' worst nodes: worst of next level first, then worst
+        of current level.
+
+        Args:
+            count (int): Number of nodes to evict.
+        """
+        self._next_level.sort()
+        from_next = min(count, len(self._next_level))
+        if from_next:
+            self._drop(self._next_level[-from_next:])
+            del self._next_level[-from_next:]
+        from_current = min(count - from_next, len(self.nodes))
+        if from_current:
+            dropped = self.nodes[:from_current]
+            self._drop([(self._priority(node), 0, node) for node in dropped])
+            del self.nodes[:from_current]
+
+    def _drop(self, entries: List[tuple]) -> None:
+        """
+        Forgets evicted entries, and accounts them as pruned.
+
+        Args:
+            entries (list): (priority, push count, node) entries evicted.
+        """
+        if not entries:
+            return
+        for entry in entries:
+            self._keys.discard(self._state_key(entry[2].state))
+        self._record_pruned(len(entries), min(entry[0] for entry in entries))
+
+
+class _BitSet:
+    """
+    Set of non negative integers, kept as bits of a bytearray that grows as
+    needed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the _BitSet object as an empty set.
+        """
+        self._bytes = bytearray()
+
+    def __contains__(self, number: int) -> bool:
+        """
+        Checks if 'number' is in the set.
+
+        Args:
+            number (int): The number to check.
+
+        Returns:
+            bool: True if 'number' is in the set.
+        """
+        byte = number >> 3
+        return byte < len(self._bytes) and bool(self._bytes[byte] >> (number & 7) & 1)
+
+    def add(self, number: int) -> None:
+        """
+        Adds 'number' to the set, doubling the bytearray if it is too short.
+
+        Args:
+            number (int): The number to add.
+        """
+        byte = number >> 3
+        if byte >= len(self._bytes):
+            self._bytes.extend(bytes(max(byte + 1 - len(self._bytes), len(self._bytes))))
+        self._bytes[byte] |= 1 << (number & 7)
+
+    def discard(self, number: int) -> None:
+        """
+        Removes 'number' from the set, if present.
+
+        Args:
+            number (int): The number to remove.
+        """
+        byte = number >> 3
+        if byte < len(self._bytes):
+            self._bytes[byte] &= 0xFF ^ (1 << (number & 7))
+
+
+class _ExternalLevels:
+    """
+    Disk files of external memory BFS levels (see SearchProblem.solve()).
+
+    Each level is a file of (state key, parent key) records, sorted by state
+    key and without repeated keys. Children of the level being expanded are
+    buffered, and written as sorted run files when the buffer is full, that
+    close_level() merges into the next level file.
+
+    Attributes:
+        states (int): Number of states in every level file.
+    """
+
+    MAX_MERGED_FILES = 64
+    RECORD_HEADER = struct.Struct('>HH')
+
+    def __init__(self, directory: str, buffer_size: int, stats: 'SearchStats',
+                 keep_visited: bool = True) -> None:
+        """
+        Initializes the _ExternalLevels object with no level.
+
+        Args:
+            directory (str): Directory of level and run files.
+            buffer_size (int): Maximum number of buffered records.
+            stats (SearchStats): Stats where disk I/O is accounted.
+            keep_visited (bool): If True, a file of every level keys is kept
+                up to date, to check duplicates against every previous level.
+        """
+        self.states = 0
+        self._directory = directory
+        self._buffer_size = buffer_size
+        self._stats = stats
+        self._keep_visited = keep_visited
+        self._buffer = []
+        self._runs = []
+        self._file_count = 0
+
+    def start(self, start_key: bytes) -> int:
+        """
+        Writes level 0, holding the start state only.
+
+        Args:
+            start_key (bytes): Key of the start state.
+
+        Returns:
+            int: Number of states in level 0.
+        """
+        self._write(self._level_path(0), [(start_key, b'')])
+        if self._keep_visited:
+            self._write(self._visited_path(0), [(start_key, b'')])
+        self.states = 1
+        return 1
+
+    def keys(self, level: int) -> Iterable[bytes]:
+        """
+        Reads state keys of a level, in order.
+
+        Args:
+            level (int): Level number.
+
+        Yields:
+            bytes: State key.
+        """
+        for key, _ in self._read(self._level_path(level)):
+            yield key
+
+    def add(self, key: bytes, parent_key: bytes) -> None:
+        """
+        Adds a child to the next level, writing a run file if the buffer is
+        full.
+
+        Args:
+            key (bytes): Child state key.
+            parent_key (bytes): Parent state key.
+        """
+        self._buffer.append((key, parent_key))
+        if len(self._buffer) >= self._buffer_size:
+            self._write_run()
+
+    def close_level(self, level: int, duplicate_layers: Optional[int] = None) -> int:
+        """
+        Merges run files of the children of 'level' into the next level
+        file, dropping repeated states and states in previous levels.
+
+        Args:
+            level (int): Level just expanded.
+            duplicate_layers (Optional[int]): Previous levels checked for
+                duplicates. None means every level (visited file).
+
+        Returns:
+            int: Number of states in the next level.
+        """
+        self._write_run()
+        runs = self._runs
+        self._runs = []
+        while len(runs) > self.MAX_MERGED_FILES:
+            groups = [runs[start:start + self.MAX_MERGED_FILES]
+                      for start in range(0, len(runs), self.MAX_MERGED_FILES)]
+            runs = [self._merge_files(group) for group in groups]
+        if duplicate_layers is None:
+            seen_paths = [self._visited_path(level)]
         else:
-            raise ValueError("Element must be a Node or a tuple (state)")
+            seen_paths = [self._level_path(previous)
+                          for previous in range(max(0, level + 1 - duplicate_layers), level + 1)]
+        seen = heapq.merge(*(self._read(path) for path in seen_paths))
+        seen_key = next(seen, (None,))[0]
+
+        new_records = []
+        new_runs = []
+        count = 0
+        with open(self._level_path(level + 1), 'wb') as file:
+            last_key = None
+            for key, parent_key in heapq.merge(*(self._read(path) for path in runs)):
+                if key == last_key:
+                    continue
+                last_key = key
+                while seen_key is not None and seen_key < key:
+                    seen_key = next(seen, (None,))[0]
+                if key == seen_key:
+                    continue
+                self._write_record(file, key, parent_key)
+                count += 1
+                if self._keep_visited:
+                    new_records.append((key, b''))
+                    if len(new_records) >= self._buffer_size:
+                        new_runs.append(self._write_new(new_records))
+                        new_records = []
+        seen.close()
+        for path in runs:
+            os.remove(path)
+
+        if self._keep_visited:
+            if new_records:
+                new_runs.append(self._write_new(new_records))
+            merged = self._merge_files([self._visited_path(level)] + new_runs)
+            os.replace(merged, self._visited_path(level + 1))
+        self.states += count
+        return count
+
+    def parent_key(self, level: int, key: bytes) -> bytes:
+        """
+        Looks up the parent key of a state in a level file.
+
+        Args:
+            level (int): Level of the state.
+            key (bytes): State key.
+
+        Returns:
+            bytes: Parent state key.
+
+        Raises:
+            KeyError: If the state is not in the level.
+        """
+        for record_key, parent_key in self._read(self._level_path(level)):
+            if record_key == key:
+                return parent_key
+            if record_key > key:
+                break
+        raise KeyError(key)
+
+    def _level_path(self, level: int) -> str:
+        """Path of a level file."""
+        return os.path.join(self._directory, f"level_{level}")
+
+    def _visited_path(self, level: int) -> str:
+        """Path of the file of every state key up to a level."""
+        return os.path.join(self._directory, f"visited_{level}")
+
+    def _new_path(self) -> str:
+        """Path of a new run file."""
+        self._file_count += 1
+        return os.path.join(self._directory, f"run_{self._file_count}")
+
+    def _write_run(self) -> None:
+        """Sorts buffered records and writes them to a new run file."""
+        if self._buffer:
+            self._buffer.sort()
+            self._runs.append(self._write_new(self._buffer))
+            self._buffer = []
+
+    def _write_new(self, records: List[tuple]) -> str:
+        """Writes sorted records to a new run file and returns its path."""
+        path = self._new_path()
+        self._write(path, records)
+        return path
+
+    def _merge_files(self, paths: List[str]) -> str:
+        """
+        Merges sorted files into a new run file, without repeated keys, and
+        removes them.
+
+        Args:
+            paths (list): Paths of the files to merge.
+
+        Returns:
+            str: Path of the merged file.
+        """
+        merged_path = self._new_path()
+        with open(merged_path, 'wb') as file:
+            last_key = None
+            for key, parent_key in heapq.merge(*(self._read(path) for path in paths)):
+                if key != last_key:
+                    self._write_record(file, key, parent_key)
+                    last_key = key
+        for path in paths:
+            os.remove(path)
+        return merged_path
+
+    def _write(self, path: str, records: Iterable[tuple]) -> None:
+        """Writes records to a file, skipping repeated keys."""
+        with open(path, 'wb') as file:
+            last_key = None
+            for key, parent_key in records:
+                if key != last_key:
+                    self._write_record(file, key, parent_key)
+                    last_key = key
+
+    def _write_record(self, file, key: bytes, parent_key: bytes) -> None:
+        """Writes a (key, parent key) record, accounting written bytes."""
+        record = self.RECORD_HEADER.pack(len(key), len(parent_key)) + key + parent_key
+        file.write(record)
+        self._stats.bytes_written += len(record)
+
+    def _read(self, path: str) -> Iterable[tuple]:
+        """
+        Reads the records of a file, accounting read bytes.
+
+        Args:
+            path (str): Path of the file.
+
+        Yields:
+            tuple: (key, parent key) record.
+        """
+        header_size = self.RECORD_HEADER.size
+        unpack = self.RECORD_HEADER.unpack
+        stats = self._stats
+        with open(path, 'rb', buffering=1 << 16) as file:
+            while True:
+                header = file.read(header_size)
+                if not header:
+                    return
+                key_size, parent_size = unpack(header)
+                data = file.read(key_size + parent_size)
+                stats.bytes_read += header_size + key_size + parent_size
+                yield data[:key_size], data[key_size:]
+
+
+def _state_owner(state: object, workers: int) -> int:
+    """
+    Worker owning a state in parallel search: a hash of the pickled state,
+    which is the same in every process (unlike hash() of strings).
+
+    Args:
+        state (object): The state.
+        workers (int): Number of workers.
+
+    Returns:
+        int: Owner worker number.
+    """
+    return zlib.crc32(pickle.dumps(state, protocol=4)) % workers
+
+
+def _run_parallel_worker(search_problem: SearchProblem, algorithm: str, worker: int,
+                         inboxes: list, results) -> None:
+    """
+    Process target of parallel search workers.
+
+    Args:
+        search_problem (SearchProblem): The problem being solved.
+        algorithm (str): The search algorithm, 'BFS' or 'ASTAR'.
+        worker (int): Number of this worker.
+        inboxes (list): Message queue of each worker.
+        results: Message queue of the coordinator.
+    """
+    _ParallelWorker(search_problem, algorithm, worker, inboxes, results).run()
+
+
+class _ParallelWorker:
+    """
+    Worker of parallel search (see SearchProblem.solve() 'workers'),
+    searching the states it owns.
+
+    Each owned state reached keeps its best path cost, parent state and
+    action. Open states are kept in a heap ordered by path cost plus
+    heuristic (A*) or path cost alone (BFS, as every action then counts 1),
+    and are reopened if reached again with a lower path cost. Children owned
+    by other workers are buffered and sent in batches.
+
+    Messages received: ('nodes', [(state, path cost, parent state,
+    action), ...]), ('bound', solution cost), ('probe', wave number),
+    ('parent', state) and ('stop',). Messages sent to the coordinator:
+    ('goal', cost, state), ('probe', wave number, idle, batches sent,
+    batches received), ('parent', parent state, action, path cost) and
+    ('counters', dict).
+    """
+
+    BATCH_SIZE = 256
+    POLL_EVERY = 64
+
+    def __init__(self, search_problem: SearchProblem, algorithm: str, worker: int,
+                 inboxes: list, results) -> None:
+        """
+        Initializes the _ParallelWorker object with no state reached.
+
+        The algorithm is given apart, as run attributes of the problem (see
+        SearchProblem.current_result) are not passed to spawned workers.
+
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+            algorithm (str): The search algorithm, 'BFS' or 'ASTAR'.
+            worker (int): Number of this worker.
+            inboxes (list): Message queue of each worker.
+            results: Message queue of the coordinator.
+        """
+        self.problem = search_problem
+        self.worker = worker
+        self.inboxes = inboxes
+        self.results = results
+        self.node_class = type(search_problem.start_node)
+        self.informed = algorithm == 'ASTAR'
+        self.reached = {}
+        self.heap = []
+        self.outboxes = [[] for _ in inboxes]
+        self.bound = None
+        self.sent = 0
+        self.received = 0
+        self.running = True
+        self.counters = dict.fromkeys(('expanded', 'generated', 'duplicates',
+                                       'peak_frontier', 'peak_explored'), 0)
+        self._push_count = 0
+
+    def run(self) -> None:
+        """
+        Expands open states, polling messages every POLL_EVERY expansions,
+        and waits for messages when idle, until told to stop.
+        """
+        while self.running:
+            if self._has_work():
+                for _ in range(self.POLL_EVERY):
+                    if not self._has_work():
+                        break
+                    self._expand_next()
+                self._poll(block=False)
+            else:
+                self._flush()
+                self._poll(block=True)
+        self.results.put(('counters', self.counters))
+
+    def _has_work(self) -> bool:
+        """Checks if there is an open state that may improve the best solution."""
+        return bool(self.heap) and (self.bound is None or self.heap[0][0] < self.bound)
+
+    def _expand_next(self) -> None:
+        """Extracts the best open state, goal tests it and expands it."""
+        _, _, path_cost, state = heapq.heappop(self.heap)
+        if path_cost > self.reached[state][0]:
+            return
+        problem = self.problem
+        if problem.goal_test(state):
+            if self.bound is None or path_cost < self.bound:
+                self.bound = path_cost
+                self.results.put(('goal', path_cost, state))
+            return
+        node = self.node_class(state=state)
+        child_nodes = list(node.iter_children(problem))
+        self.counters['expanded'] += 1
+        self.counters['generated'] += len(child_nodes)
+        workers = len(self.inboxes)
+        for child in child_nodes:
+            child_cost = path_cost + (child.step_cost(problem) if self.informed else 1)
+            owner = _state_owner(child.state, workers)
+            if owner == self.worker:
+                self._reach(child.state, child_cost, state, child.action)
+            else:
+                outbox = self.outboxes[owner]
+                outbox.append((child.state, child_cost, state, child.action))
+                if len(outbox) >= self.BATCH_SIZE:
+                    self._send(owner)
+
+    def _reach(self, state: object, path_cost: float, parent_state: object,
+               action: object) -> None:
+        """
+        Opens an owned state, unless it was already reached with a path cost
+        not higher, or it cannot lead to a better solution.
+
+        Args:
+            state (object): Reached state.
+            path_cost (float): Path cost to 'state'.
+            parent_state (object): State 'state' was reached from.
+            action (object): Action that reached 'state'.
+        """
+        best = self.reached.get(state)
+        if best is not None and best[0] <= path_cost:
+            self.counters['duplicates'] += 1
+            return
+        priority = path_cost
+        if self.informed:
+            priority += self.node_class(state=state).heuristic(self.problem)
+        if self.bound is not None and priority >= self.bound:
+            return
+        self.reached[state] = (path_cost, parent_state, action)
+        self._push_count += 1
+        heapq.heappush(self.heap, (priority, self._push_count, path_cost, state))
+        self.counters['peak_frontier'] = max(self.counters['peak_frontier'], len(self.heap))
+        self.counters['peak_explored'] = max(self.counters['peak_explored'], len(self.reached))
+
+    def _send(self, owner: int) -> None:
+        """Sends the buffered children of another worker."""
+        self.inboxes[owner].put(('nodes', self.outboxes[owner]))
+        self.outboxes[owner] = []
+        self.sent += 1
+
+    def _flush(self) -> None:
+        """Sends every non empty buffer of children."""
+        for owner, outbox in enumerate(self.outboxes):
+            if outbox:
+                self._send(owner)
+
+    def _poll(self, block: bool) -> None:
+        """
+        Handles received messages.
+
+        Args:
+            block (bool): If True, waits for at least one message.
+        """
+        inbox = self.inboxes[self.worker]
+        while self.running:
+            try:
+                message = inbox.get(block=block)
+            except queue.Empty:
+                return
+            block = False
+            kind = message[0]
+            if kind == 'nodes':
+                self.received += 1
+                for record in message[1]:
+                    self._reach(*record)
+            elif kind == 'bound':
+                if self.bound is None or message[1] < self.bound:
+                    self.bound = message[1]
+            elif kind == 'probe':
+                if not self._has_work():
+                    self._flush()
+                self.results.put(('probe', message[1], not self._has_work()
+                                  and not any(self.outboxes), self.sent, self.received))
+            elif kind == 'parent':
+                path_cost, parent_state, action = self.reached[message[1]]
+                self.results.put(('parent', parent_state, action, path_cost))
+            elif kind == 'stop':
+                self.running = False
+
+
+class _Solution(_NodeContainer):
+    """
+    Represents the solution path as a list of nodes.
+
+    Attributes:
+        nodes (list): The list of nodes that form the solution path.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes the _Solution object as an empty list.
+        """
+        super().__init__(list())
+
+    def build(self, goal_node: Node) -> None:
+        """
+        Builds the solution path from the goal node back to the start node.
+
+        Args:
+            goal_node (Node): The goal node from which to build the solution path.
+
+        Returns:
+            None
+        """
+        node = goal_node
+        while node is not None:
+            self.nodes.append(node)
+            node = node.parent
+        self.nodes.pop()
+        self.nodes.reverse()
+
+    def cost(self) -> float:
+        """
+        Returns the path cost of the solution, as computed by cost aware
+        algorithms (see Node.path_cost).
+
+        Returns:
+            float: Path cost of the last node, 0 for an empty solution.
+        """
+        return self.nodes[-1].path_cost if self.nodes else 0
+
+
+class SearchObserver:
+    """
+    Receives the events of a search run.
+
+    Observers are passed to SearchProblem.solve(), which notifies them of
+    each search event. Every method does nothing by default: subclasses
+    override only the events they need, so each caller pays only for what
+    it observes.
+
+    Events are notified in this order:
+
+        on_start()      Once, after the start node is added to the frontier.
+        on_extract()    For each node extracted from the frontier.
+        on_goal()       When a goal node is extracted.
+        on_improve()    When a better solution is found, after on_goal()
+                        (anytime search only).
+        on_expand()     For each extracted node that is not a goal, after it
+                        is added to explored nodes and its new children are
+                        added to the frontier. In 'all goals' mode, goal
+                        nodes are expanded too (after on_goal()).
+        on_finish()     Once, when the search ends (solved or not), also
+                        when it is stopped by an exception (not solved),
+                        so observers can release their resources.
+    """
+
+    def on_start(self, search_problem: SearchProblem) -> None:
+        """
+        Search started.
+
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+        """
 
-    def __iter__(self):
+    def on_extract(self, search_problem: SearchProblem, node: Node) -> None:
         """
-        Returns an iterator over the nodes in the container.
+        A node was extracted from the frontier.
 
-        Returns:
-            Iterator: An iterator over the nodes in the container.
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+            node (Node): The extracted node.
         """
-        return iter(self.nodes)
 
-    def __repr__(self) -> str:
+    def on_expand(self, search_problem: SearchProblem, node: Node,
+                  children: List[Node]) -> None:
         """
-        Returns a string representation of the container.
+        A node was expanded.
 
-        Returns:
-            str: A string representation of the container.
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+            node (Node): The expanded node.
+            children (List[Node]): All child nodes generated, including the
+                ones discarded for being already in frontier or explored nodes.
         """
-        return f"{[node.state for node in self.nodes]}"
 
-    def __len__(self) -> int:
+    def on_goal(self, search_problem: SearchProblem, node: Node) -> None:
         """
-        Returns the number of nodes in the container.
+        The goal node was extracted from the frontier.
 
-        Returns:
-            int: The number of nodes in the container.
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+            node (Node): The goal node.
         """
-        return len(self.nodes)
 
-    def not_empty(self) -> bool:
+    def on_improve(self, search_problem: SearchProblem, node: Node,
+                   suboptimality: float) -> None:
         """
-        Checks if the container is not empty.
+        A better solution was found, by anytime search.
 
-        Returns:
-            bool: True if the container is not empty, False otherwise.
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+            node (Node): The goal node of the solution (see Node.path_cost).
+            suboptimality (float): Bound on the solution cost over the
+                optimal cost.
         """
-        return len(self.nodes) > 0
 
-    def copy(self) -> '_NodeContainer':
+    def on_finish(self, search_problem: SearchProblem, solved: bool) -> None:
         """
-        Creates a copy of the container.
+        Search finished, or stopped by an exception (not solved).
 
-        Returns:
-            _NodeContainer: A copy of the container.
+        Args:
+            search_problem (SearchProblem): The problem solved.
+            solved (bool): True if a solution was found.
         """
-        copied = self.__class__()  # Create a new instance of the same class
-        copied.nodes = self.nodes.copy()  # Copy the nodes
-        return copied
 
 
-class _ExploredNodes(_NodeContainer):
+class NullSink(SearchObserver):
     """
-    Represents the set of explored nodes in the search.
+    Observer that ignores every event.
+
+    Useful as a placeholder where an observer is required.
+    """
+
+
+class CounterSink(SearchObserver):
+    """
+    Observer that counts search events.
 
     Attributes:
-        nodes (set): The set of nodes that have been explored during the
-            search.
+        extracted (int): Number of nodes extracted from the frontier.
+        expanded (int): Number of nodes expanded.
+        generated (int): Number of child nodes generated by expansions.
+        goals (int): Number of goal nodes found.
     """
 
     def __init__(self) -> None:
         """
-        Initializes the _ExploredNodes object as an empty set.
+        Initializes the CounterSink object with zeroed counters.
         """
-        super().__init__(set())
+        self.extracted = 0
+        self.expanded = 0
+        self.generated = 0
+        self.goals = 0
 
-    def add_node(self, node: Node) -> None:
-        """
-        Adds a node to the explored nodes set.
+    def on_extract(self, search_problem: SearchProblem, node: Node) -> None:
+        self.extracted += 1
 
-        Args:
-            node (Node): The node to be added.
+    def on_expand(self, search_problem: SearchProblem, node: Node,
+                  children: List[Node]) -> None:
+        self.expanded += 1
+        self.generated += len(children)
 
-        Returns:
-            None
-        """
-        self.nodes.add(node)
+    def on_goal(self, search_problem: SearchProblem, node: Node) -> None:
+        self.goals += 1
 
 
-class _Frontier(_NodeContainer):
+class MemorySink(SearchObserver):
     """
-    Represents the frontier in a search, i.e., nodes yet to be explored.
+    Observer that records the algorithm execution steps in memory.
 
-    This is an abstract class and must be subclassed to implement the extract()
+    Each step record holds a copy of the frontier and explored nodes BEFORE
+    the node extraction, the extracted node, and the expanded nodes.
 
     Attributes:
-        nodes (list): The list of nodes in the frontier.
+        log (List[dict]): The complete log of all algorithm steps.
     """
 
     def __init__(self) -> None:
         """
-        Initializes the _Frontier object as an empty list.
+        Initializes the MemorySink object with an empty log.
         """
-        super().__init__(list())
+        self.log = []
+        self._record = {}
 
-    def add_node(self, node: Node) -> None:
+    def on_start(self, search_problem: SearchProblem) -> None:
+        self.log = []
+        self._take_snapshot(search_problem)
+
+    def on_extract(self, search_problem: SearchProblem, node: Node) -> None:
+        self._record['extracted'] = node
+
+    def on_expand(self, search_problem: SearchProblem, node: Node,
+                  children: List[Node]) -> None:
+        self._record['expanded'] = children
+        if not self.log or self.log[-1] is not self._record:
+            self.log.append(self._record)
+        self._take_snapshot(search_problem)
+
+    def on_goal(self, search_problem: SearchProblem, node: Node) -> None:
+        self.log.append(self._record)
+
+    def _take_snapshot(self, search_problem: SearchProblem) -> None:
         """
-        Adds a node to the frontier.
+        Starts next step record with copies of frontier and explored nodes.
 
         Args:
-            node (Node): The node to be added.
-
-        Returns:
-            None
+            search_problem (SearchProblem): The problem being solved.
         """
-        self.nodes.append(node)
+        self._record = {
+            'frontier': search_problem.frontier.copy(),
+            'explored': search_problem.explored_nodes.copy(),
+        }
 
-    def extract(self) -> Node:
+    def get_log(self) -> List[dict]:
         """
-        Extracts a node from the frontier.
+        Returns the entire log.
 
         Returns:
-            Node: The extracted node.
+            list: The entire log.
+        """
+        return self.log
 
-        Raises:
-            NotImplementedError: If the method is not implemented by a subclass.
+    def save_log(self, log_filename: str) -> None:
+        """
+        Saves the log of algorithm steps to a file.
 
-        Note:
-            Subclasses (_StackFrontier, _QueueFrontier) must implement this method.
+        Logs are saved in a structured format with each step showing the
+        current state of the explored nodes, frontier, extracted nodes, and
+        expanded nodes.
+
+        Args:
+            log_filename (str): The name of the file to save the log to.
 
+        Returns:
+            None
         """
-        raise NotImplementedError
+        with open(log_filename, 'a', encoding='utf-8') as file:
+            file.write(_STEPS_HEADER)
+            for step_nr, record in enumerate(self.log, start=1):
+                file.write(_step_text(step_nr, record))
 
 
-class _StackFrontier(_Frontier):
+class FileSink(SearchObserver):
     """
-    Implements a stack-based frontier (LIFO) for depth-first search (DFS).
+    Observer that writes algorithm execution steps to a text file while
+    searching.
+
+    Steps are written in the same format as MemorySink.save_log(), but
+    nothing is kept in memory, so it suits searches too large to record.
 
     Attributes:
-        nodes (list): The list of nodes in the stack-based frontier.
+        log_filename (str): The name of the file steps are written to.
     """
 
-    def extract(self) -> Node:
+    def __init__(self, log_filename: str, mode: str = 'w') -> None:
         """
-        Extracts a node from the stack-based frontier, using Last-In-First-Out
-        (LIFO) extraction (suitable for depth-first search).
+        Initializes the FileSink object.
 
-        Returns:
-            Node: The extracted node.
+        Args:
+            log_filename (str): The name of the file to write steps to.
+            mode (str): File open mode, 'w' (default) or 'a' to append to an
+                existing file.
+        """
+        self.log_filename = log_filename
+        self.mode = mode
+        self._file = None
+        self._step_nr = 0
+        self._record = {}
+
+    def on_start(self, search_problem: SearchProblem) -> None:
+        self._file = open(self.log_filename, self.mode, encoding='utf-8') # pylint: disable=R1732
+        self._file.write(_STEPS_HEADER)
+        self._step_nr = 0
+        self._take_snapshot(search_problem)
+
+    def on_extract(self, search_problem: SearchProblem, node: Node) -> None:
+        self._record['extracted'] = node
+
+    def on_expand(self, search_problem: SearchProblem, node: Node,
+                  children: List[Node]) -> None:
+        self._record['expanded'] = children
+        self._write_record()
+        self._take_snapshot(search_problem)
+
+    def on_finish(self, search_problem: SearchProblem, solved: bool) -> None:
+        if 'extracted' in self._record:     # Goal step, not expanded
+            self._write_record()
+        self._file.close()
+        self._file = None
+
+    def _take_snapshot(self, search_problem: SearchProblem) -> None:
+        """
+        Starts next step record with frontier and explored states.
 
-        Raises:
-            RuntimeError: If trying to extract from an empty frontier.
+        Only states are kept. Explored nodes are iterated from a copy, so
+        states are written in the same order as MemorySink ones (set copies
+        may iterate in a different order than the original set).
+
+        Args:
+            search_problem (SearchProblem): The problem being solved.
         """
-        if self.not_empty():
-            return self.nodes.pop()
-        else:
-            raise RuntimeError("Trying to extract node from an empty frontier")
+        self._record = {
+            'frontier': [_StateView(nd.node_state()) for nd in search_problem.frontier],
+            'explored': [_StateView(nd.node_state())
+                         for nd in search_problem.explored_nodes.copy()],
+        }
 
+    def _write_record(self) -> None:
+        """
+        Writes current step record to file.
+        """
+        self._step_nr += 1
+        self._file.write(_step_text(self._step_nr, self._record))
+        self._record = {}
 
-class _QueueFrontier(_Frontier):
-    """
-    Implements a queue-based frontier (FIFO) for breadth-first search (BFS).
 
-    Attributes:
-        nodes (list): The list of nodes in the queue-based frontier.
+class TraceSink(SearchObserver):
     """
+    Observer that writes a compact, indexed trace of the algorithm steps.
 
-    def extract(self) -> Node:
-        """
-        Extracts a node from the queue-based frontier, using First-In-First-Out
-        (FIFO) extraction (suitable for breadth-first search).
+    The trace is a JSON lines file. States are interned: each distinct state
+    gets an integer id the first time it appears, and step lines refer to
+    states by id. Explored nodes are not repeated at every step, as they are
+    the nodes extracted in previous steps.
 
-        Returns:
-            Node: The extracted node.
+    Trace file lines:
 
-        Raises:
-            RuntimeError: If trying to extract from an empty frontier.
-        """
-        if self.not_empty():
-            return self.nodes.pop(0)
-        else:
-            raise RuntimeError("Trying to extract node from an empty frontier")
+        {"trace": "search", "version": 1, "algorithm": "BFS"}   (header)
+        {"s": [...], "f": [...], "x": 3, "e": [...]}            (one per step)
 
+    where "s" lists the states first seen in the step (their ids follow the
+    last id assigned), "f" the frontier before the extraction, "x" the
+    extracted node and "e" the expanded nodes (absent on a goal step that is
+    not expanded).
 
-class _Solution(_NodeContainer):
-    """
-    Represents the solution path as a list of nodes.
+    When the search finishes, or is stopped by an exception, a side index
+    file (trace filename + '.idx') is written with the byte offset of every
+    step, the extracted state ids, the states table and the solution, so
+    TraceReader can seek straight to any step. States must be JSON
+    serializable (tuples are read back as tuples).
 
     Attributes:
-        nodes (list): The list of nodes that form the solution path.
+        trace_filename (str): The name of the trace file.
     """
-    def __init__(self) -> None:
+
+    VERSION = 1
+
+    def __init__(self, trace_filename: str) -> None:
         """
-        Initializes the _Solution object as an empty list.
+        Initializes the TraceSink object.
+
+        Args:
+            trace_filename (str): The name of the trace file to write.
         """
-        super().__init__(list())
+        self.trace_filename = trace_filename
+        self._file = None
+        self._state_ids = {}
+        self._new_states = []
+        self._offsets = []
+        self._extracted = []
+        self._record = {}
+
+    def on_start(self, search_problem: SearchProblem) -> None:
+        self._file = open(self.trace_filename, 'wb') # pylint: disable=R1732
+        self._state_ids = {}
+        self._offsets = []
+        self._extracted = []
+        header = {"trace": "search", "version": self.VERSION,
+                  "algorithm": search_problem.algorithm}
+        self._file.write(_json_line(header))
+        self._take_snapshot(search_problem)
+
+    def on_extract(self, search_problem: SearchProblem, node: Node) -> None:
+        state_id = self._state_id(node.node_state())
+        self._record['x'] = state_id
+        self._extracted.append(state_id)
+
+    def on_expand(self, search_problem: SearchProblem, node: Node,
+                  children: List[Node]) -> None:
+        self._record['e'] = [self._state_id(nd.node_state()) for nd in children]
+        self._write_record()
+        self._take_snapshot(search_problem)
+
+    def on_finish(self, search_problem: SearchProblem, solved: bool) -> None:
+        if 'x' in self._record:     # Goal step, not expanded
+            self._write_record()
+        self._file.close()
+        self._file = None
+        solution = None
+        if solved:
+            solution = [self._state_id(search_problem.start_node.node_state())]
+            solution += [self._state_id(nd.node_state()) for nd in search_problem.solution]
+        index = {
+            "version": self.VERSION,
+            "algorithm": search_problem.algorithm,
+            "offsets": self._offsets,
+            "extracted": self._extracted,
+            "states": list(self._state_ids),
+            "solution": solution,
+        }
+        with open(self.trace_filename + '.idx', 'wb') as file:
+            file.write(_json_line(index))
 
-    def build(self, goal_node: Node) -> None:
+    def _state_id(self, state: object) -> int:
         """
-        Builds the solution path from the goal node back to the start node.
+        Returns the id of a state, interning it if first seen.
 
         Args:
-            goal_node (Node): The goal node from which to build the solution path.
+            state (object): The state.
 
         Returns:
-            None
+            int: The state id.
         """
-        node = goal_node
-        while node is not None:
-            self.nodes.append(node)
-            node = node.parent
-        self.nodes.pop()
-        self.nodes.reverse()
+        state_id = self._state_ids.get(state)
+        if state_id is None:
+            state_id = self._state_ids[state] = len(self._state_ids)
+            self._new_states.append(state)
+        return state_id
+
+    def _take_snapshot(self, search_problem: SearchProblem) -> None:
+        """
+        Starts next step record with the frontier state ids.
+
+        Args:
+            search_problem (SearchProblem): The problem being solved.
+        """
+        self._record = {'f': [self._state_id(nd.node_state())
+                              for nd in search_problem.frontier]}
+
+    def _write_record(self) -> None:
+        """
+        Writes current step record, preceded by its new states, to file.
+        """
+        self._offsets.append(self._file.tell())
+        line = {'s': self._new_states} if self._new_states else {}
+        line.update(self._record)
+        self._file.write(_json_line(line))
+        self._new_states = []
+        self._record = {}
 
 
-class _LogHandler:
+class TraceReader:
     """
-    Handles logging of the search algorithm's execution steps.
+    Reads traces written by TraceSink, with random access to any step.
+
+    Steps are numbered from 1, as in algorithm steps text files. If the index
+    file is missing (e.g. the search was interrupted), it is rebuilt by
+    scanning the trace; the solution is then unknown.
 
     Attributes:
-        log (List[dict]): The complete log of all algorithm steps.
-        current_record (dict): The current log record being assembled.
+        trace_filename (str): The name of the trace file.
+        algorithm (str): The search algorithm traced.
+        states (list): States table (state of each id).
+        solution (Optional[list]): States of the solution path, from start
+            state to goal state, or None if no solution was found.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, trace_filename: str) -> None:
         """
-        Initializes the _LogHandler object.
+        Initializes the TraceReader object, loading the trace index.
+
+        Args:
+            trace_filename (str): The name of the trace file to read.
+
+        Raises:
+            ValueError: If the file is not a search trace, or its version is
+                not supported.
+        """
+        self.trace_filename = trace_filename
+        with open(trace_filename, 'rb') as file:
+            header = json.loads(file.readline())
+        if header.get('trace') != 'search' or header.get('version') != TraceSink.VERSION:
+            raise ValueError(f"Not a supported search trace: {trace_filename}")
+        self.algorithm = header['algorithm']
+
+        try:
+            with open(trace_filename + '.idx', 'rb') as file:
+                index = json.loads(file.read())
+        except FileNotFoundError:
+            index = self._rebuild_index()
+        self._offsets = index['offsets']
+        self._extracted = index['extracted']
+        self.states = [_from_json(state) for state in index['states']]
+        solution = index['solution']
+        self.solution = None if solution is None else [self.states[i] for i in solution]
+
+    def _rebuild_index(self) -> dict:
+        """
+        Builds the trace index scanning the whole trace file.
 
         Returns:
-            None
+            dict: The trace index (without solution).
         """
-        self.log = []
-        self.current_record = {}
+        index = {'offsets': [], 'extracted': [], 'states': [], 'solution': None}
+        with open(self.trace_filename, 'rb') as file:
+            file.readline()
+            offset = file.tell()
+            for line in file:
+                record = json.loads(line)
+                index['offsets'].append(offset)
+                index['extracted'].append(record['x'])
+                index['states'] += record.get('s', [])
+                offset += len(line)
+        return index
+
+    def __len__(self) -> int:
+        """
+        Returns the number of steps in the trace.
+
+        Returns:
+            int: The number of steps.
+        """
+        return len(self._offsets)
+
+    def exploration(self) -> List[object]:
+        """
+        Returns the states extracted at each step, without reading steps.
 
-    def add_to_record(self, frontier: Optional[_Frontier] = None,
-                      explored: Optional[_ExploredNodes] = None,
-                      extracted: Optional[Node] = None,
-                      expanded: Optional[List[Node]] = None) -> None:
+        Returns:
+            list: Extracted states, in extraction order.
         """
-        Adds information to the current log record.
+        return [self.states[i] for i in self._extracted]
 
-        Parameters are optional depending on which part of the algorithm is
-        being logged.
+    def step(self, step_nr: int) -> dict:
+        """
+        Reads a single step, seeking straight to it.
 
         Args:
-            frontier (Optional[_Frontier]): The current state of the frontier.
-            explored (Optional[_ExploredNodes]): The current state of the explored nodes.
-            extracted (Optional[Node]): The node that was extracted.
-            expanded (Optional[List[Node]]): The nodes that were expanded.
+            step_nr (int): Step number, from 1 to len(self).
 
         Returns:
-            None
+            dict: Step with 'step' number, and 'explored', 'frontier',
+            'extracted' and 'expanded' states.
 
         Raises:
-            ValueError: If any of the provided values are not of the expected
-                types (e.g., _Frontier, _ExploredNodes, Node, List[Node]).
+            IndexError: If the step does not exist.
+        """
+        return next(self.steps(step_nr, step_nr + 1))
 
+    def steps(self, start: int = 1, stop: Optional[int] = None):
         """
-        params = {
-            'frontier': (frontier, _Frontier),
-            'explored': (explored, _ExploredNodes),
-            'extracted': (extracted, Node),
-            'expanded': (expanded, list)
-        }
+        Streams a range of steps, seeking straight to the first one with the
+        index offsets and then reading the trace sequentially. Explored
+        states before it are rebuilt from the index, not from the trace.
 
-        for key, (value, expected_type) in params.items():
-            if value is not None:
-                if isinstance(value, expected_type):
-                    self.current_record[key] = value
-                else:
-                    raise ValueError(f"Invalid {key}: {value}. "
-                                     f"Must be an instance of {expected_type.__name__}.")
+        Args:
+            start (int): First step number. Default is 1.
+            stop (Optional[int]): Step number after the last one. Default is
+                None, meaning until the last step.
+
+        Yields:
+            dict: Steps, as returned by step().
 
-    def save_record(self) -> None:
+        Raises:
+            IndexError: If start step does not exist.
+        """
+        if not 1 <= start <= len(self):
+            raise IndexError(f"Step {start} out of range (1-{len(self)})")
+        stop = len(self) + 1 if stop is None else min(stop, len(self) + 1)
+        explored = [self.states[i] for i in self._extracted[:start - 1]]
+
+        with open(self.trace_filename, 'rb') as file:
+            file.seek(self._offsets[start - 1])
+            for step_nr in range(start, stop):
+                record = json.loads(file.readline())
+                extracted = self.states[record['x']]
+                yield {
+                    'step': step_nr,
+                    'explored': list(explored),
+                    'frontier': [self.states[i] for i in record['f']],
+                    'extracted': extracted,
+                    'expanded': [self.states[i] for i in record.get('e', [])],
+                }
+                explored.append(extracted)
+
+    def save_text(self, log_filename: str) -> None:
         """
-        Saves the current log record.
+        Appends the trace steps to a file, in algorithm steps text format (as
+        MemorySink.save_log()).
+
+        Explored nodes are listed in extraction order.
+
+        Args:
+            log_filename (str): The name of the file to save the steps to.
 
         Returns:
             None
         """
-        self.log.append(self.current_record.copy())
-        self.current_record.clear()
+        with open(log_filename, 'a', encoding='utf-8') as file:
+            file.write(_STEPS_HEADER)
+            if len(self) == 0:
+                return
+            for step in self.steps():
+                record = {key: [_StateView(state) for state in step[key]]
+                          for key in ('explored', 'frontier', 'expanded')}
+                record['extracted'] = _StateView(step['extracted'])
+                file.write(_step_text(step['step'], record))
 
-    def get_log(self) -> List[dict]:
+
+class _StateView:
+    """
+    Minimal node stand-in holding only a state, for step records.
+
+    Attributes:
+        state (object): The node state.
+    """
+    __slots__ = ('state',)
+
+    def __init__(self, state: object) -> None:
+        self.state = state
+
+    def node_state(self) -> object:
         """
-        Returns the entire log.
+        Returns the state.
 
         Returns:
-            list: The entire log.
+            object: The state.
         """
-        return self.log
+        return self.state
 
-    def save_log(self, log_filename: str) -> None:
-        """
-        Saves the log of algorithm steps to a file.
 
-        Logs are saved in a structured format with each step showing the
-        current state of the explored nodes, frontier, extracted nodes, and
-        expanded nodes.
+class _ObserverGroup(SearchObserver):
+    """
+    Forwards search events to a list of observers.
 
-        Args:
-            log_filename (str): The name of the file to save the log to.
+    Attributes:
+        observers (List[SearchObserver]): The observers notified.
+    """
 
-        Returns:
-            None
+    def __init__(self, observers: List[SearchObserver]) -> None:
         """
-        with open(log_filename, 'a', encoding='utf-8') as file:
-            file.write("\n- Algorithm steps:\n")
+        Initializes the _ObserverGroup object.
 
-            for step_nr, record in enumerate(self.log, start=1):
-                file.write(f"[{step_nr}]\n")
+        Args:
+            observers (List[SearchObserver]): The observers to notify.
+        """
+        self.observers = list(observers)
+
+    def on_start(self, search_problem: SearchProblem) -> None:
+        for observer in self.observers:
+            observer.on_start(search_problem)
+
+    def on_extract(self, search_problem: SearchProblem, node: Node) -> None:
+        for observer in self.observers:
+            observer.on_extract(search_problem, node)
+
+    def on_expand(self, search_problem: SearchProblem, node: Node,
+                  children: List[Node]) -> None:
+        for observer in self.observers:
+            observer.on_expand(search_problem, node, children)
+
+    def on_goal(self, search_problem: SearchProblem, node: Node) -> None:
+        for observer in self.observers:
+            observer.on_goal(search_problem, node)
 
-                file.write("  > Explored nodes:\n")
-                if record.get('explored'):
-                    for nd in record['explored']:
-                        file.write(f"      {nd.node_state()}\n")
+    def on_improve(self, search_problem: SearchProblem, node: Node,
+                   suboptimality: float) -> None:
+        for observer in self.observers:
+            observer.on_improve(search_problem, node, suboptimality)
 
-                file.write("  > Frontier:\n")
-                for nd in record.get('frontier', []):
-                    file.write(f"      {nd.node_state()}\n")
+    def on_finish(self, search_problem: SearchProblem, solved: bool) -> None:
+        for observer in self.observers:
+            observer.on_finish(search_problem, solved)
 
-                if record.get('extracted'):
-                    file.write(f"  > Extracted node:\n      {record['extracted'].node_state()}\n")
 
-                file.write("  > Node expands to:\n")
-                for nd in record.get('expanded', []):
-                    file.write(f"      {nd.node_state()}\n")
+_STEPS_HEADER = "\n- Algorithm steps:\n"
+
+
+def _step_text(step_nr: int, record: dict) -> str:
+    """
+    Formats an algorithm step record as text.
+
+    Args:
+        step_nr (int): Step number, starting at 1.
+        record (dict): Step record, with optional 'explored', 'frontier',
+            'extracted' and 'expanded' entries.
+
+    Returns:
+        str: Step text, as saved in algorithm steps files.
+    """
+    lines = [f"[{step_nr}]", "  > Explored nodes:"]
+    lines += [f"      {nd.node_state()}" for nd in record.get('explored') or []]
+    lines.append("  > Frontier:")
+    lines += [f"      {nd.node_state()}" for nd in record.get('frontier', [])]
+    if record.get('extracted'):
+        lines += ["  > Extracted node:", f"      {record['extracted'].node_state()}"]
+    lines.append("  > Node expands to:")
+    lines += [f"      {nd.node_state()}" for nd in record.get('expanded', [])]
+    return "\n".join(lines) + "\n"
+
+
+def _json_line(value: object) -> bytes:
+    """
+    Encodes a value as a compact JSON line.
+
+    Args:
+        value (object): JSON serializable value.
+
+    Returns:
+        bytes: UTF-8 encoded JSON text, ending in a newline.
+    """
+    return (json.dumps(value, separators=(',', ':')) + "\n").encode('utf-8')
+
+
+def _from_json(value: object) -> object:
+    """
+    Converts a state read from JSON back to a hashable state (JSON lists are
+    converted to tuples, recursively).
+
+    Args:
+        value (object): Value decoded from JSON.
+
+    Returns:
+        object: The state.
+    """
+    if isinstance(value, list):
+        return tuple(_from_json(item) for item in value)
+    return value